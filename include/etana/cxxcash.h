@@ -17,15 +17,34 @@
 		    {
 		    int   index;	        ///< Puhvri indeks
 		    unsigned char *buffer;  ///< Puhver
+            struct STRUCT_CASH *prev; ///< LRU ahelas eelmine (hiljem kasutatud)
+            struct STRUCT_CASH *next; ///< LRU ahelas järgmine (varem kasutatud)
 		    } CASH;
 
+        /// Cache'i kasutamise statistika
+        typedef struct STRUCT_CASH_STAT
+            {
+            long hits;      ///< Blokk oli mälus
+            long misses;    ///< Blokk tuli failist lugeda
+            long evictions; ///< Lugemiseks tuli mõni teine blokk mälust välja visata
+            } CASH_STAT;
+
         /// Cache Cooperdatud s�nastikublokkide lugemiseks
+        //
+        /// Hoiab mälus kuni @a nBlokki viimati kasutatud blokki (LRU).
         class cCACHE
             {
             public:
                 cCACHE(void);
                 ~cCACHE(void);
 
+                /// Määrab, mitu blokki järgmine CacheOpen() mälus hoiab
+                //
+                /// Tuleb välja kutsuda enne sõnastiku avamist.
+                void CacheSetSize(
+	                const int nBlokki   ///< Blokkide arv, vähemalt 1
+                    );
+
                 /// Initsialiseerib cache'i
                 //
                 /// @return
@@ -33,7 +52,7 @@
                 /// - @a ==1 Jama
                 int CacheOpen(
                     const int DBSIZE,   ///< Bloki suurus tuleb FILE_INFO struktuurist
-	                const int nBlokki   ///< See cache'i versioon ei kasuta seda muutujat
+	                const int nBlokki   ///< Blokkide arv, kui <=0, siis CacheSetSize() järgi
                     );
 
                 /// Loeb cache'ist
@@ -46,13 +65,71 @@
                     const int idx       ///< Loetava bloki indeks
                     );
                 
+                /// Kujutab kogu sõnastikufaili mällu (mmap)
+                //
+                /// Pärast seda annab CacheRead() viida otse kujutise sisse
+                /// ja faili enam ei loeta. Kujutise leheküljed on kõigi
+                /// sama faili kujutanud (ka fork'itud) protsesside vahel ühised.
+                /// @return
+                /// - @a ==0 OK
+                /// - @a ==1 Jama (või platvorm ei toeta), kasuta CacheOpen()
+                int CacheMap(
+                    CPFSFile *pDctFile, ///< Sõnastikufail
+                    const int DBSIZE    ///< Bloki suurus tuleb FILE_INFO struktuurist
+                    );
+
+                /// Kas sõnastik on mällu kujutatud
+                bool CacheMapped(void) const
+                    {
+                    return mbuf!=NULL;
+                    }
+
+                /// Mitu blokki cache mälus hoiab
+                int CacheSize(void) const
+                    {
+                    return nBuf;
+                    }
+
+                /// Cache'i kasutamise statistika
+                //
+                /// Kujutatud sõnastiku korral loetakse iga lugemine tabamuseks.
+                const CASH_STAT& CacheStat(void) const
+                    {
+                    return stat;
+                    }
+
+                /// Nullib cache'i kasutamise statistika
+                void CacheStatClr(void);
+
+                /// Mitu korda on CacheRead() välja kutsutud
+                long CacheReads(void) const
+                    {
+                    return reads;
+                    }
+
+                /// Nullib CacheRead() väljakutsete loenduri
+                void CacheReadsClr(void)
+                    {
+                    reads=0;
+                    }
+
                 void CacheClose(void);
             
                 unsigned char* xptr;     ///< Jooksva bloki algus
 
             private:
-                CASH *dbuf;             ///< Jooksev blokk
+                CASH *dbuf;             ///< Puhvrite massiiv
+                CASH *head;             ///< LRU ahela algus (viimati kasutatud)
+                CASH *tail;             ///< LRU ahela lõpp (kõige kauem kasutamata)
+                CASH **blokk;           ///< Bloki indeks -> puhver (või NULL)
+                int nBlokk;             ///< Massiivi @a blokk pikkus
+                int nBuf;               ///< Puhvrite arv
+                unsigned char *mbuf;    ///< Sõnastikufaili kujutis (või NULL)
+                long msize;             ///< Kujutise pikkus baitides
                 int DBSIZE;             ///< Bloki suurus
+                CASH_STAT stat;         ///< Statistika
+                long reads;             ///< CacheRead() väljakutsete arv
+                void ToFront(CASH *c);  ///< Tõstab puhvri LRU ahela algusesse
                 int ClassInvariant(void);
             };
 
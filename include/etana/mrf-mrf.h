@@ -182,6 +182,37 @@ class PRSL // ei tea miks see k�ll eraldi klassiks on tehtud? TV
 //
 /// Ebaõnnestumist kontrolli ErrNo() funktsiooni
 /// kaudu.
+/// Mootori loendurite indeksid, vt MORF0::loendurid
+enum MRF_LOENDUR
+    {
+    // oletaja
+    LOEND_ARVAMIN,
+    LOEND_ARVAX,
+    LOEND_BARVAWW,
+    LOEND_ARVAMITTE,
+    LOEND_ARVALYH1,
+    LOEND_ARVALYH2,
+    LOEND_ARVASH1,
+    LOEND_ARVAVI1,
+    LOEND_ARVAHY1,
+    LOEND_ARVAI,
+    LOEND_ARVAPN2,
+    LOEND_ARVASUF1,
+    LOEND_ARVANS1,
+    LOEND_ARVANS2,
+    // liitsõnade kontroll
+    LOEND_KCHK1,
+    LOEND_KCHK2,
+    LOEND_KCHK30,
+    LOEND_KCHK33,
+    LOEND_KCHK4,
+    LOEND_KCHK5,
+    LOEND_KCHK6,
+    // pärisnimeanalüüside lisamine
+    LOEND_LISAPNIMEANALYYSID,
+    LOENDUREID  ///< loendurite arv
+    };
+
 class MORF0 
     : public MRFDCT
     {
@@ -193,6 +224,17 @@ class MORF0
         MORF0(void) 
             {
             konveier=NULL;
+            LoenduridNulli();
+            }
+
+        /// Mitu korda on funktsioone välja kutsutud, indeksiks MRF_LOENDUR
+        long loendurid[LOENDUREID];
+
+        /// Nullib loendurid
+        void LoenduridNulli(void)
+            {
+            for(int i=0; i < LOENDUREID; i++)
+                loendurid[i]=0;
             }
 
         /// Initsialiseerib (s�nastiku, loendid jms)
@@ -230,6 +272,17 @@ class MORF0
             const int maxtasand
             );
 
+        /** Kontrollib, kas sõna võib olla mitmesõnalise geonime 1. osa
+         *
+         * Ainult selliste sõnade korral liidab chkmin() analüüsil
+         * sõnale järgmis(t)e sõna(de)ga kokku, muidu ei sõltu sõna
+         * analüüs naabritest.
+         * @param[in] const FSXSTRING* @sissePuhastatud
+         * sisendsõna (vajadusel olemitest ja märgenditest puhastatud)
+         * @return @a ==true kui võib olla mitmesõnalise geonime algus
+         */
+        bool chkgeon1(const FSXSTRING* sissePuhastatud);
+
         /// Morf analüüsib tundmatuid s�nu (oletades)
         //
         /// @return
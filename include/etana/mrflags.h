@@ -214,8 +214,8 @@ const MRF_FLAGS_BASE_TYPE MF_LOIKREAL = 0x0000000400000000LL;
 const MRF_FLAGS_BASE_TYPE MF_LAUSESTA = 0x0000000800000000LL;
 /** 09.1 \a +, tulemus-struktuuris tõsta komage eraldet asjad lahku */
 const MRF_FLAGS_BASE_TYPE MF_KOMA_LAHKU = 0x0000001000000000LL;
-/** 09.2 \a -% VABA */
-const MRF_FLAGS_BASE_TYPE MF_vaba092 = 0x0000002000000000LL;
+/** 09.2 põhisõnastik kujutatakse mällu (mmap), mitte ei loeta plokkhaaval */
+const MRF_FLAGS_BASE_TYPE MF_MMAPDCT = 0x0000002000000000LL;
 /** 09.4       VABA */
 const MRF_FLAGS_BASE_TYPE MF_vaba094 = 0x0000004000000000LL;
 /** 09.8       VABA */
@@ -283,7 +283,7 @@ const MRF_FLAGS_BASE_TYPE MF_MRF_OKFLAGS =
     MF_PIKADVALED | MF_LISAPNANAL | MF_KR6NKSA | MF_LYHREZH | MF_MRF | MF_NIMEREZH |
     MF_OLETA | MF_POOLITA | MF_YHMRG | MF_SPELL | MF_EILUBATABU | MF_EITULETALIIT | MF_ARAROOMA | MF_VEEBIAADRESS |
     MF_YHELE_REALE | MF_IGNORAMP | MF_IGNOREBLK | MF_IGNORETAG |
-    MF_BOM | MF_AUTOSGML | MF_XML | MF_KOMA_LAHKU;
+    MF_BOM | MF_AUTOSGML | MF_XML | MF_KOMA_LAHKU | MF_MMAPDCT;
 
 /** morf sünteesi jaoks legaalsed bitid */
 const MRF_FLAGS_BASE_TYPE MF_GEN_OKFLAGS =
@@ -292,7 +292,7 @@ const MRF_FLAGS_BASE_TYPE MF_GEN_OKFLAGS =
     MF_PIKADVALED | MF_LYHREZH | MF_NIMEREZH | MF_KR6NKSA |
     MF_OLETA | MF_POOLITA | MF_SPELL | MF_EILUBATABU | MF_EITULETALIIT | MF_ARAROOMA | MF_VEEBIAADRESS |
     MF_YHELE_REALE | MF_IGNORAMP | MF_IGNOREBLK | MF_IGNORETAG |
-    MF_BOM | MF_AUTOSGML | MF_XML | MF_KOMA_LAHKU;
+    MF_BOM | MF_AUTOSGML | MF_XML | MF_KOMA_LAHKU | MF_MMAPDCT;
 
 /** t3-ühestaja jaoks legaalsed bitid */
 const MRF_FLAGS_BASE_TYPE MF_YHS_OKFLAGS = MF_MRF_OKFLAGS | MF_YHESTA | T3_MK_KASUTU | T3_LEXPKASUTU;
@@ -13,14 +13,25 @@
 #include <vector>
 #include <string>
 #include <cstdio>
+#include <stdexcept>
+#include <map>
 
 // forward reference to functions for initializing vabamorf library
 bool FSCInit();
 void FSCTerminate();
 
+// every additional thread using the library should be initialized
+bool FSCThreadInit();
+void FSCThreadTerminate();
+
+
+typedef std::vector<std::string> StringVector;
 
 /**
  * Class for storing single analysis.
+ *
+ * The lemma and root tokens are made from the root given to the constructor,
+ * the root may later be stripped of its phonetic and compound markers.
  */
 class Analysis {
 public:
@@ -29,15 +40,111 @@ public:
     std::string clitic;
     std::string partofspeech;
     std::string form;
+    std::string lemma;
+    StringVector rootTokens;
 
     Analysis() {}
     Analysis(const char* root, const char* ending, const char* clitic, const char* partofspeech, const char* form);
     Analysis(Analysis const& analysis);
 };
 
+/**
+ * Dictionary block cache usage counters.
+ */
+class CacheStats {
+public:
+    long hits;
+    long misses;
+    long evictions;
+    int blocks;
+
+    CacheStats() : hits(0), misses(0), evictions(0), blocks(0) {}
+};
+
 typedef std::vector<Analysis> AnalysisVector;
 typedef std::pair<std::string, AnalysisVector > WordAnalysis;
-typedef std::vector<std::string> StringVector;
+typedef std::vector<WordAnalysis> SentenceAnalysis;
+typedef std::pair<std::string, StringVector> WordLemmas;
+typedef std::vector<int> IntVector;
+// number of calls of the engine functions by name
+typedef std::map<std::string, long> Counters;
+
+
+/**
+ * Columns of the columnar analysis having a fixed vocabulary.
+ */
+enum VocabularyColumn {
+    PARTOFSPEECH_COLUMN=0,
+    FORM_COLUMN,
+    ENDING_COLUMN,
+    CLITIC_COLUMN,
+    VOCABULARY_COLUMNS
+};
+
+// values of a column, the id of a value is its index plus one,
+// id 0 is used for values missing from the vocabulary
+StringVector vocabulary(int column);
+
+
+/**
+ * Analysis of a sentence in columns.
+ *
+ * The analyses of word i are at positions offsets[i] ... offsets[i+1]-1
+ * of the analysis columns lemmas, partofspeech, form, ending and clitic.
+ */
+class ColumnarAnalysis {
+public:
+    StringVector words;
+    IntVector offsets;
+    IntVector counts;
+    StringVector lemmas;
+    IntVector partofspeech;
+    IntVector form;
+    IntVector ending;
+    IntVector clitic;
+};
+
+
+/**
+ * Analysis of a text with the character offsets of its words.
+ *
+ * Word i is made of the characters starts[i] ... ends[i]-1 of the text.
+ */
+class TextAnalysis {
+public:
+    std::vector<WordAnalysis> words;
+    IntVector starts;
+    IntVector ends;
+};
+
+
+/**
+ * Opened vabamorf dictionary.
+ *
+ * An analyzer and a synthesizer can share a dictionary instead of
+ * opening and reading the tables of their own.
+ * They must not be used by several threads at once and the dictionary
+ * must outlive them.
+ */
+class Dictionary {
+public:
+    Dictionary(std::string const lexPath, bool useMmap=false, int cacheBlocks=1);
+    CacheStats cacheStats() const;
+    void clearCacheStats();
+    // dictionary block reads (CacheRead), guesser (arva*), compound word (kchk*)
+    // and proper name (LisaPNimeAnalyysid) function calls
+    Counters counters() const;
+    void clearCounters();
+
+private:
+    friend class Analyzer;
+    friend class Synthesizer;
+
+    Dictionary(Dictionary const&);
+    Dictionary& operator=(Dictionary const&);
+
+    ETMRFAS morf;
+};
 
 
 /**
@@ -45,28 +152,81 @@ typedef std::vector<std::string> StringVector;
  *
  * Simple wrapper of ETMRF class for doing morphological analysis
  * for one sequence at a time.
+ * An instance must not be used by several threads at once.
  */
 class Analyzer {
 public:
-    Analyzer(std::string const lexPath);
-    std::vector<WordAnalysis> analyze(StringVector const& sentence, bool useHeuristics);
+    Analyzer(std::string const lexPath, bool useMmap=false, int cacheBlocks=1);
+    // use a dictionary shared with other engines
+    Analyzer(Dictionary& dictionary);
+    ~Analyzer();
+    // phonetic and compound tell, whether to keep the phonetic and compound markers in the roots
+    std::vector<WordAnalysis> analyze(StringVector const& sentence, bool useHeuristics, bool phonetic, bool compound);
+    // analyze several sentences at once, the settings are changed only once
+    std::vector<SentenceAnalysis> analyzeMany(std::vector<StringVector> const& sentences, bool useHeuristics,
+                                              bool phonetic, bool compound);
+    // the distinct lemmas of every word, without building the analyses
+    std::vector<WordLemmas> lemmatize(StringVector const& sentence, bool useHeuristics);
+    // true, if the word may be merged with the following words into a multiword name;
+    // analysis of other words does not depend on their neighbours
+    bool multiwordStart(std::string const& word);
+    // analyze a sentence, giving categories as vocabulary ids and the roots with all markers
+    ColumnarAnalysis analyzeColumnar(StringVector const& sentence, bool useHeuristics);
+    // split a UTF-8 text into words and punctuation, returning the character offsets
+    // of the start and end of every token, one after the other
+    IntVector tokenize(std::string const& text);
+    // tokenize and analyze a text, giving the character offsets of the words
+    TextAnalysis analyzeText(std::string const& text, bool useHeuristics, bool phonetic, bool compound);
+    // analyze a UTF-8 JSON document of paragraphs, sentences and words (see test/ana.json),
+    // returning the document with the analysis of every word
+    std::string analyzeJson(std::string const& document, bool useHeuristics, bool phonetic, bool compound);
+    CacheStats cacheStats() const;
+    void clearCacheStats();
+    Counters counters() const;
+    void clearCounters();
+    // number of words analyzed by the guesser since the analyzer was created
+    long guessedWords() const;
 
 private:
+    friend class DocumentReader;
+
     void enableHeuristics(bool heuristic);
-    void process(CFSArray<CFSVar>& words);
-    void compileResults(CFSArray<CFSVar>& words, std::vector<WordAnalysis>& results);
+    void enableMarkers(bool phonetic, bool compound);
+    // positions receive the index of the first input word of every result
+    void process(StringVector const& sentence, std::vector<WordAnalysis>& results, IntVector* positions=NULL);
+    void tokenizeText(std::string const& text, IntVector& spans, IntVector* byteSpans);
+    // true, if the word ending with a full stop is an abbreviation or ordinal number
+    bool abbreviation(std::string const& word);
+
+    int vocabularyId(int column, std::string const& value) const;
+    void init();
+
+    Analyzer(Analyzer const&);
+    Analyzer& operator=(Analyzer const&);
 
-    ETMRFA morf;
+    Dictionary* ownDictionary; // NULL for a shared dictionary
+    ETMRFA& morf;
+    std::map<std::string, int> vocabularyIds[VOCABULARY_COLUMNS];
+    // buffers reused between words and calls
+    AnalysisVector analysisBuf;
+    CFSWString formBuf;
+    long guessed;
+    bool phonetic;
+    bool compound;
 };
 
 
 /** Morphological synthesizer.
  * 
  * Simple wrapper of ETMRFAS class for doing morphological synthesis.
+ * An instance must not be used by several threads at once.
  */
 class Synthesizer {
 public:
-    Synthesizer(std::string const lexPath);
+    Synthesizer(std::string const lexPath, bool useMmap=false, int cacheBlocks=1);
+    // use a dictionary shared with other engines
+    Synthesizer(Dictionary& dictionary);
+    ~Synthesizer();
     std::vector<std::string> synthesize(
         std::string lemma,
         std::string partofspeech,
@@ -74,10 +234,26 @@ public:
         std::string hint,
         bool guess,
         bool phon);
+    // synthesize several (lemma, partofspeech, form, hint) requests at once,
+    // the settings are changed only once
+    std::vector<StringVector> synthesizeMany(std::vector<StringVector> const& requests, bool guess, bool phon);
+    CacheStats cacheStats() const;
+    void clearCacheStats();
+    Counters counters() const;
+    void clearCounters();
 private:
     void updateSettings(bool guess, bool phon);
-    
-    ETMRFAS morf;
+    StringVector process(
+        std::string const& lemma,
+        std::string const& partofspeech,
+        std::string const& form,
+        std::string const& hint);
+
+    Synthesizer(Synthesizer const&);
+    Synthesizer& operator=(Synthesizer const&);
+
+    Dictionary* ownDictionary; // NULL for a shared dictionary
+    ETMRFAS& morf;
 };
 
 #endif
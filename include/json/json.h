@@ -21,6 +21,7 @@ protected:
 	CFSVar ReadVal(const CFSAString &szKeyPath);
 	CFSAString ReadKey();
 	CFSAString ReadString();
+	unsigned long ReadHex4();
 	CFSAString ReadText();
 	CFSVar ReadNumber();
 	CFSVar ReadConst();
@@ -54,6 +55,8 @@ public:
 	void ArrayEnd();
 
 	void Text(const CFSAString &szStr);
+	// string contents with quotes, backslashes and control characters escaped
+	void Escaped(const CFSAString &szStr);
 
 protected:
 	enum { COMMA_NO, COMMA_KEY, COMMA_VAL };
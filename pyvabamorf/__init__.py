@@ -1,13 +1,3 @@
 # -*- coding: utf-8 -*-
-import pyvabamorf.vabamorf as vm
-import atexit
-
-if not vm.FSCInit():
-    raise Exception('Could not initiate pyvabamorf library. FSCInit() returned false!')
-
-@atexit.register
-def terminate():
-    vm.FSCTerminate()
-
-from morf import analyze, synthesize
-from morf import PyVabamorf
+from morf import analyze, analyze_many, analyze_iter, analyze_columnar, analyze_text, analyze_json, lemmatize, tokenize, synthesize, synthesize_many
+from morf import PyVabamorf, WordRecord, AnalysisRecord
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+from pyvabamorf.cli import main
+
+main()
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+'''
+Morphological analysis and synthesis for asyncio programs (Python 3.5+).
+
+The coroutines run the analyzer and synthesizer in an executor, so they
+do not block the event loop. Requests arriving within a short window are
+merged into a single call of analyze_many() or synthesize_many(), which
+avoids a thread hop and a native call per word when there are many small
+concurrent requests. The requests are checked before they are merged, so
+that an illegal request fails alone. Batches run concurrently, up to the
+number of workers of the executor. When more than `max_queue` requests
+are waiting, new requests wait until there is room in the queue.
+
+Attributes
+----------
+
+WINDOW: float
+    The default time in seconds to wait for more requests to join a batch.
+MAX_BATCH: int
+    The default maximum number of requests in a batch.
+MAX_QUEUE: int
+    The default maximum number of requests waiting to be batched.
+'''
+from __future__ import unicode_literals, print_function
+
+from pyvabamorf.morf import PyVabamorf, get_args, convert_words, synthesis_request
+from collections import OrderedDict
+from functools import partial
+import asyncio
+import weakref
+import os
+
+WINDOW = 0.002
+MAX_BATCH = 256
+MAX_QUEUE = 4096
+
+ANALYZE = 'analyze'
+SYNTHESIZE = 'synthesize'
+
+# the loop running the current coroutine
+get_loop = getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)
+
+
+def analysis_request(words):
+    '''Convert the words of an analysis request to be given to SWIG wrapper.
+
+    Raises
+    ------
+    Exception
+        In case the request contains something else than strings.
+    '''
+    words = convert_words(words)
+    for word in words:
+        if not isinstance(word, str):
+            raise Exception('Expected a string, got: {0!r}'.format(word))
+    return words
+
+
+def executor_workers(executor):
+    '''Return the number of workers of `executor`, which is None for the default executor of the loop.'''
+    workers = getattr(executor, '_max_workers', None)
+    if workers is None:
+        # the default of concurrent.futures.ThreadPoolExecutor
+        workers = min(32, (os.cpu_count() or 1) + 4)
+    return workers
+
+
+class Batcher(object):
+    '''Merges concurrent analysis and synthesis requests into batches.
+
+    A batcher belongs to the event loop it is first used in.
+
+    Attributes
+    ----------
+    morf: PyVabamorf
+        The instance doing the analysis and synthesis.
+    window: float
+        Time in seconds to wait for more requests to join a batch.
+    max_batch: int
+        The maximum number of requests in a batch.
+    max_queue: int
+        The maximum number of requests waiting to be batched.
+    executor: concurrent.futures.Executor
+        The executor running the batches, None for the default executor of the loop.
+    max_running: int
+        The maximum number of batches running at once.
+    requests: int
+        The number of requests processed.
+    batches: int
+        The number of native calls made for them.
+    '''
+
+    def __init__(self, morf=None, window=WINDOW, max_batch=MAX_BATCH, max_queue=MAX_QUEUE, executor=None, max_running=None):
+        '''Initialize the batcher.
+
+        Parameters
+        ----------
+        morf: PyVabamorf
+            The instance to use, if None, then PyVabamorf.instance() (default: None).
+        window: float
+            Time in seconds to wait for more requests to join a batch (default: WINDOW).
+        max_batch: int
+            The maximum number of requests in a batch (default: MAX_BATCH).
+        max_queue: int
+            The maximum number of requests waiting to be batched (default: MAX_QUEUE).
+        executor: concurrent.futures.Executor
+            The executor running the batches, None for the default executor of the loop (default: None).
+        max_running: int
+            The maximum number of batches running at once, if None, then the number of
+            workers of the executor (default: None).
+        '''
+        self.morf = morf if morf is not None else PyVabamorf.instance()
+        self.window = window
+        self.max_batch = max_batch
+        self.max_queue = max_queue
+        self.executor = executor
+        self.max_running = max_running if max_running is not None else executor_workers(executor)
+        self.requests = 0
+        self.batches = 0
+        self._queue = None
+        self._worker = None
+        self._running = set()
+
+    async def analyze(self, words, **kwargs):
+        '''Perform morphological analysis on input, see PyVabamorf.analyze().'''
+        get_args(**kwargs) # fail early on illegal arguments
+        key = tuple(sorted(kwargs.items()))
+        return await self._submit(ANALYZE, key, analysis_request(words))
+
+    async def synthesize(self, lemma, partofspeech='', form='', hint='', guess=True, phonetic=True):
+        '''Given lemma, pos tag and a form, synthesize the word, see PyVabamorf.synthesize().'''
+        key = (('guess', bool(guess)), ('phonetic', bool(phonetic)))
+        return await self._submit(SYNTHESIZE, key, synthesis_request((lemma, partofspeech, form, hint)))
+
+    async def close(self):
+        '''Stop batching, the requests still waiting are cancelled and the running batches are finished.'''
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            while not self._queue.empty():
+                self._queue.get_nowait()[3].cancel()
+            if len(self._running) > 0:
+                await asyncio.wait(list(self._running))
+            self._worker = None
+            self._queue = None
+
+    async def _submit(self, kind, key, payload):
+        if self._worker is None:
+            self._queue = asyncio.Queue(self.max_queue)
+            self._worker = asyncio.ensure_future(self._run())
+        future = get_loop().create_future()
+        await self._queue.put((kind, key, payload, future)) # waits while the queue is full
+        return await future
+
+    async def _run(self):
+        queue = self._queue
+        running = asyncio.Semaphore(self.max_running)
+
+        def finished(task):
+            self._running.discard(task)
+            running.release()
+
+        while True:
+            batch = [await queue.get()]
+            if self.window > 0:
+                await asyncio.sleep(self.window)
+            while len(batch) < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+            # one native call for requests of the same kind and arguments
+            groups = OrderedDict()
+            for item in batch:
+                groups.setdefault(item[:2], []).append(item)
+            # the next batch is collected while this one runs
+            for (kind, key), items in groups.items():
+                await running.acquire()
+                self.requests += len(items)
+                task = asyncio.ensure_future(self._run_group(kind, key, items))
+                self._running.add(task)
+                task.add_done_callback(finished)
+
+    async def _run_group(self, kind, key, items):
+        if kind == ANALYZE:
+            call = partial(self.morf.analyze_many, [item[2] for item in items], **dict(key))
+        else:
+            call = partial(self.morf.synthesize_many, [item[2] for item in items], **dict(key))
+        self.batches += 1
+        try:
+            results = await get_loop().run_in_executor(self.executor, call)
+        except Exception as e:
+            if len(items) > 1:
+                # find the requests that failed
+                await asyncio.gather(*[self._run_group(kind, key, [item]) for item in items])
+            elif not items[0][3].done():
+                items[0][3].set_exception(e)
+            return
+        for item, result in zip(items, results):
+            if not item[3].done():
+                item[3].set_result(result)
+
+
+# default batchers of the event loops
+batchers = weakref.WeakKeyDictionary()
+
+def default_batcher():
+    '''Return the default batcher of the running event loop.'''
+    loop = get_loop()
+    batcher = batchers.get(loop)
+    if batcher is None:
+        batcher = batchers[loop] = Batcher()
+    return batcher
+
+
+async def analyze(words, **kwargs):
+    '''Perform morphological analysis on input without blocking the event loop.
+
+    Parameters
+    ----------
+    words: list of str or str
+        Either a list of pretokenized words or a string. In case of a string, it will be splitted using
+        default behaviour of string.split() function.
+
+    Keyword parameters
+    ------------------
+    guess: boolean
+        If True, then use guessing, when analyzing unknown words (default: True)
+    phonetic: boolean
+        If True, add phonetic information to the root forms (default: True).
+    compound: boolean
+        if True, add compound word markers to root forms (default: True)
+    output: str
+        Either 'dict' to return dictionaries or 'compact' to return WordRecord and
+        AnalysisRecord instances (default: 'dict').
+
+    Returns
+    -------
+    list of (list of dict)
+        List of analysis for each word in input.
+    '''
+    return await default_batcher().analyze(words, **kwargs)
+
+
+async def synthesize(lemma, **kwargs):
+    '''Given lemma, pos tag and a form, synthesize the word without blocking the event loop.
+
+    Parameters
+    ----------
+    lemma: str
+        The lemma of the word to be synthesized.
+
+    Keyword parameters
+    ------------------
+    partofspeech: str
+        The POS tag of the word to be synthesized.
+    form: str
+        The form of the word to be synthesized.
+    hint: str
+        The hint used by vabamorf to synthesize the word.
+    guess: bool
+        If True, use guessing for unknown words (default: True)
+    phonetic: bool
+        If True, add phonetic markers to synthesized words (default: True).
+
+    Returns
+    -------
+    list of str
+        The list of synthesized words.
+    '''
+    return await default_batcher().synthesize(lemma, **kwargs)
@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+'''
+Benchmarks of pyvabamorf analysis, synthesis and startup.
+
+Run them with
+
+    python -m pyvabamorf.benchmarks [--words N] [--repeat N] [--seed N] [--output FILE]
+                                    [--no-hot-words] [--analysis-cache-size N] [--disk-cache FILE]
+
+The results are written as JSON, so that runs can be compared. The settings of the
+measured PyVabamorf instance are written with them, as they change the results.
+The analysis is measured on the sentences of the bundled test/ana.json
+(when running from a source checkout) and on a generated corpus,
+where words follow a Zipfian distribution and are mixed with long tokens
+and out-of-vocabulary words.
+
+Attributes
+----------
+
+DATA_PATH: str
+    The path of the directory containing ana.json and syn.json.
+CORPUS_WORDS: int
+    The default number of words in the generated corpus.
+REPEAT: int
+    The default number of times each benchmark is run, the best run is reported.
+SEED: int
+    The default seed of the corpus generator.
+ZIPF_EXPONENT: float
+    The exponent of the Zipfian distribution of the generated words.
+OOV_RATE, LONG_TOKEN_RATE: float
+    The share of out-of-vocabulary words and long tokens in the generated corpus.
+VOCABULARY: list of str
+    Common Estonian word forms of the generated corpus, the most frequent first.
+SYNTHESIS_FORMS: list of str
+    The forms synthesized for the lemmas of the generated corpus.
+ANALYZE_SETTINGS: list of dict
+    The argument combinations analyze() is measured with.
+'''
+from __future__ import unicode_literals, print_function
+
+from pyvabamorf.morf import PACKAGE_PATH, PyVabamorf
+from bisect import bisect
+import argparse
+import codecs
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None # not available on Windows
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(PACKAGE_PATH)), 'test')
+CORPUS_WORDS = 20000
+REPEAT = 3
+SEED = 1
+ZIPF_EXPONENT = 1.1
+OOV_RATE = 0.05
+LONG_TOKEN_RATE = 0.01
+
+VOCABULARY = '''
+ja on ei et see oli ka kui mis ta nii aga siis kes tema seda veel või mida
+üks oma nad mitte kõik juba ning selle kus ole mina sest väga nagu üle
+aasta vaid pärast tuleb aastal inimesed peab kuid enam ainult kaks koos täna
+saab hea kõige suur teha nüüd kogu riigi linna eesti päeva tööd raha aega
+inimese ajal jaoks valitsus kooli maja mees naine lapsed sõnul tagasi uue
+korda osa kohta puhul ees järgi vastu lõpuks tõttu hulgas kohe ette võib
+Tallinna Tartu Eesti Euroopa Venemaa Soome ministri presidendi politsei
+kirjutas ütles rääkis teatas leidis sai läks tuli pani võttis andis jäi
+kasvas müüs ostis elas töötas õppis mängis lõpetas alustas jätkas
+suure uued paremini hiljem varem kiiresti aeglaselt eraldi
+majanduse ettevõtte teenuse tervishoiu hariduse kultuuri arengu
+'''.split()
+
+SYNTHESIS_FORMS = ['sg g', 'sg p', 'sg in', 'pl n', 'pl p', 'sg kom']
+
+ANALYZE_SETTINGS = [
+    {'guess': True, 'phonetic': True, 'compound': True},
+    {'guess': False, 'phonetic': True, 'compound': True},
+    {'guess': True, 'phonetic': False, 'compound': False},
+    {'guess': False, 'phonetic': False, 'compound': False},
+]
+
+LETTERS = 'abdeghijklmnoprstuvõäöü'
+LONG_TOKENS = [
+    'kolmekümnekahekordselt' * 3,
+    'http://www.example.ee/' + 'a' * 100,
+    '-'.join(['raudtee', 'jaama', 'hoone', 'remondi', 'töö', 'kava', 'projekt']),
+    '1234567890' * 5,
+]
+
+# keys of the relaxed JSON of the test data are not quoted
+unquoted_key_regex = re.compile(r'^(\s*)(\w+)\s*:', re.MULTILINE)
+
+
+def load_data(name):
+    '''Load a test data file from DATA_PATH.
+
+    Returns
+    -------
+    dict
+        The parsed data or None, if the file is missing.
+    '''
+    path = os.path.join(DATA_PATH, name)
+    if not os.path.isfile(path):
+        return None
+    with codecs.open(path, 'r', 'utf-8') as f:
+        return json.loads(unquoted_key_regex.sub(r'\1"\2":', f.read()))
+
+
+def sample_sentences():
+    '''Return the sentences of test/ana.json as lists of words.'''
+    data = load_data('ana.json')
+    if data is None:
+        return []
+    return [[word['text'] for word in sentence['words']]
+            for paragraph in data['paragraphs']
+            for sentence in paragraph['sentences']]
+
+
+def sample_requests():
+    '''Return the synthesis requests of test/syn.json as (lemma, partofspeech, form, hint) tuples.'''
+    data = load_data('syn.json')
+    if data is None:
+        return []
+    return [(word['lemma'], word.get('partofspeech', ''), word.get('form', ''), word.get('hint', ''))
+            for word in data['words']]
+
+
+def zipf_corpus(words=CORPUS_WORDS, seed=SEED):
+    '''Generate a corpus of sentences.
+
+    The words are drawn from VOCABULARY with Zipfian frequencies. Some are replaced
+    by generated out-of-vocabulary words and long tokens.
+
+    Returns
+    -------
+    list of (list of str)
+        The sentences of the corpus, each ending with a full stop.
+    '''
+    rng = random.Random(seed)
+    weights = [1.0 / (rank ** ZIPF_EXPONENT) for rank in range(1, len(VOCABULARY) + 1)]
+    cumulative = []
+    total = 0.0
+    for weight in weights:
+        total += weight
+        cumulative.append(total)
+    sentences = []
+    sentence = []
+    length = rng.randint(5, 20)
+    for i in range(words):
+        x = rng.random()
+        if x < LONG_TOKEN_RATE:
+            word = rng.choice(LONG_TOKENS)
+        elif x < LONG_TOKEN_RATE + OOV_RATE:
+            word = ''.join(rng.choice(LETTERS) for j in range(rng.randint(4, 14)))
+        else:
+            word = VOCABULARY[min(bisect(cumulative, rng.random() * total), len(VOCABULARY) - 1)]
+        sentence.append(word)
+        if len(sentence) == length:
+            sentence.append('.')
+            sentences.append(sentence)
+            sentence = []
+            length = rng.randint(5, 20)
+    if len(sentence) > 0:
+        sentence.append('.')
+        sentences.append(sentence)
+    return sentences
+
+
+def synthesis_requests(morf):
+    '''Return synthesis requests for the nouns of VOCABULARY and test/syn.json.'''
+    requests = sample_requests()
+    for analysis in morf.analyze(VOCABULARY, guess=False):
+        for an in analysis['analysis'][:1]:
+            if an['partofspeech'] == 'S':
+                requests.extend((an['lemma'], 'S', form, '') for form in SYNTHESIS_FORMS)
+    return requests
+
+
+def best_time(func, repeat):
+    '''Return the shortest wall clock time of `repeat` calls of `func`.'''
+    best = None
+    for i in range(repeat):
+        start = time.time()
+        func()
+        seconds = time.time() - start
+        if best is None or seconds < best:
+            best = seconds
+    return best
+
+
+def bench_analyze(morf, sentences, repeat, **kwargs):
+    '''Measure analyze() on each sentence.
+
+    Returns
+    -------
+    dict
+        The number of words, the best time and words per second.
+    '''
+    words = sum(len(sentence) for sentence in sentences)
+    def run():
+        for sentence in sentences:
+            morf.analyze(sentence, **kwargs)
+    seconds = best_time(run, repeat)
+    return {'words': words,
+            'seconds': seconds,
+            'words_per_second': words / seconds if seconds > 0 else None}
+
+
+def bench_synthesize(morf, requests, repeat):
+    '''Measure synthesize() on each request.
+
+    Returns
+    -------
+    dict
+        The number of calls, the best time and calls per second.
+    '''
+    def run():
+        for lemma, partofspeech, form, hint in requests:
+            morf.synthesize(lemma, partofspeech=partofspeech, form=form, hint=hint)
+    seconds = best_time(run, repeat)
+    return {'calls': len(requests),
+            'seconds': seconds,
+            'calls_per_second': len(requests) / seconds if seconds > 0 else None}
+
+
+STARTUP_CODE = '''
+import time
+start = time.time()
+import pyvabamorf
+imported = time.time()
+pyvabamorf.analyze('tere')
+analyzed = time.time()
+print(imported - start, analyzed - imported)
+'''
+
+def bench_startup(repeat):
+    '''Measure importing pyvabamorf and the first analysis in a new interpreter.
+
+    Returns
+    -------
+    dict
+        The best import time and the best time of opening the dictionary and analyzing a word.
+    '''
+    imports = []
+    engines = []
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([os.path.dirname(os.path.abspath(PACKAGE_PATH))] + sys.path)
+    for i in range(repeat):
+        output = subprocess.check_output([sys.executable, '-c', STARTUP_CODE], env=env)
+        seconds = output.decode('ascii').split()
+        imports.append(float(seconds[0]))
+        engines.append(float(seconds[1]))
+    return {'import_seconds': min(imports),
+            'first_analysis_seconds': min(engines),
+            'total_seconds': min(i + e for i, e in zip(imports, engines))}
+
+
+def peak_rss():
+    '''Return the peak resident set size of the process in KiB or None, if unknown.'''
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss # bytes on macOS
+
+
+def run(words=CORPUS_WORDS, repeat=REPEAT, seed=SEED, hot_words=True, analysis_cache_size=0, disk_cache=None):
+    '''Run all benchmarks.
+
+    Parameters
+    ----------
+    words: int
+        The number of words in the generated corpus (default: CORPUS_WORDS).
+    repeat: int
+        The number of times each benchmark is run, the best run is reported (default: REPEAT).
+    seed: int
+        The seed of the corpus generator (default: SEED).
+    hot_words: boolean
+        If True, then the analyzer uses the table of precomputed analyses of frequent words (default: True).
+    analysis_cache_size: int
+        The number of word analyses kept in the in-memory cache, 0 disables it (default: 0).
+    disk_cache: str
+        The file of the persistent analysis cache, if None, then it is not used (default: None).
+
+    Returns
+    -------
+    dict
+        The settings, the environment and the results of the benchmarks.
+    '''
+    morf = PyVabamorf(hot_words=hot_words, analysis_cache_size=analysis_cache_size, disk_cache=disk_cache)
+    corpora = {'zipf': zipf_corpus(words, seed)}
+    samples = sample_sentences()
+    if len(samples) > 0:
+        corpora['ana.json'] = samples
+    analyze = []
+    for name in sorted(corpora):
+        for kwargs in ANALYZE_SETTINGS:
+            result = bench_analyze(morf, corpora[name], repeat, **kwargs)
+            result.update(kwargs)
+            result['corpus'] = name
+            analyze.append(result)
+    return {'settings': {'words': words, 'repeat': repeat, 'seed': seed, 'hot_words': bool(hot_words),
+                         'analysis_cache_size': analysis_cache_size, 'disk_cache': disk_cache},
+            'environment': {'python': platform.python_version(),
+                            'implementation': platform.python_implementation(),
+                            'platform': platform.platform(),
+                            'time': time.strftime('%Y-%m-%dT%H:%M:%S')},
+            'analyze': analyze,
+            'synthesize': bench_synthesize(morf, synthesis_requests(morf), repeat),
+            'startup': bench_startup(repeat),
+            'engine_counters': morf.engine_counters(),
+            'peak_rss_kib': peak_rss()}
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog='python -m pyvabamorf.benchmarks', description='Benchmark pyvabamorf.')
+    parser.add_argument('--words', type=int, default=CORPUS_WORDS, help='number of words in the generated corpus')
+    parser.add_argument('--repeat', type=int, default=REPEAT, help='number of runs of each benchmark')
+    parser.add_argument('--seed', type=int, default=SEED, help='seed of the corpus generator')
+    parser.add_argument('--output', default='-', help='file to write the JSON results to (default: standard output)')
+    parser.add_argument('--no-hot-words', dest='hot_words', action='store_false',
+                        help='do not use the table of precomputed analyses of frequent words')
+    parser.add_argument('--analysis-cache-size', type=int, default=0,
+                        help='number of word analyses kept in the in-memory cache (default: 0, disabled)')
+    parser.add_argument('--disk-cache', metavar='FILE', help='file of the persistent analysis cache (default: not used)')
+    args = parser.parse_args(args)
+    results = json.dumps(run(args.words, args.repeat, args.seed, args.hot_words, args.analysis_cache_size, args.disk_cache),
+                         indent=2, sort_keys=True)
+    if args.output == '-':
+        print(results)
+    else:
+        with codecs.open(args.output, 'w', 'utf-8') as f:
+            f.write(results)
+            f.write('\n')
+
+
+if __name__ == '__main__':
+    main()
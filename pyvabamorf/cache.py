@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+'''
+Size bounded least recently used caches used by pyvabamorf.
+
+Attributes
+----------
+
+DISK_CACHE_TIMEOUT: float
+    The number of seconds a DiskCache waits for the other processes writing to it.
+DISK_CACHE_EVICT: float
+    The share of the items of a full DiskCache removed at once to make room for new ones.
+'''
+from __future__ import unicode_literals, print_function
+
+import threading
+import json
+import os
+from collections import OrderedDict
+
+try:
+    import sqlite3
+except ImportError:
+    sqlite3 = None # Python built without SQLite
+
+DISK_CACHE_TIMEOUT = 60.0
+DISK_CACHE_EVICT = 0.1
+
+
+class LRUCache(object):
+    '''Thread-safe mapping that keeps at most `maxsize` least recently used items.
+
+    Attributes
+    ----------
+    maxsize: int
+        The maximum number of items kept in the cache.
+    hits: int
+        Number of lookups that found the item.
+    misses: int
+        Number of lookups that did not find the item.
+    evictions: int
+        Number of items removed to make room for new ones.
+    '''
+
+    def __init__(self, maxsize):
+        '''Initialize the cache.
+
+        Parameters
+        ----------
+        maxsize: int
+            The maximum number of items kept in the cache. Must be positive.
+        '''
+        if maxsize <= 0:
+            raise ValueError('Cache size must be positive: {0}'.format(maxsize))
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key, default=None):
+        '''Return the item stored with `key` and mark it as recently used.
+
+        Returns `default`, if there is no such item.
+        '''
+        with self._lock:
+            try:
+                value = self._items.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self._items[key] = value
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        '''Store `value` with `key`, evicting the least recently used item when full.'''
+        with self._lock:
+            if key in self._items:
+                del self._items[key]
+            elif len(self._items) >= self.maxsize:
+                self._items.popitem(last=False)
+                self.evictions += 1
+            self._items[key] = value
+
+    def clear(self):
+        '''Remove all items and reset the counters.'''
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        '''Return the cache usage counters.
+
+        Returns
+        -------
+        dict
+            Number of hits, misses, evictions, the number of items in the cache and the maximum size.
+        '''
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions,
+                    'size': len(self._items),
+                    'maxsize': self.maxsize}
+
+
+class DiskCache(object):
+    '''Size bounded mapping of text keys to JSON values kept in an SQLite database file.
+
+    The cache is shared by all processes and threads opening the same file. Reading does
+    not block the other readers and writers and the writers wait for each other.
+    When the cache is full, the least recently used items are removed. An item read
+    from the cache is marked as used, when the process reading it next writes to the cache.
+    The items are removed when the cache is opened with a different version.
+
+    Attributes
+    ----------
+    path: str
+        The database file.
+    maxsize: int
+        The maximum number of items kept in the cache.
+    version: str
+        The version of the items, for example a hash of the data they are computed from.
+    hits: int
+        Number of lookups by this instance that found the item.
+    misses: int
+        Number of lookups by this instance that did not find the item.
+    evictions: int
+        Number of items removed by this instance to make room for new ones.
+    '''
+
+    def __init__(self, path, maxsize, version):
+        '''Open the cache, creating the file if it does not exist.
+
+        Parameters
+        ----------
+        path: str
+            The database file.
+        maxsize: int
+            The maximum number of items kept in the cache. Must be positive.
+        version: str
+            The version of the items. The items of other versions are removed.
+        '''
+        if sqlite3 is None:
+            raise Exception('The disk cache requires the sqlite3 module')
+        if maxsize <= 0:
+            raise ValueError('Cache size must be positive: {0}'.format(maxsize))
+        self.path = path
+        self.maxsize = maxsize
+        self.version = version
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._used = set()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        with self._transaction() as db:
+            db.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)')
+            db.execute('CREATE TABLE IF NOT EXISTS items (key TEXT PRIMARY KEY, value TEXT, used INTEGER)')
+            db.execute('CREATE INDEX IF NOT EXISTS items_used ON items (used)')
+            row = db.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+            if row is None or row[0] != version:
+                db.execute('DELETE FROM items')
+                db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (version,))
+                db.execute("INSERT OR REPLACE INTO meta VALUES ('size', '0')")
+
+    def _connection(self):
+        '''Return the database connection of the calling thread, opened on first use in each thread and process.'''
+        db = getattr(self._local, 'db', None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=DISK_CACHE_TIMEOUT, isolation_level=None, check_same_thread=False)
+            db.execute('PRAGMA journal_mode=WAL') # readers do not wait for the writer
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._local.db = db
+            self._local.pid = os.getpid()
+        return db
+
+    def _transaction(self):
+        return Transaction(self._connection())
+
+    def __len__(self):
+        row = self._connection().execute("SELECT value FROM meta WHERE name = 'size'").fetchone()
+        return int(row[0]) if row is not None else 0
+
+    def get_many(self, keys):
+        '''Return the items stored with `keys`.
+
+        Returns
+        -------
+        dict
+            The values of the keys found in the cache.
+        '''
+        keys = list(set(keys))
+        found = {}
+        db = self._connection()
+        # SQLite allows at most 999 parameters in a statement
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            query = 'SELECT key, value FROM items WHERE key IN ({0})'.format(','.join('?' * len(chunk)))
+            for key, value in db.execute(query, chunk):
+                found[key] = json.loads(value)
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+            if len(self._used) < self.maxsize:
+                self._used.update(found)
+        return found
+
+    def get(self, key, default=None):
+        '''Return the item stored with `key` or `default`, if there is no such item.'''
+        return self.get_many([key]).get(key, default)
+
+    def put_many(self, items):
+        '''Store the (key, value) pairs `items`, evicting the least recently used items when full.'''
+        with self._lock:
+            used = self._used
+            self._used = set()
+        with self._transaction() as db:
+            # the writes are numbered, as the clocks of the processes may differ
+            now = db.execute('SELECT COALESCE(MAX(used), 0) FROM items').fetchone()[0] + 1
+            if len(used) > 0:
+                db.executemany('UPDATE items SET used = ? WHERE key = ?', [(now, key) for key in used])
+            added = 0
+            for key, value in items:
+                cursor = db.execute('UPDATE items SET value = ?, used = ? WHERE key = ?', (json.dumps(value), now, key))
+                if cursor.rowcount == 0:
+                    db.execute('INSERT INTO items VALUES (?, ?, ?)', (key, json.dumps(value), now))
+                    added += 1
+            size = int(db.execute("SELECT value FROM meta WHERE name = 'size'").fetchone()[0]) + added
+            if size > self.maxsize:
+                # make room for more than one item at once
+                evicted = size - self.maxsize + int(self.maxsize * DISK_CACHE_EVICT)
+                evicted = min(evicted, size)
+                db.execute('DELETE FROM items WHERE key IN (SELECT key FROM items ORDER BY used LIMIT ?)', (evicted,))
+                size -= evicted
+                with self._lock:
+                    self.evictions += evicted
+            db.execute("UPDATE meta SET value = ? WHERE name = 'size'", (str(size),))
+
+    def put(self, key, value):
+        '''Store `value` with `key`, evicting the least recently used items when full.'''
+        self.put_many([(key, value)])
+
+    def clear(self):
+        '''Remove all items and reset the counters.'''
+        with self._transaction() as db:
+            db.execute('DELETE FROM items')
+            db.execute("UPDATE meta SET value = '0' WHERE name = 'size'")
+        with self._lock:
+            self._used = set()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def close(self):
+        '''Close the database connection of the calling thread.'''
+        db = getattr(self._local, 'db', None)
+        if db is not None:
+            if self._local.pid == os.getpid():
+                db.close()
+            self._local.db = None
+
+    def stats(self):
+        '''Return the cache usage counters.
+
+        Returns
+        -------
+        dict
+            Number of hits, misses, evictions of this instance, the number of items in
+            the cache and the maximum size.
+        '''
+        size = len(self)
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions,
+                    'size': size,
+                    'maxsize': self.maxsize}
+
+
+class Transaction(object):
+    '''Context manager running a write transaction on an SQLite connection.
+
+    The transaction takes the write lock at the start, so concurrent writers
+    wait for each other instead of failing when upgrading a read lock.
+    '''
+
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute('BEGIN IMMEDIATE')
+        return self.db
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.db.execute('COMMIT')
+        else:
+            self.db.execute('ROLLBACK')
+        return False
@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+'''
+Command line bulk analysis and synthesis.
+
+Usage:
+
+    python -m pyvabamorf analyze [options] [INPUT ...]
+    python -m pyvabamorf synthesize [options] [INPUT ...]
+
+The input is read from the given files or the standard input either as plain text
+or as JSON lines. Files ending with .gz or .bz2 are decompressed.
+
+In plain text, every line is analyzed as a sentence. For synthesis, every line
+contains the lemma, form, partofspeech and hint separated by tabs, the last two
+are optional. In JSON lines, every line is an object, where the text to analyze is
+a string or a list of words in the `text` field (see --field) or the synthesis request
+is given in the `lemma`, `form`, `partofspeech` and `hint` fields.
+
+For every input line one JSON line is written: the object read or the text
+as {"text": ...}, with the result added in the `analysis` or `synthesis` field.
+The output is compressed, when its name ends with .gz or .bz2.
+
+With --checkpoint, the progress is saved after every chunk of lines written.
+When the checkpoint file exists, the job continues from where it stopped and the
+output written after the last checkpoint is discarded. The checkpoint is removed
+when the job finishes.
+
+Attributes
+----------
+
+CHUNKSIZE: int
+    The default number of lines processed at once by a worker.
+'''
+from __future__ import unicode_literals, print_function
+
+from pyvabamorf.parallel import shared_instance
+from multiprocessing import Pool
+from collections import deque
+from itertools import islice
+import argparse
+import json
+import gzip
+import bz2
+import io
+import os
+import six
+import sys
+
+CHUNKSIZE = 500
+
+ANALYZE = 'analyze'
+SYNTHESIZE = 'synthesize'
+TEXT = 'text'
+JSONL = 'jsonl'
+
+
+def compression(path):
+    '''Return the compression of a file, either 'gz', 'bz2' or None.'''
+    for suffix in ['gz', 'bz2']:
+        if path.endswith('.' + suffix):
+            return suffix
+    return None
+
+
+def input_format(path):
+    '''Guess the format of an input file from its name.'''
+    name = path[:path.rfind('.')] if compression(path) is not None else path
+    return JSONL if name.endswith('.jsonl') or name.endswith('.json') else TEXT
+
+
+def stdin():
+    return getattr(sys.stdin, 'buffer', sys.stdin)
+
+
+def stdout():
+    return getattr(sys.stdout, 'buffer', sys.stdout)
+
+
+def read_lines(paths):
+    '''Read the lines of the input files without the line ends.
+
+    Only newlines end a line, other line breaks like U+2028 are kept in it.
+    '''
+    for path in paths:
+        if path == '-':
+            f = stdin()
+        elif compression(path) == 'gz':
+            f = gzip.open(path, 'rb')
+        elif compression(path) == 'bz2':
+            f = bz2.BZ2File(path, 'rb')
+        else:
+            f = io.open(path, 'rb')
+        try:
+            for line in f:
+                yield line.decode('utf-8').rstrip('\r\n')
+        finally:
+            if f is not stdin():
+                f.close()
+
+
+def chunks(lines, chunksize):
+    '''Split an iterable of lines into lists of at most `chunksize` lines.'''
+    while True:
+        chunk = list(islice(lines, chunksize))
+        if len(chunk) == 0:
+            return
+        yield chunk
+
+
+def parse_json(line):
+    value = json.loads(line)
+    if not isinstance(value, dict):
+        raise ValueError('Expected a JSON object: {0}'.format(line[:100]))
+    return value
+
+
+def analyze_chunk(args):
+    '''Analyze a chunk of input lines, returning the output lines.'''
+    lines, fmt, field, kwargs = args
+    if fmt == TEXT:
+        records = [{'text': line} for line in lines]
+        field = 'text'
+    else:
+        records = [parse_json(line) for line in lines]
+    sentences = []
+    for line, record in zip(lines, records):
+        words = record.get(field, '')
+        if isinstance(words, six.string_types):
+            words = words.split()
+        elif not isinstance(words, list) or not all(isinstance(word, six.string_types) for word in words):
+            raise ValueError('Expected a string or a list of strings in field {0}: {1}'.format(field, line[:100]))
+        sentences.append(words)
+    results = shared_instance().analyze_many(sentences, **kwargs)
+    for record, result in zip(records, results):
+        record['analysis'] = result
+    return [json.dumps(record, ensure_ascii=False) for record in records]
+
+
+def synthesize_chunk(args):
+    '''Synthesize the words of a chunk of input lines, returning the output lines.'''
+    lines, fmt, field, kwargs = args
+    if fmt == TEXT:
+        records = []
+        for line in lines:
+            fields = line.split('\t')
+            record = {'lemma': fields[0]}
+            record.update(zip(['form', 'partofspeech', 'hint'], fields[1:]))
+            records.append(record)
+    else:
+        records = [parse_json(line) for line in lines]
+    requests = [(record.get('lemma', ''), record.get('partofspeech', ''), record.get('form', ''), record.get('hint', ''))
+                for record in records]
+    results = shared_instance().synthesize_many(requests, **kwargs)
+    for record, result in zip(records, results):
+        record['synthesis'] = result
+    return [json.dumps(record, ensure_ascii=False) for record in records]
+
+
+def imap_bounded(pool, func, tasks, window):
+    '''Like Pool.imap(), but reads at most `window` tasks ahead of the results.'''
+    pending = deque()
+    for task in tasks:
+        pending.append(pool.apply_async(func, (task,)))
+        if len(pending) >= window:
+            yield pending.popleft().get()
+    while len(pending) > 0:
+        yield pending.popleft().get()
+
+
+class OutputWriter(object):
+    '''Writes chunks of output lines to a file or the standard output.
+
+    Every chunk is compressed separately, so the file can be truncated
+    to the end of any chunk and appended to later.
+    '''
+
+    def __init__(self, path, offset=None):
+        '''Open the output.
+
+        Parameters
+        ----------
+        path: str
+            The output file or '-' for the standard output.
+        offset: int
+            If not None, keep the first `offset` bytes of the file and append to them.
+        '''
+        self.path = path
+        self.compression = compression(path)
+        if path == '-':
+            self.file = stdout()
+        elif offset is None:
+            self.file = io.open(path, 'wb')
+        else:
+            self.file = io.open(path, 'r+b')
+            self.file.truncate(offset)
+            self.file.seek(offset)
+
+    def write(self, lines):
+        '''Write a chunk of lines and flush them to the disk.'''
+        data = ''.join(line + '\n' for line in lines).encode('utf-8')
+        if self.compression == 'gz':
+            buf = io.BytesIO()
+            member = gzip.GzipFile(fileobj=buf, mode='wb')
+            member.write(data)
+            member.close()
+            data = buf.getvalue()
+        elif self.compression == 'bz2':
+            data = bz2.compress(data)
+        self.file.write(data)
+        self.file.flush()
+        if self.path != '-':
+            os.fsync(self.file.fileno())
+
+    def tell(self):
+        return self.file.tell()
+
+    def close(self):
+        if self.path != '-':
+            self.file.close()
+
+
+def load_checkpoint(path, job):
+    '''Return the saved progress of the job or None, if the job has not been started.'''
+    if path is None or not os.path.exists(path):
+        return None
+    with io.open(path, 'r', encoding='utf-8') as f:
+        checkpoint = json.load(f)
+    if checkpoint.get('job') != job:
+        raise Exception('Checkpoint {0} was saved by a different job: {1}'.format(path, checkpoint.get('job')))
+    return checkpoint
+
+
+def save_checkpoint(path, job, records, offset):
+    '''Save the progress of the job atomically.'''
+    tmp = path + '.tmp'
+    with io.open(tmp, 'w', encoding='utf-8') as f:
+        f.write(six.text_type(json.dumps({'job': job, 'records': records, 'output_bytes': offset})))
+        f.flush()
+        os.fsync(f.fileno())
+    if hasattr(os, 'replace'):
+        os.replace(tmp, path)
+    else:
+        if os.path.exists(path):
+            os.remove(path) # rename does not replace on Windows
+        os.rename(tmp, path)
+
+
+def run(command, inputs, output='-', fmt=None, field='text', workers=1, chunksize=CHUNKSIZE, checkpoint=None, **kwargs):
+    '''Analyze or synthesize the input lines, writing the results as JSON lines.
+
+    Parameters
+    ----------
+    command: str
+        Either 'analyze' or 'synthesize'.
+    inputs: list of str
+        The input files, '-' for the standard input.
+    output: str
+        The output file, '-' for the standard output (default: '-').
+    fmt: str
+        The input format, either 'text' or 'jsonl'. If None, it is guessed from the
+        name of the first input file (default: None).
+    field: str
+        The field of the JSON objects containing the text to analyze (default: 'text').
+    workers: int
+        The number of worker processes (default: 1).
+    chunksize: int
+        The number of lines processed at once by a worker (default: CHUNKSIZE).
+    checkpoint: str
+        The file where the progress is saved, None to disable checkpoints (default: None).
+
+    Keyword parameters
+    ------------------
+    The keyword arguments of analyze_many() or synthesize_many().
+
+    Returns
+    -------
+    int
+        The number of lines processed by this run.
+    '''
+    if fmt is None:
+        fmt = input_format(inputs[0])
+    if checkpoint is not None and output == '-':
+        raise Exception('Checkpoints require an output file')
+    if chunksize < 1 or workers < 1:
+        raise ValueError('chunksize and workers must be positive')
+    func = analyze_chunk if command == ANALYZE else synthesize_chunk
+    job = {'command': command, 'inputs': inputs, 'output': output, 'format': fmt, 'field': field, 'options': kwargs}
+    state = load_checkpoint(checkpoint, job)
+    done = state['records'] if state is not None else 0
+    writer = OutputWriter(output, state['output_bytes'] if state is not None else None)
+    lines = read_lines(inputs)
+    for i in range(done):
+        next(lines, None)
+    tasks = ((chunk, fmt, field, kwargs) for chunk in chunks(lines, chunksize))
+    processed = 0
+    pool = None
+    try:
+        if workers == 1:
+            results = six.moves.map(func, tasks)
+        else:
+            shared_instance() # load the dictionary before forking
+            pool = Pool(workers)
+            results = imap_bounded(pool, func, tasks, 2 * workers)
+        for result in results:
+            writer.write(result)
+            processed += len(result)
+            if checkpoint is not None:
+                save_checkpoint(checkpoint, job, done + processed, writer.tell())
+    except BaseException:
+        if pool is not None:
+            pool.terminate()
+        raise
+    finally:
+        writer.close()
+    if pool is not None:
+        pool.close()
+        pool.join()
+    if checkpoint is not None and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    return processed
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog='python -m pyvabamorf',
+                                     description='Morphological analysis and synthesis of large inputs.')
+    commands = parser.add_subparsers(dest='command')
+    for command in [ANALYZE, SYNTHESIZE]:
+        sub = commands.add_parser(command, help='{0} the input lines'.format(command))
+        sub.add_argument('inputs', nargs='*', default=['-'], metavar='INPUT',
+                         help='input files, optionally compressed with gzip or bzip2 (default: standard input)')
+        sub.add_argument('-o', '--output', default='-', help='output file (default: standard output)')
+        sub.add_argument('--format', choices=[TEXT, JSONL], help='input format (default: from the file name)')
+        sub.add_argument('--field', default='text', help='field of the JSON objects containing the text (default: text)')
+        sub.add_argument('--workers', type=int, default=1, help='number of worker processes (default: 1)')
+        sub.add_argument('--chunksize', type=int, default=CHUNKSIZE,
+                         help='number of lines processed at once (default: {0})'.format(CHUNKSIZE))
+        sub.add_argument('--checkpoint', help='file to save the progress to and resume from')
+        sub.add_argument('--no-guess', dest='guess', action='store_false', help='do not guess unknown words')
+        sub.add_argument('--no-phonetic', dest='phonetic', action='store_false', help='leave out phonetic markers')
+        if command == ANALYZE:
+            sub.add_argument('--no-compound', dest='compound', action='store_false', help='leave out compound markers')
+    args = parser.parse_args(args)
+    if args.command is None:
+        parser.error('command required')
+    kwargs = {'guess': args.guess, 'phonetic': args.phonetic}
+    if args.command == ANALYZE:
+        kwargs['compound'] = args.compound
+    try:
+        run(args.command, args.inputs, args.output, args.format, args.field,
+            args.workers, args.chunksize, args.checkpoint, **kwargs)
+    except KeyboardInterrupt:
+        sys.exit(130)
+    except Exception as e:
+        print('{0}: {1}'.format(parser.prog, e), file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+'''
+Precomputed analyses of the most frequent words.
+
+A few thousand word types make up about half of the words of a text. Their analyses
+are stored in a table next to the dictionary, so that PyVabamorf.analyze() finds them
+without calling the analyzer. The table is built from the dictionary with
+
+    python -m pyvabamorf.hotwords [--corpus FILE ...] [--size N] [--dictionary DIR]
+
+choosing the most frequent words of the corpora or, without corpora, the words of the
+existing table. The bundled table has a few thousand word forms, the common cases
+and verb forms of frequent words, so rebuilding it from the texts to be analyzed
+covers more of them.
+The table records the hash of the dictionary it was built from and is not used with
+another dictionary, so it has to be rebuilt when the dictionary changes.
+
+Only the words analyzed the same way with and without guessing, which do not start a
+multiword name and whose analyses differ only by the markers of the root with and
+without the phonetic and compound markers, are stored.
+
+Attributes
+----------
+
+HOT_WORDS_FILE: str
+    The name of the table in the dictionary directory.
+FORMAT: int
+    The version of the table format.
+SIZE: int
+    The default number of words chosen from the corpora.
+'''
+from __future__ import unicode_literals, print_function
+
+from pyvabamorf.morf import PyVabamorf, DICT_PATH, convert, get_root, dictionary_hash
+from collections import Counter
+import argparse
+import codecs
+import json
+import os
+import sys
+import warnings
+
+HOT_WORDS_FILE = 'hot.json'
+FORMAT = 1
+SIZE = 3000
+
+FIELDS = ('root', 'root_tokens', 'ending', 'clitic', 'partofspeech', 'form', 'lemma')
+FLAGS = [(phonetic, compound) for phonetic in [True, False] for compound in [True, False]]
+
+
+class HotWords(object):
+    '''The precomputed analyses of the words of the table.
+
+    Attributes
+    ----------
+    words: dict
+        The analyses of each word as lists of dictionaries like the ones returned
+        by analyze() with phonetic and compound markers.
+    '''
+
+    def __init__(self, words):
+        self.words = words
+        self._tables = {}
+
+    def __len__(self):
+        return len(self.words)
+
+    def table(self, phonetic, compound):
+        '''Return a dictionary of the analyses of the words with the given markers.
+
+        The keys are the words converted to be given to the SWIG wrapper. The analyses
+        are shared, so they must be copied before they are modified.
+        '''
+        key = (phonetic, compound)
+        table = self._tables.get(key)
+        if table is None:
+            table = dict((convert(word), [dict(an, root=get_root(an['root'], phonetic, compound)) for an in analysis])
+                         for word, analysis in self.words.items())
+            self._tables[key] = table
+        return table
+
+
+def load(lexPath=DICT_PATH):
+    '''Load the table of the dictionary in the directory `lexPath`.
+
+    Returns
+    -------
+    HotWords
+        The table or None, if there is no table or it was built from another dictionary,
+        in which case a warning is issued.
+    '''
+    path = os.path.join(lexPath, HOT_WORDS_FILE)
+    if not os.path.isfile(path):
+        return None
+    with codecs.open(path, 'r', 'utf-8') as f:
+        data = json.load(f)
+    if data.get('format') != FORMAT or data.get('dictionary') != dictionary_hash(lexPath):
+        warnings.warn('{0} was not built from the dictionary in use, rebuild it with '
+                      'python -m pyvabamorf.hotwords'.format(path))
+        return None
+    return HotWords(dict((word, [dict(zip(FIELDS, an)) for an in analysis])
+                         for word, analysis in data['words'].items()))
+
+
+def table_words(lexPath=DICT_PATH):
+    '''Return the words of the table of the dictionary in the directory `lexPath`, even if it is out of date.'''
+    path = os.path.join(lexPath, HOT_WORDS_FILE)
+    if not os.path.isfile(path):
+        return []
+    with codecs.open(path, 'r', 'utf-8') as f:
+        return sorted(json.load(f)['words'])
+
+
+def corpus_words(paths, size=SIZE):
+    '''Return the `size` most frequent words of the UTF-8 text files `paths`.'''
+    counts = Counter()
+    for path in paths:
+        with codecs.open(path, 'r', 'utf-8') as f:
+            for line in f:
+                counts.update(line.split())
+    return [word for word, count in counts.most_common(size)]
+
+
+def hot_analysis(morf, word):
+    '''Return the analysis of `word` to be stored in the table or None, if the word can not be stored.'''
+    if len(word) == 0 or len(word.split()) != 1 or morf._analyzer().multiwordStart(convert(word)):
+        return None
+    expected = morf.analyze([word], guess=True, phonetic=True, compound=True)
+    if len(expected) != 1 or expected[0]['text'] != word or len(expected[0]['analysis']) == 0:
+        return None
+    analysis = expected[0]['analysis']
+    for guess in [True, False]:
+        for phonetic, compound in FLAGS:
+            result = morf.analyze([word], guess=guess, phonetic=phonetic, compound=compound)
+            stored = [dict(an, root=get_root(an['root'], phonetic, compound)) for an in analysis]
+            if result != [{'text': word, 'analysis': stored}]:
+                return None
+    return analysis
+
+
+def build(words, lexPath=DICT_PATH, path=None):
+    '''Build the table of the given words.
+
+    Parameters
+    ----------
+    words: list of str
+        The words to store, the ones that can not be stored are left out.
+    lexPath: str
+        The path of the directory containing the dictionary (default: DICT_PATH).
+    path: str
+        The file to write the table to, if None, then HOT_WORDS_FILE in `lexPath` (default: None).
+
+    Returns
+    -------
+    list of str
+        The words stored.
+    '''
+    if path is None:
+        path = os.path.join(lexPath, HOT_WORDS_FILE)
+    morf = PyVabamorf(lexPath, hot_words=False)
+    table = {}
+    for word in words:
+        if word not in table:
+            analysis = hot_analysis(morf, word)
+            if analysis is not None:
+                table[word] = [[an[field] for field in FIELDS] for an in analysis]
+    data = {'format': FORMAT, 'dictionary': dictionary_hash(lexPath), 'words': table}
+    with codecs.open(path, 'w', 'utf-8') as f:
+        f.write(json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(',', ':')))
+        f.write('\n')
+    return sorted(table)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog='python -m pyvabamorf.hotwords',
+                                     description='Build the table of precomputed analyses of frequent words.')
+    parser.add_argument('--corpus', nargs='+', default=[], metavar='FILE',
+                        help='UTF-8 text files to choose the most frequent words from (default: the words of the existing table)')
+    parser.add_argument('--size', type=int, default=SIZE, help='number of words chosen from the corpora (default: {0})'.format(SIZE))
+    parser.add_argument('--dictionary', default=DICT_PATH, help='directory containing the dictionary (default: the bundled one)')
+    parser.add_argument('--output', help='file to write the table to (default: {0} in the dictionary directory)'.format(HOT_WORDS_FILE))
+    args = parser.parse_args(args)
+    if len(args.corpus) > 0:
+        words = corpus_words(args.corpus, args.size)
+    else:
+        words = table_words(args.dictionary)
+    if len(words) == 0:
+        parser.error('no words, give the corpora to choose them from')
+    stored = build(words, args.dictionary, args.output)
+    print('{0} of {1} words stored'.format(len(stored), len(words)), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,10 +5,24 @@ Morphoanalysis functionality of pyvabamorf package.
 Attributes
 ----------
 
+VERSION: str
+    The version of pyvabamorf.
 PACKAGE_PATH: str
     The path where the pyvabamorf package is located.
 DICT_PATH: str
     The path of the default vabamorf dictionary embedded with pyvabamorf.
+DICT_FILE: str
+    The name of the dictionary file in the dictionary directory.
+DICT_HASH_FILE: str
+    The name of the file next to the dictionary file, where its hash is saved.
+DISK_CACHE_SIZE: int
+    The default maximum number of word analyses kept in the disk cache.
+CACHE_BLOCKS: int
+    The default number of dictionary blocks kept in memory by the analyzer and synthesizer.
+MAX_SENTENCE_LENGTH: int
+    The maximum number of words in a sentence found by iter_sentences().
+ITER_BATCH_SIZE: int
+    The default number of sentences analyzed at once by analyze_iter().
 phonetic_markers: str
     List of characters that make up phonetic markup.
 compound_markers: str
@@ -17,19 +31,53 @@ phonetic_regex: regex
     Regular expression matching any phonetic marker.
 compound_regex: regex
     Regular expression matching any compound marker.
+sentence_end_regex: regex
+    Regular expression matching words that end a sentence.
+PARTOFSPEECH_VOCABULARY, FORM_VOCABULARY, ENDING_VOCABULARY, CLITIC_VOCABULARY: tuple of str
+    The fixed vocabularies of the columnar analysis. The id of a value is its index,
+    id 0 (None) stands for values missing from the vocabulary.
+lemma_table: dict
+    Table of interned lemmas of the columnar analysis.
+category_table: dict
+    Table of interned partofspeech, form, ending and clitic values.
 '''
 from __future__ import unicode_literals, print_function
 
 import pyvabamorf.vabamorf as vm
+from pyvabamorf.cache import LRUCache, DiskCache
+from pyvabamorf.profiling import Profile, AnalysisValues, timer
 import os
 import six
 import re
-import operator
-from functools import reduce
+import threading
+import array
+import atexit
+import hashlib
+import json
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+VERSION = '1.6' # keep in sync with setup.py
 
 # path listings
 PACKAGE_PATH = os.path.dirname(__file__)
 DICT_PATH = os.path.join(PACKAGE_PATH, 'dct')
+DICT_FILE = 'et.dct'
+DICT_HASH_FILE = 'et.dct.sha1'
+
+# disk cache size
+DISK_CACHE_SIZE = 1000000
+
+# dictionary block cache size
+CACHE_BLOCKS = 64
+
+# streaming analysis
+MAX_SENTENCE_LENGTH = 1000
+ITER_BATCH_SIZE = 100
+sentence_end_regex = re.compile(r'[.!?]+["\'»”“)\]]*$')
 
 # various markers
 phonetic_markers = frozenset('~?]<')
@@ -75,6 +123,36 @@ def deconvert(word):
     else:
         return word
 
+# fixed vocabularies of the columnar analysis
+PARTOFSPEECH_VOCABULARY = (None,) + tuple(deconvert(v) for v in vm.vocabulary(vm.PARTOFSPEECH_COLUMN))
+FORM_VOCABULARY = (None,) + tuple(deconvert(v) for v in vm.vocabulary(vm.FORM_COLUMN))
+ENDING_VOCABULARY = (None,) + tuple(deconvert(v) for v in vm.vocabulary(vm.ENDING_COLUMN))
+CLITIC_VOCABULARY = (None,) + tuple(deconvert(v) for v in vm.vocabulary(vm.CLITIC_COLUMN))
+
+# interned lemmas of the columnar analysis
+LEMMA_TABLE_SIZE = 100000
+lemma_table = {}
+
+# interned values of the small categorical vocabularies of the analyses
+CATEGORY_TABLE_SIZE = 10000
+category_table = dict((v, v) for v in PARTOFSPEECH_VOCABULARY + FORM_VOCABULARY + ENDING_VOCABULARY + CLITIC_VOCABULARY
+                      if v is not None)
+
+def intern_category(value):
+    '''Convert back a partofspeech, form, ending or clitic value from wrapper.
+    
+    Equal values share one string from the category table, which saves a lot
+    of memory when analyses of large texts are kept around.
+    '''
+    global category_table
+    try:
+        return category_table[value]
+    except KeyError:
+        value = deconvert(value)
+        if len(category_table) >= CATEGORY_TABLE_SIZE:
+            return value
+        return category_table.setdefault(value, value)
+
 def trim_phonetics(root):
     '''Function that trims phonetic markup from the root.
     
@@ -157,15 +235,11 @@ def get_group_tokens(root):
         groups.append(toks)
     return groups
 
-def get_lemma(grouptoks, partofspeech):
-    lemma = '-'.join([''.join(gr) for gr in grouptoks])
-    if partofspeech == 'V' and lemma not in ['ei', 'ära']:
-        lemma += 'ma'
-    return lemma
-
 def analysis_as_dict(an, trim_phonetic=True, trim_compound=True):
     '''Convert an analysis instance to a dictionary.
-    Also adds "ma" ending to verbs.
+    
+    The root tokens and the lemma, which has the "ma" ending added to verbs,
+    are made by the vabamorf library, when the analysis is created.
     
     Parameters
     ----------
@@ -181,20 +255,271 @@ def analysis_as_dict(an, trim_phonetic=True, trim_compound=True):
     dict
         Morfoanalysis results.
     '''
-    root = deconvert(an.root)
+    return {'root': get_root(deconvert(an.root), trim_phonetic, trim_compound),
+            'root_tokens': [deconvert(tok) for tok in an.rootTokens],
+            'ending': intern_category(an.ending),
+            'clitic': intern_category(an.clitic),
+            'partofspeech': intern_category(an.partofspeech),
+            'form': intern_category(an.form),
+            'lemma': deconvert(an.lemma)}
+
+
+class Record(object):
+    '''Base class of compact analysis results.
     
-    # extract tokens and construct lemma
-    grouptoks = get_group_tokens(root)
-    toks = reduce(operator.add, grouptoks)
-    lemma = get_lemma(grouptoks, an.partofspeech)
-        
-    return {'root': get_root(root, trim_phonetic, trim_compound),
-            'root_tokens': toks,
-            'ending': deconvert(an.ending),
-            'clitic': deconvert(an.clitic),
-            'partofspeech': deconvert(an.partofspeech),
-            'form': deconvert(an.form),
-            'lemma': lemma}
+    Records keep their fields in slots instead of a dictionary, which takes
+    considerably less memory. The fields can be accessed both as attributes and
+    as dictionary items, and a record compares equal to the dictionary with the same items.
+    '''
+    __slots__ = ()
+    __hash__ = None
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def keys(self):
+        return list(self.__slots__)
+
+    def as_dict(self):
+        '''Return the record as a dictionary.'''
+        return dict((key, getattr(self, key)) for key in self.__slots__)
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            other = other.as_dict()
+        if not isinstance(other, dict):
+            return NotImplemented
+        return self.as_dict() == other
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    def __reduce__(self):
+        return (self.__class__, tuple(getattr(self, key) for key in self.__slots__))
+
+    def __repr__(self):
+        fields = ', '.join('{0}={1!r}'.format(key, getattr(self, key)) for key in self.__slots__)
+        return '{0}({1})'.format(self.__class__.__name__, fields)
+
+
+class AnalysisRecord(Record):
+    '''Compact counterpart of the dictionary returned by analysis_as_dict().'''
+    __slots__ = ('root', 'root_tokens', 'ending', 'clitic', 'partofspeech', 'form', 'lemma')
+
+    def __init__(self, root, root_tokens, ending, clitic, partofspeech, form, lemma):
+        self.root = root
+        self.root_tokens = root_tokens
+        self.ending = ending
+        self.clitic = clitic
+        self.partofspeech = partofspeech
+        self.form = form
+        self.lemma = lemma
+
+
+class WordRecord(Record):
+    '''Compact counterpart of the word dictionary returned by PyVabamorf.analyze().'''
+    __slots__ = ('text', 'analysis')
+
+    def __init__(self, text, analysis):
+        self.text = text
+        self.analysis = analysis
+
+    def as_dict(self):
+        '''Return the word and its analyses as dictionaries.'''
+        return {'text': self.text,
+                'analysis': [an.as_dict() if isinstance(an, Record) else an for an in self.analysis]}
+
+
+def analysis_as_record(an, trim_phonetic=True, trim_compound=True):
+    '''Convert an analysis instance to a compact record.
+    
+    Parameters
+    ----------
+    an: vabamorf.WordAnalysis
+        Analysis result as returned by vabamorf library.
+    trim_phonetic: boolean
+        If True, then removes phonetic annotations from root form. (default: True)
+    trim_compound: boolean
+        If True, then removes compund word annotations from root form. (default: True)
+    
+    Returns
+    -------
+    AnalysisRecord
+        Morfoanalysis results.
+    '''
+    return AnalysisRecord(get_root(deconvert(an.root), trim_phonetic, trim_compound),
+                          [deconvert(tok) for tok in an.rootTokens],
+                          intern_category(an.ending),
+                          intern_category(an.clitic),
+                          intern_category(an.partofspeech),
+                          intern_category(an.form),
+                          deconvert(an.lemma))
+
+def convert_words(words):
+    '''Convert the words of a sentence to be given to SWIG wrapper.
+    
+    Parameters
+    ----------
+    words: list of str or str
+        Either a list of pretokenized words or a string. In case of a string, it will be splitted using
+        default behaviour of string.split() function.
+    
+    Returns
+    -------
+    list of str
+        The converted words.
+    '''
+    # if input is a string, then tokenize it with whitespace
+    if isinstance(words, six.string_types):
+        words = words.split()
+    return [convert(w) for w in words]
+
+def iter_sentences(iterable, max_length=MAX_SENTENCE_LENGTH):
+    '''Split a stream of text, tokens or sentences into sentences.
+    
+    Strings are split into words with whitespace and the words are collected into
+    sentences ending with words like "end." or "end!". Blank strings, such as empty
+    lines of a text file, also end a sentence. Lists and tuples are taken as
+    pretokenized sentences.
+    
+    Parameters
+    ----------
+    iterable: iterable of (str or list of str)
+        Text, for example the lines of a text file, separate words, or sentences.
+    max_length: int
+        Sentences longer than this are split (default: MAX_SENTENCE_LENGTH).
+    
+    Returns
+    -------
+    generator of (list of str)
+        The words of each sentence.
+    '''
+    sentence = []
+    for item in iterable:
+        if isinstance(item, (list, tuple)):
+            if len(sentence) > 0:
+                yield sentence
+                sentence = []
+            yield list(item)
+            continue
+        if isinstance(item, bytes) and not six.PY2:
+            item = item.decode('utf-8')
+        words = item.split()
+        if len(words) == 0 and len(sentence) > 0:
+            yield sentence
+            sentence = []
+        for word in words:
+            sentence.append(word)
+            if len(sentence) >= max_length or sentence_end_regex.search(word) is not None:
+                yield sentence
+                sentence = []
+    if len(sentence) > 0:
+        yield sentence
+
+def tokenize(text):
+    '''Split a text into words and punctuation.
+    
+    The text is split at whitespace and the punctuation marks and quotes at the
+    beginning and end of the pieces are split off, so that "«Olen homseni," gives
+    the tokens "«", "Olen", "homseni" and ",". Punctuation inside a piece, such as
+    in 3.5 or Tartu-Tallinn, is kept. The full stop after numbers (12. novembril)
+    and the abbreviations of the dictionary (dr. Tamm) is kept, except after
+    acronyms (USA.).
+    
+    Parameters
+    ----------
+    text: str
+        The text to tokenize.
+    
+    Returns
+    -------
+    list of (int, int)
+        The start and end character offsets of the tokens, text[start:end] is the token.
+    '''
+    spans = PyVabamorf.instance()._analyzer().tokenize(convert(text))
+    return list(zip(spans[::2], spans[1::2]))
+
+def sentence_as_dicts(morfresult):
+    '''Convert the analysis of a sentence returned by vabamorf library to a list of dictionaries.
+    
+    The markers have already been removed from the roots by the library.
+    '''
+    result = []
+    for word, analysis in morfresult:
+        analysis = [analysis_as_dict(an) for an in analysis]
+        result.append({'text': deconvert(word),
+                       'analysis': analysis})
+    return result
+
+def sentence_as_records(morfresult):
+    '''Convert the analysis of a sentence returned by vabamorf library to a list of compact records.'''
+    return [WordRecord(deconvert(word), [analysis_as_record(an) for an in analysis])
+            for word, analysis in morfresult]
+
+def records_from_dicts(sentence):
+    '''Convert the analysis of a sentence from dictionaries to compact records.'''
+    return [WordRecord(word['text'], [AnalysisRecord(**an) for an in word['analysis']]) for word in sentence]
+
+def interned_lemma(lemma):
+    '''Convert back a lemma made by vabamorf library, so that equal lemmas share one string from the lemma table.'''
+    global lemma_table
+    try:
+        return lemma_table[lemma]
+    except KeyError:
+        lemma = deconvert(lemma)
+        if len(lemma_table) >= LEMMA_TABLE_SIZE:
+            lemma_table.clear()
+        return lemma_table.setdefault(lemma, lemma)
+
+def as_int_array(values):
+    '''Convert a sequence of integers to a NumPy array, if NumPy is available, otherwise to array.array.'''
+    if numpy is not None:
+        return numpy.array(values, dtype=numpy.int32)
+    return array.array(str('i'), values)
+
+def synthesis_request(request):
+    '''Convert a synthesis request to a (lemma, partofspeech, form, hint) tuple to be given to SWIG wrapper.
+    
+    Parameters
+    ----------
+    request: str, tuple of str or dict
+        Either a lemma, a (lemma, partofspeech, form, hint) tuple, where the trailing elements
+        can be omitted, or a dictionary with keys lemma, partofspeech, form and hint, where
+        all but lemma are optional.
+    
+    Raises
+    ------
+    Exception
+        In case an illegal request is passed.
+    
+    Returns
+    -------
+    (str, str, str, str)
+        The converted lemma, partofspeech, form and hint.
+    '''
+    if isinstance(request, six.string_types):
+        request = (request,)
+    elif isinstance(request, dict):
+        for key in request:
+            if key not in ('lemma', 'partofspeech', 'form', 'hint'):
+                raise Exception('Unkown argument: {0}'.format(key))
+        request = (request['lemma'],
+                   request.get('partofspeech', ''),
+                   request.get('form', ''),
+                   request.get('hint', ''))
+    request = tuple(request)
+    if len(request) < 1 or len(request) > 4:
+        raise Exception('Illegal synthesis request: {0}'.format(request))
+    return tuple(convert(s) for s in request + ('',) * (4 - len(request)))
+
+def copy_analysis(analysis):
+    '''Copy the list of analysis dictionaries, so that the copy can be modified independently.'''
+    return [dict(an, root_tokens=list(an['root_tokens'])) for an in analysis]
 
 def get_args(**kwargs):
     '''Parse arguments from keyword parameters.
@@ -206,12 +531,13 @@ def get_args(**kwargs):
     
     Returns
     -------
-    (boolean, boolean, boolean)
-        Use heuristics, clean phonetics, clean compound.
+    (boolean, boolean, boolean, str)
+        Use heuristics, clean phonetics, clean compound, output format.
     '''
     guess = True
     phonetic = True
     compound = True
+    output = 'dict'
     for key, value in kwargs.items():
         if key == 'guess':
             guess = bool(value)
@@ -219,30 +545,221 @@ def get_args(**kwargs):
             phonetic = bool(value)
         elif key == 'compound':
             compound = bool(value)
+        elif key == 'output':
+            if value not in ('dict', 'compact'):
+                raise Exception('Unkown output: {0}'.format(value))
+            output = value
         else:
             raise Exception('Unkown argument: {0}'.format(key))
-    return (guess, phonetic, compound)
+    return (guess, phonetic, compound, output)
             
                 
+def dictionary_hash(lexPath=DICT_PATH):
+    '''Return the SHA-1 hash of the dictionary file in the directory `lexPath` as a hex string.
+    
+    The hash is saved in DICT_HASH_FILE with the size and modification time of the
+    dictionary file and computed again only when they change. When the directory is not
+    writable, the hash is computed every time.
+    '''
+    path = os.path.join(lexPath, DICT_FILE)
+    hash_path = os.path.join(lexPath, DICT_HASH_FILE)
+    stat = os.stat(path)
+    stamp = {'size': stat.st_size, 'mtime': repr(stat.st_mtime)}
+    try:
+        with open(hash_path, 'r') as f:
+            saved = json.load(f)
+        if saved.get('size') == stamp['size'] and saved.get('mtime') == stamp['mtime']:
+            return saved['sha1']
+    except (IOError, OSError, ValueError, KeyError, AttributeError):
+        pass # no valid saved hash
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    stamp['sha1'] = digest.hexdigest()
+    try:
+        tmp = '{0}.{1}.tmp'.format(hash_path, os.getpid())
+        with open(tmp, 'w') as f:
+            f.write(json.dumps(stamp))
+        if hasattr(os, 'replace'):
+            os.replace(tmp, hash_path)
+        else:
+            if os.path.exists(hash_path):
+                os.remove(hash_path) # rename does not replace on Windows
+            os.rename(tmp, hash_path)
+    except (IOError, OSError):
+        pass # read-only installation
+    return stamp['sha1']
+
+def initialize():
+    '''Initialize the vabamorf library.
+
+    It is done once per process, when the first dictionary is opened,
+    so that importing pyvabamorf stays cheap.
+    '''
+    global initialized
+    with PyVabamorf.lock:
+        if not initialized:
+            if not vm.FSCInit():
+                raise Exception('Could not initiate pyvabamorf library. FSCInit() returned false!')
+            atexit.register(vm.FSCTerminate)
+            initialized = True
+
+initialized = False
+
+
+class Engine(object):
+    '''The dictionary opened by a thread with the analyzer and synthesizer using it.
+
+    The analyzer and synthesizer are created on first use.
+    '''
+
+    __slots__ = ('dictionary', 'analyzer', 'synthesizer')
+
+    def __init__(self, dictionary):
+        self.dictionary = dictionary
+        self.analyzer = None
+        self.synthesizer = None
+
+
 class PyVabamorf(object):
     '''Class for performing main tasks of morphological analysis.
     
+    Every thread using a PyVabamorf instance gets its own analyzer and synthesizer,
+    so the instance can be shared between threads. They are created on first use and
+    share the dictionary opened by the thread. The analysis and synthesis
+    release the GIL while running, so threads analyze in parallel.
+    
     Attributes
     ----------
     pid: int
         Current process id.
     morf: PyVabamorf
         instance of the PyVabamorf class.
+    lock: threading.RLock
+        Lock guarding the creation of the shared instance and the engines.
+    analysis_cache: LRUCache
+        Cache of word analyses or None, if analysis caching is disabled.
+    disk_cache: DiskCache
+        Cache of word analyses shared with other processes or None, if it is disabled.
+    hot_words: HotWords
+        The precomputed analyses of frequent words or None, if there is no table for the dictionary,
+        it is disabled or not loaded yet.
+    synthesis_cache: LRUCache
+        Cache of synthesized words or None, if synthesis caching is disabled.
+    profile: Profile
+        Timings of the analysis stages or None, if profiling is disabled.
     '''
 
-    def __init__(self, lexPath=DICT_PATH):
+    lock = threading.RLock()
+
+    def __init__(self, lexPath=DICT_PATH, mmap=False, cache_blocks=CACHE_BLOCKS, analysis_cache_size=0, synthesis_cache_size=0,
+                 hot_words=True, disk_cache=None, disk_cache_size=DISK_CACHE_SIZE):
         '''Initialize PyVabamorf class.
         
         NB! Do not use this class directly. Instead use
         PyVabamorf.instance() to obtain access to one.
+        
+        Parameters
+        ----------
+        lexPath: str
+            The path of the directory containing the vabamorf dictionary (default: DICT_PATH).
+        mmap: boolean
+            If True, memory-map the dictionary file instead of reading it block by block.
+            The mapped pages are shared between all processes using the same dictionary,
+            including forked workers. Falls back to block reads on platforms without mmap (default: False).
+        cache_blocks: int
+            The number of least recently used dictionary blocks kept in memory
+            when the dictionary is not memory-mapped (default: CACHE_BLOCKS).
+        analysis_cache_size: int
+            The number of least recently used word analyses kept in memory.
+            Use 0 to disable the analysis cache (default: 0).
+        synthesis_cache_size: int
+            The number of least recently used synthesis results kept in memory.
+            Use 0 to disable the synthesis cache (default: 0).
+        hot_words: boolean
+            If True, analyze() and analyze_many() take the analyses of the words in the table of
+            precomputed analyses in the dictionary directory (see pyvabamorf.hotwords) from
+            the table instead of the analyzer. A table built from another dictionary is not used (default: True).
+        disk_cache: str
+            The path of an SQLite database file keeping the word analyses of analyze() and
+            analyze_many() between runs. It can be shared by concurrent processes. The cached
+            analyses are removed, when the dictionary or the version of pyvabamorf changes.
+            Use None to disable the disk cache (default: None).
+        disk_cache_size: int
+            The number of least recently used word analyses kept in the disk cache (default: DISK_CACHE_SIZE).
+            
+        When the instance is used from several threads, use mmap=True to let the
+        engines of all threads share the same dictionary pages.
+        
+        The dictionary is opened on first use, so errors loading it are raised then.
+        '''
+        self._lexPath = convert(lexPath)
+        self._mmap = bool(mmap)
+        self._cache_blocks = cache_blocks
+        self._local = threading.local()
+        self._engines = []
+        self.analysis_cache = LRUCache(analysis_cache_size) if analysis_cache_size > 0 else None
+        self.synthesis_cache = LRUCache(synthesis_cache_size) if synthesis_cache_size > 0 else None
+        self.disk_cache = None
+        if disk_cache is not None:
+            version = '{0} {1}'.format(VERSION, dictionary_hash(self._lexPath))
+            self.disk_cache = DiskCache(disk_cache, disk_cache_size, version)
+        self.hot_words = None
+        self._load_hot_words = bool(hot_words)
+        self.profile = None
+
+    def _engine(self):
+        '''Return the Engine of the calling thread.
+        
+        The dictionary is opened on first use in each thread.
+        '''
+        engine = getattr(self._local, 'engine', None)
+        if engine is None:
+            with PyVabamorf.lock:
+                initialize()
+                vm.FSCThreadInit() # no-op for already initialized threads
+                engine = Engine(vm.Dictionary(self._lexPath, self._mmap, self._cache_blocks))
+                # forget the engines of finished threads
+                self._engines = [(t, e) for t, e in self._engines if t.is_alive()]
+                self._engines.append((threading.current_thread(), engine))
+            self._local.engine = engine
+        return engine
+
+    def _analyzer(self):
+        '''Return the analyzer of the calling thread.'''
+        engine = self._engine()
+        if engine.analyzer is None:
+            engine.analyzer = vm.Analyzer(engine.dictionary)
+        return engine.analyzer
+
+    def _synthesizer(self):
+        '''Return the synthesizer of the calling thread.'''
+        engine = self._engine()
+        if engine.synthesizer is None:
+            engine.synthesizer = vm.Synthesizer(engine.dictionary)
+        return engine.synthesizer
+
+    def _hot_table(self, phonetic, compound):
+        '''Return the precomputed analyses of the hot words with the given markers.
+        
+        The table is loaded on first use.
+        
+        Returns
+        -------
+        dict
+            The analyses keyed by the converted words or None, if there is no table.
         '''
-        self._analyzer = vm.Analyzer(convert(lexPath))
-        self._synthesizer = vm.Synthesizer(convert(lexPath))
+        if self._load_hot_words:
+            # imported here, as the table is built using PyVabamorf
+            from pyvabamorf.hotwords import load
+            with PyVabamorf.lock:
+                if self._load_hot_words:
+                    self.hot_words = load(self._lexPath)
+                    self._load_hot_words = False
+        if self.hot_words is None:
+            return None
+        return self.hot_words.table(phonetic, compound)
 
     @staticmethod
     def instance():
@@ -253,8 +770,10 @@ class PyVabamorf(object):
         process has been forked.
         '''
         if not hasattr(PyVabamorf, 'pid') or PyVabamorf.pid != os.getpid():
-            PyVabamorf.pid = os.getpid()
-            PyVabamorf.morf = PyVabamorf()
+            with PyVabamorf.lock:
+                if not hasattr(PyVabamorf, 'pid') or PyVabamorf.pid != os.getpid():
+                    PyVabamorf.morf = PyVabamorf()
+                    PyVabamorf.pid = os.getpid()
         return PyVabamorf.morf
 
     def analyze(self, words, **kwargs):
@@ -274,6 +793,10 @@ class PyVabamorf(object):
             If True, add phonetic information to the root forms (default: True).
         compound: boolean
             if True, add compound word markers to root forms (default: True)
+        output: str
+            Either 'dict' to return dictionaries or 'compact' to return WordRecord and
+            AnalysisRecord instances, which compare equal to the dictionaries, but take
+            less memory (default: 'dict').
 
         Returns
         -------
@@ -281,23 +804,384 @@ class PyVabamorf(object):
             List of analysis for each word in input. One word usually contains more than one analysis as the
             analyser does not perform disambiguation.
         '''
-        guess, phonetic, compound = get_args(**kwargs)
+        guess, phonetic, compound, output = get_args(**kwargs)
+        if self.profile is not None:
+            return self._analyze_profiled([words], guess, phonetic, compound, output)[0]
+        words = convert_words(words)
         
-        # if input is a string, then tokenize it with whitespace
-        if isinstance(words, six.string_types):
-            words = words.split()
+        # perform morphological analysis
+        hot = self._hot_table(phonetic, compound)
+        if self.analysis_cache is not None or self.disk_cache is not None or hot is not None:
+            result = self._analyze_cached(words, guess, phonetic, compound, hot)
+            return records_from_dicts(result) if output == 'compact' else result
+        analyzer = self._analyzer()
+        morfresult = analyzer.analyze(vm.StringVector(words), guess, phonetic, compound)
+        if output == 'compact':
+            return sentence_as_records(morfresult)
+        return sentence_as_dicts(morfresult)
+
+    def analyze_many(self, sentences, **kwargs):
+        '''Perform morphological analysis on several sentences at once.
         
-        # convert words to native string
-        words = [convert(w) for w in words]
+        All sentences are passed to the analyzer in a single call, which is
+        considerably faster than calling analyze() for each short sentence.
         
-        # perform morphological analysis
-        morfresult = self._analyzer.analyze(vm.StringVector(words), guess)
-        result = []
-        for word, analysis in morfresult:
-            analysis = [analysis_as_dict(an, phonetic, compound) for an in analysis]
-            result.append({'text': deconvert(word),
-                           'analysis': analysis})
+        Parameters
+        ----------
+        sentences: list of (list of str or str)
+            The sentences, each either a list of pretokenized words or a string.
+        
+        Keyword parameters
+        ------------------
+        guess: boolean
+            If True, then use guessing, when analyzing unknown words (default: True)
+        phonetic: boolean
+            If True, add phonetic information to the root forms (default: True).
+        compound: boolean
+            if True, add compound word markers to root forms (default: True)
+        output: str
+            Either 'dict' to return dictionaries or 'compact' to return WordRecord and
+            AnalysisRecord instances, which compare equal to the dictionaries, but take
+            less memory (default: 'dict').
+
+        Returns
+        -------
+        list of (list of dict)
+            For each sentence the list of analysis for each word as returned by analyze().
+        '''
+        guess, phonetic, compound, output = get_args(**kwargs)
+        if self.profile is not None:
+            return self._analyze_profiled(sentences, guess, phonetic, compound, output)
+        sentences = [convert_words(words) for words in sentences]
+        hot = self._hot_table(phonetic, compound)
+        if self.analysis_cache is not None or self.disk_cache is not None or hot is not None:
+            result = [self._analyze_cached(words, guess, phonetic, compound, hot) for words in sentences]
+            if output == 'compact':
+                return [records_from_dicts(sentence) for sentence in result]
+            return result
+        analyzer = self._analyzer()
+        morfresult = analyzer.analyzeMany(vm.StringVectorVector(sentences), guess, phonetic, compound)
+        if output == 'compact':
+            return [sentence_as_records(sentence) for sentence in morfresult]
+        return [sentence_as_dicts(sentence) for sentence in morfresult]
+
+    def _analyze_profiled(self, sentences, guess, phonetic, compound, output):
+        '''Analyze sentences like analyze_many(), adding the time of each stage to the profile.'''
+        profile = self.profile
+        # the dictionary and the hot-word table are loaded on first use, which is not timed
+        analyzer = self._analyzer()
+        guessed = analyzer.guessedWords()
+        hot = self._hot_table(phonetic, compound)
+        start = timer()
+        sentences = [convert_words(words) for words in sentences]
+        converted = timer()
+        profile.add('convert', converted - start)
+        if self.analysis_cache is not None or self.disk_cache is not None or hot is not None:
+            result = [self._analyze_cached(words, guess, phonetic, compound, hot, profile) for words in sentences]
+            if output == 'compact':
+                looked_up = timer()
+                result = [records_from_dicts(sentence) for sentence in result]
+                profile.add('output', timer() - looked_up)
+        else:
+            vectors = vm.StringVectorVector(sentences)
+            built = timer()
+            morfresult = analyzer.analyzeMany(vectors, guess, phonetic, compound)
+            analyzed = timer()
+            morfresult = [[(word, [AnalysisValues(an) for an in analysis]) for word, analysis in sentence]
+                          for sentence in morfresult]
+            read = timer()
+            if output == 'compact':
+                result = [sentence_as_records(sentence) for sentence in morfresult]
+            else:
+                result = [sentence_as_dicts(sentence) for sentence in morfresult]
+            profile.add('vector', built - converted)
+            profile.add('native', analyzed - built)
+            profile.add('proxy', read - analyzed)
+            profile.add('output', timer() - read)
+        profile.count(sum(len(words) for words in sentences),
+                      sum(len(word['analysis']) for sentence in result for word in sentence),
+                      analyzer.guessedWords() - guessed)
         return result
+
+    def analyze_iter(self, iterable, batch_size=ITER_BATCH_SIZE, **kwargs):
+        '''Perform morphological analysis on a stream of text, tokens or sentences.
+        
+        The input is split into sentences with iter_sentences() and the sentences are
+        analyzed lazily in batches, so arbitrarily large inputs, such as text files,
+        are analyzed with bounded memory.
+        
+        Parameters
+        ----------
+        iterable: iterable of (str or list of str)
+            Text, for example an open text file, separate words, or pretokenized sentences.
+        batch_size: int
+            The number of sentences analyzed at once (default: ITER_BATCH_SIZE).
+        
+        Keyword parameters
+        ------------------
+        guess: boolean
+            If True, then use guessing, when analyzing unknown words (default: True)
+        phonetic: boolean
+            If True, add phonetic information to the root forms (default: True).
+        compound: boolean
+            if True, add compound word markers to root forms (default: True)
+        output: str
+            Either 'dict' to return dictionaries or 'compact' to return WordRecord and
+            AnalysisRecord instances, which compare equal to the dictionaries, but take
+            less memory (default: 'dict').
+
+        Returns
+        -------
+        generator of (list of dict)
+            For each sentence the list of analysis for each word as returned by analyze().
+        '''
+        get_args(**kwargs) # fail early on illegal arguments
+        return self._analyze_iter(iterable, batch_size, kwargs)
+
+    def _analyze_iter(self, iterable, batch_size, kwargs):
+        '''Generator doing the work of analyze_iter().'''
+        batch = []
+        for sentence in iter_sentences(iterable):
+            batch.append(sentence)
+            if len(batch) >= batch_size:
+                for result in self.analyze_many(batch, **kwargs):
+                    yield result
+                batch = []
+        if len(batch) > 0:
+            for result in self.analyze_many(batch, **kwargs):
+                yield result
+
+    def analyze_columnar(self, words, guess=True):
+        '''Perform morphological analysis on input and return the results in columns.
+        
+        The analyses of word i are at positions offsets[i] ... offsets[i+1]-1 of the
+        analysis columns. The part of speech, form, ending and clitic are given as ids
+        in the fixed vocabularies, see PARTOFSPEECH_VOCABULARY, FORM_VOCABULARY,
+        ENDING_VOCABULARY and CLITIC_VOCABULARY.
+        
+        Parameters
+        ----------
+        words: list of str or str
+            Either a list of pretokenized words or a string. In case of a string, it will be splitted using
+            default behaviour of string.split() function.
+        
+        Keyword parameters
+        ------------------
+        guess: boolean
+            If True, then use guessing, when analyzing unknown words (default: True)
+
+        Returns
+        -------
+        dict
+            The list of words ('words'), the integer arrays of analysis offsets ('offsets') and
+            counts ('counts') of each word, the integer arrays of vocabulary ids of all analyses
+            ('partofspeech', 'form', 'ending', 'clitic') and the list of their lemmas ('lemma').
+            The arrays are NumPy arrays, if NumPy is available, otherwise array.array instances.
+        '''
+        analyzer = self._analyzer()
+        columns = analyzer.analyzeColumnar(vm.StringVector(convert_words(words)), bool(guess))
+        return {'words': [deconvert(word) for word in columns.words],
+                'offsets': as_int_array(columns.offsets),
+                'counts': as_int_array(columns.counts),
+                'partofspeech': as_int_array(columns.partofspeech),
+                'form': as_int_array(columns.form),
+                'ending': as_int_array(columns.ending),
+                'clitic': as_int_array(columns.clitic),
+                'lemma': [interned_lemma(lemma) for lemma in columns.lemmas]}
+
+    def lemmatize(self, words, guess=True):
+        '''Find the lemmas of the words.
+        
+        Only the lemmas are built from the results of the analyzer, so this is
+        faster than taking them from the output of analyze(). The analysis cache is not used.
+        
+        Parameters
+        ----------
+        words: list of str or str
+            Either a list of pretokenized words or a string. In case of a string, it will be splitted using
+            default behaviour of string.split() function.
+        
+        Keyword parameters
+        ------------------
+        guess: boolean
+            If True, then use guessing, when analyzing unknown words (default: True)
+        
+        Returns
+        -------
+        list of (str, list of str)
+            For each word of the analyze() output its text and the distinct lemmas
+            of its analyses. Without the phonetic markers, the analyzer may order
+            the lemmas differently than analyze().
+        '''
+        analyzer = self._analyzer()
+        result = analyzer.lemmatize(vm.StringVector(convert_words(words)), bool(guess))
+        return [(deconvert(word), [deconvert(lemma) for lemma in lemmas]) for word, lemmas in result]
+
+    def analyze_text(self, text, guess=True, phonetic=True, compound=True):
+        '''Tokenize a text with tokenize() and perform morphological analysis on the tokens.
+        
+        Parameters
+        ----------
+        text: str
+            The text to analyze.
+        
+        Keyword parameters
+        ------------------
+        guess: boolean
+            If True, then use guessing, when analyzing unknown words (default: True)
+        phonetic: boolean
+            If True, add phonetic information to the root forms (default: True).
+        compound: boolean
+            if True, add compound word markers to root forms (default: True)
+        
+        Returns
+        -------
+        list of dict
+            The analysis of each word as returned by analyze() with the character offsets
+            of the word in the text added as 'start' and 'end'. A multiword name (New York)
+            spans from the start of its first to the end of its last token.
+        '''
+        analyzer = self._analyzer()
+        morfresult = analyzer.analyzeText(convert(text), bool(guess), bool(phonetic), bool(compound))
+        result = sentence_as_dicts(morfresult.words)
+        for word, start, end in zip(result, morfresult.starts, morfresult.ends):
+            word['start'] = start
+            word['end'] = end
+        return result
+
+    def analyze_json(self, document, guess=True, phonetic=True, compound=True):
+        '''Perform morphological analysis on a JSON document.
+        
+        The document is parsed, analyzed and serialized by the native library,
+        no Python objects are created for the words. It is an object with a list of
+        paragraphs, each with a list of sentences, each with a list of words
+        (see test/ana.json), the text of a word given in its "text" field.
+        Sentences and words may also be listed at the top level of the document.
+        The analysis cache is not used.
+        
+        Parameters
+        ----------
+        document: bytes or str
+            The UTF-8 encoded JSON document.
+        
+        Keyword parameters
+        ------------------
+        guess: boolean
+            If True, then use guessing, when analyzing unknown words (default: True)
+        phonetic: boolean
+            If True, add phonetic information to the root forms (default: True).
+        compound: boolean
+            if True, add compound word markers to root forms (default: True)
+        
+        Raises
+        ------
+        ValueError
+            If the document is not valid JSON or a word has no text.
+        
+        Returns
+        -------
+        bytes
+            The UTF-8 encoded JSON document with the analysis of each word added to its
+            "analysis" field as a list of objects with the fields of the dictionaries
+            returned by analyze(). Words merged into a multiword name (New York) keep
+            the other fields of the first word. Other fields of the document, paragraphs
+            and sentences are left out.
+        '''
+        if isinstance(document, six.text_type):
+            document = document.encode('utf-8')
+        analyzer = self._analyzer()
+        return analyzer.analyzeJson(document, bool(guess), bool(phonetic), bool(compound))
+
+    def _analyze_cached(self, words, guess, phonetic, compound, hot=None, profile=None):
+        '''Perform morphological analysis using the hot-word table `hot` and the analysis caches.
+        
+        The analyzer merges a word that starts a multiword name (New York) with
+        up to two following words, otherwise the analysis of a word does not
+        depend on its neighbours. So only the words that can not start a multiword
+        name are cached, and the words missing from the table and the caches are
+        analyzed together with the two words following them.
+        
+        With a `profile`, the analysis of the missing words is timed by stage and
+        the rest is added to the 'cached' stage.
+        '''
+        begin = timer()
+        missed = 0.0
+        cache = self.analysis_cache
+        disk_cache = self.disk_cache
+        flags = (guess, phonetic, compound)
+        suffix = '\t{0:d}{1:d}{2:d}'.format(*flags) # of the disk cache keys
+        stored = []
+        cached = []
+        for word in words:
+            analysis = hot.get(word) if hot is not None else None
+            if analysis is None and cache is not None:
+                analysis = cache.get((word,) + flags)
+            cached.append(analysis)
+        if disk_cache is not None:
+            keys = dict((idx, deconvert(words[idx]) + suffix) for idx, analysis in enumerate(cached) if analysis is None)
+            found = disk_cache.get_many(keys.values())
+            for idx, key in keys.items():
+                analysis = found.get(key)
+                if analysis is not None:
+                    cached[idx] = analysis
+                    if cache is not None:
+                        cache.put((words[idx],) + flags, copy_analysis(analysis))
+        
+        # positions to analyze: cache misses and two words after them
+        todo = []
+        last = -1
+        for idx, analysis in enumerate(cached):
+            if analysis is None:
+                last = idx + 2
+            if idx <= last:
+                todo.append(idx)
+        
+        analyzed = set(todo)
+        result = [None] * len(words)
+        for idx, analysis in enumerate(cached):
+            if idx not in analyzed:
+                result[idx] = {'text': deconvert(words[idx]),
+                               'analysis': copy_analysis(analysis)}
+        if len(todo) > 0:
+            analyzer = self._analyzer()
+            started = timer()
+            vector = vm.StringVector([words[idx] for idx in todo])
+            built = timer()
+            morfresult = analyzer.analyze(vector, guess, phonetic, compound)
+            analyzed = read = timer()
+            if profile is not None:
+                morfresult = [(word, [AnalysisValues(an) for an in analysis]) for word, analysis in morfresult]
+                read = timer()
+            pos = 0
+            for word, analysis in morfresult:
+                idx = todo[pos]
+                # find the number of input words merged into this one
+                n, text = 1, words[idx]
+                while text != word:
+                    text += ' ' + words[todo[pos + n]]
+                    n += 1
+                pos += n
+                analysis = [analysis_as_dict(an) for an in analysis]
+                result[idx] = {'text': deconvert(word),
+                               'analysis': analysis}
+                if n == 1 and cached[idx] is None and not analyzer.multiwordStart(word):
+                    if cache is not None:
+                        cache.put((word,) + flags, copy_analysis(analysis))
+                    if disk_cache is not None:
+                        stored.append((deconvert(word) + suffix, analysis))
+            if profile is not None:
+                finished = timer()
+                profile.add('vector', built - started)
+                profile.add('native', analyzed - built)
+                profile.add('proxy', read - analyzed)
+                profile.add('output', finished - read)
+                missed = finished - started
+            if len(stored) > 0:
+                disk_cache.put_many(stored)
+        if profile is not None:
+            profile.add('cached', timer() - begin - missed)
+        # words merged into the previous ones have no result
+        return [r for r in result if r is not None]
         
     def synthesize(self, lemma, partofspeech='', form='', hint='', guess=True, phonetic=True):
         '''Given lemma, pos tag and a form, synthesize the word.
@@ -325,13 +1209,144 @@ class PyVabamorf(object):
         list of str
             The list of synthesized words.
         '''
-        words = self._synthesizer.synthesize(convert(lemma),
-                                             convert(partofspeech),
-                                             convert(form),
-                                             convert(hint),
-                                             guess,
-                                             phonetic)
-        return [deconvert(word) for word in words]
+        args = (convert(lemma), convert(partofspeech), convert(form), convert(hint), bool(guess), bool(phonetic))
+        if self.synthesis_cache is not None:
+            words = self.synthesis_cache.get(args)
+            if words is not None:
+                return list(words)
+        synthesizer = self._synthesizer()
+        words = [deconvert(word) for word in synthesizer.synthesize(*args)]
+        if self.synthesis_cache is not None:
+            self.synthesis_cache.put(args, tuple(words))
+        return words
+
+    def synthesize_many(self, requests, guess=True, phonetic=True):
+        '''Synthesize the words for several requests at once.
+        
+        All requests are passed to the synthesizer in a single call, which is
+        considerably faster than calling synthesize() for each request.
+        
+        Parameters
+        ----------
+        requests: list of (str, tuple of str or dict)
+            The synthesis requests. Each request is either a lemma, a (lemma, partofspeech, form, hint) tuple,
+            where the trailing elements can be omitted, or a dictionary with keys lemma, partofspeech,
+            form and hint, where all but lemma are optional.
+            
+        Keyword parameters
+        ------------------
+        guess: bool
+            If True, use guessing for unknown words (default: True)
+        phonetic: bool
+            If True, add phonetic markers to synthesized words (default: True).
+            
+        Returns
+        -------
+        list of (list of str)
+            The list of synthesized words for each request.
+        '''
+        requests = [synthesis_request(request) for request in requests]
+        flags = (bool(guess), bool(phonetic))
+        cache = self.synthesis_cache
+        
+        # requests not found in the cache
+        result = [None] * len(requests)
+        todo = []
+        for idx, request in enumerate(requests):
+            words = cache.get(request + flags) if cache is not None else None
+            if words is None:
+                todo.append(idx)
+            else:
+                result[idx] = list(words)
+        
+        if len(todo) > 0:
+            synthesizer = self._synthesizer()
+            morfresult = synthesizer.synthesizeMany(vm.StringVectorVector([requests[idx] for idx in todo]), *flags)
+            for idx, words in zip(todo, morfresult):
+                result[idx] = [deconvert(word) for word in words]
+                if cache is not None:
+                    cache.put(requests[idx] + flags, tuple(result[idx]))
+        return result
+
+    def enable_profiling(self):
+        '''Start recording the time spent in each stage of analyze() and analyze_many().
+        
+        The timings are reset. Profiling adds some overhead, so it is disabled by default.
+        '''
+        self.profile = Profile()
+
+    def disable_profiling(self):
+        '''Stop recording the timings.'''
+        self.profile = None
+
+    def get_stats(self):
+        '''Return the timings recorded since profiling was enabled.
+        
+        The stages are described in pyvabamorf.profiling.STAGES.
+        
+        Returns
+        -------
+        dict
+            For each stage the number of calls and the total seconds, the total seconds of all
+            stages and the numbers of analyzed words, returned analyses and guessed words.
+            None, if profiling is disabled.
+        '''
+        if self.profile is None:
+            return None
+        return self.profile.stats()
+
+    def cache_stats(self):
+        '''Return the dictionary block cache usage counters.
+        
+        Counters are summed over the dictionaries of all threads.
+        With a memory-mapped dictionary every block read counts as a hit.
+        
+        Returns
+        -------
+        dict
+            Number of block hits, misses, evictions and the number of blocks kept in memory.
+        '''
+        with PyVabamorf.lock:
+            engines = [e for t, e in self._engines]
+        stats = [engine.dictionary.cacheStats() for engine in engines]
+        return {'hits': sum(s.hits for s in stats),
+                'misses': sum(s.misses for s in stats),
+                'evictions': sum(s.evictions for s in stats),
+                'blocks': sum(s.blocks for s in stats)}
+
+    def clear_cache_stats(self):
+        '''Reset the dictionary block cache usage counters.'''
+        with PyVabamorf.lock:
+            engines = [e for t, e in self._engines]
+        for engine in engines:
+            engine.dictionary.clearCacheStats()
+
+    def engine_counters(self):
+        '''Return the numbers of calls of the vabamorf engine functions.
+        
+        Counters are summed over the dictionaries of all threads. They count the dictionary
+        block reads (CacheRead), the guesser functions (arva*), the compound word checks (kchk*)
+        and adding proper name analyses (LisaPNimeAnalyysid), which is done only for disambiguation.
+        
+        Returns
+        -------
+        dict
+            The number of calls by function name.
+        '''
+        with PyVabamorf.lock:
+            engines = [e for t, e in self._engines]
+        counters = {}
+        for engine in engines:
+            for name, count in engine.dictionary.counters().items():
+                counters[name] = counters.get(name, 0) + count
+        return counters
+
+    def clear_engine_counters(self):
+        '''Reset the vabamorf engine function call counters.'''
+        with PyVabamorf.lock:
+            engines = [e for t, e in self._engines]
+        for engine in engines:
+            engine.dictionary.clearCounters()
 
 
 def analyze(words, **kwargs):
@@ -351,6 +1366,10 @@ def analyze(words, **kwargs):
         If True, add phonetic information to the root forms (default: True).
     compound: boolean
         if True, add compound word markers to root forms (default: True)
+    output: str
+        Either 'dict' to return dictionaries or 'compact' to return WordRecord and
+        AnalysisRecord instances, which compare equal to the dictionaries, but take
+        less memory (default: 'dict').
 
     Returns
     -------
@@ -361,6 +1380,65 @@ def analyze(words, **kwargs):
     return PyVabamorf.instance().analyze(words, **kwargs)
 
 
+def analyze_many(sentences, **kwargs):
+    '''Perform morphological analysis on several sentences at once.
+    
+    Parameters
+    ----------
+    sentences: list of (list of str or str)
+        The sentences, each either a list of pretokenized words or a string.
+    
+    Keyword parameters
+    ------------------
+    guess: boolean
+        If True, then use guessing, when analyzing unknown words (default: True)
+    phonetic: boolean
+        If True, add phonetic information to the root forms (default: True).
+    compound: boolean
+        if True, add compound word markers to root forms (default: True)
+    output: str
+        Either 'dict' to return dictionaries or 'compact' to return WordRecord and
+        AnalysisRecord instances, which compare equal to the dictionaries, but take
+        less memory (default: 'dict').
+
+    Returns
+    -------
+    list of (list of dict)
+        For each sentence the list of analysis for each word as returned by analyze().
+    '''
+    return PyVabamorf.instance().analyze_many(sentences, **kwargs)
+
+
+def analyze_iter(iterable, **kwargs):
+    '''Perform morphological analysis on a stream of text, tokens or sentences.
+    
+    Parameters
+    ----------
+    iterable: iterable of (str or list of str)
+        Text, for example an open text file, separate words, or pretokenized sentences.
+    
+    Keyword parameters
+    ------------------
+    batch_size: int
+        The number of sentences analyzed at once (default: ITER_BATCH_SIZE).
+    guess: boolean
+        If True, then use guessing, when analyzing unknown words (default: True)
+    phonetic: boolean
+        If True, add phonetic information to the root forms (default: True).
+    compound: boolean
+        if True, add compound word markers to root forms (default: True)
+    output: str
+        Either 'dict' to return dictionaries or 'compact' to return WordRecord and
+        AnalysisRecord instances (default: 'dict').
+
+    Returns
+    -------
+    generator of (list of dict)
+        For each sentence the list of analysis for each word as returned by analyze().
+    '''
+    return PyVabamorf.instance().analyze_iter(iterable, **kwargs)
+
+
 def synthesize(lemma, **kwargs):
     '''Given lemma, pos tag and a form, synthesize the word.
 
@@ -388,3 +1466,124 @@ def synthesize(lemma, **kwargs):
         The list of synthesized words.
     '''
     return PyVabamorf.instance().synthesize(lemma, **kwargs)
+
+
+def synthesize_many(requests, **kwargs):
+    '''Synthesize the words for several requests at once.
+
+    Parameters
+    ----------
+    requests: list of (str, tuple of str or dict)
+        The synthesis requests. Each request is either a lemma, a (lemma, partofspeech, form, hint) tuple,
+        where the trailing elements can be omitted, or a dictionary with keys lemma, partofspeech,
+        form and hint, where all but lemma are optional.
+        
+    Keyword parameters
+    ------------------
+    guess: bool
+        If True, use guessing for unknown words (default: True)
+    phonetic: bool
+        If True, add phonetic markers to synthesized words (default: True).
+        
+    Returns
+    -------
+    list of (list of str)
+        The list of synthesized words for each request.
+    '''
+    return PyVabamorf.instance().synthesize_many(requests, **kwargs)
+
+
+def analyze_columnar(words, **kwargs):
+    '''Perform morphological analysis on input and return the results in columns.
+
+    Parameters
+    ----------
+    words: list of str or str
+        Either a list of pretokenized words or a string. In case of a string, it will be splitted using
+        default behaviour of string.split() function.
+    
+    Keyword parameters
+    ------------------
+    guess: boolean
+        If True, then use guessing, when analyzing unknown words (default: True)
+
+    Returns
+    -------
+    dict
+        The words, analysis offsets and counts, vocabulary ids and lemmas as
+        returned by PyVabamorf.analyze_columnar().
+    '''
+    return PyVabamorf.instance().analyze_columnar(words, **kwargs)
+
+
+def lemmatize(words, **kwargs):
+    '''Find the lemmas of the words.
+
+    Parameters
+    ----------
+    words: list of str or str
+        Either a list of pretokenized words or a string. In case of a string, it will be splitted using
+        default behaviour of string.split() function.
+    
+    Keyword parameters
+    ------------------
+    guess: boolean
+        If True, then use guessing, when analyzing unknown words (default: True)
+
+    Returns
+    -------
+    list of (str, list of str)
+        Each word with the distinct lemmas of its analyses as returned by PyVabamorf.lemmatize().
+    '''
+    return PyVabamorf.instance().lemmatize(words, **kwargs)
+
+
+def analyze_text(text, **kwargs):
+    '''Tokenize a text and perform morphological analysis on the tokens.
+
+    Parameters
+    ----------
+    text: str
+        The text to analyze.
+    
+    Keyword parameters
+    ------------------
+    guess: boolean
+        If True, then use guessing, when analyzing unknown words (default: True)
+    phonetic: boolean
+        If True, add phonetic information to the root forms (default: True).
+    compound: boolean
+        if True, add compound word markers to root forms (default: True)
+
+    Returns
+    -------
+    list of dict
+        The analysis of each word with its character offsets in the text as
+        returned by PyVabamorf.analyze_text().
+    '''
+    return PyVabamorf.instance().analyze_text(text, **kwargs)
+
+
+def analyze_json(document, **kwargs):
+    '''Perform morphological analysis on a JSON document.
+
+    Parameters
+    ----------
+    document: bytes or str
+        The UTF-8 encoded JSON document of paragraphs, sentences and words.
+    
+    Keyword parameters
+    ------------------
+    guess: boolean
+        If True, then use guessing, when analyzing unknown words (default: True)
+    phonetic: boolean
+        If True, add phonetic information to the root forms (default: True).
+    compound: boolean
+        if True, add compound word markers to root forms (default: True)
+
+    Returns
+    -------
+    bytes
+        The document with the analysis of each word as returned by PyVabamorf.analyze_json().
+    '''
+    return PyVabamorf.instance().analyze_json(document, **kwargs)
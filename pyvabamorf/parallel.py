@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+'''
+Morphological analysis of large corpora in a pool of processes.
+
+The dictionary is memory-mapped by the parent process before the worker
+processes are forked, so the workers share its pages and the analyzer
+of the parent, instead of loading the dictionary again as
+PyVabamorf.instance() does after a fork. On platforms starting the
+workers without fork, each worker loads the dictionary once.
+
+Attributes
+----------
+
+CHUNKSIZE: int
+    The default number of sentences sent to a worker at once.
+'''
+from __future__ import unicode_literals, print_function
+
+from pyvabamorf.morf import PyVabamorf, get_args, convert_words
+from multiprocessing import Pool
+import time
+
+CHUNKSIZE = 200
+
+# the instance used by the workers, created in the parent before forking
+morf = None
+
+
+class CorpusAnalysis(list):
+    '''List of analysis results of a corpus with the throughput of the analysis.
+
+    Attributes
+    ----------
+    sentences: int
+        The number of analyzed sentences.
+    words: int
+        The number of analyzed words.
+    seconds: float
+        The wall clock time of the analysis.
+    '''
+
+    def __init__(self, results, words, seconds):
+        super(CorpusAnalysis, self).__init__(results)
+        self.sentences = len(results)
+        self.words = words
+        self.seconds = seconds
+
+    @property
+    def sentences_per_second(self):
+        return self.sentences / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def words_per_second(self):
+        return self.words / self.seconds if self.seconds > 0 else 0.0
+
+
+def shared_instance():
+    '''Return the PyVabamorf instance shared with the worker processes.'''
+    global morf
+    if morf is None:
+        morf = PyVabamorf(mmap=True)
+        morf._analyzer() # open the dictionary now, the engines are created lazily
+    return morf
+
+
+def analyze_chunk(args):
+    '''Analyze a chunk of sentences in a worker process.
+
+    Returns
+    -------
+    (list of (list of dict), int)
+        The analysis of each sentence and the number of words.
+    '''
+    sentences, kwargs = args
+    sentences = [convert_words(sentence) for sentence in sentences]
+    words = sum(len(sentence) for sentence in sentences)
+    return shared_instance().analyze_many(sentences, **kwargs), words
+
+
+def chunks(sentences, chunksize):
+    '''Split an iterable of sentences into lists of at most `chunksize` sentences.'''
+    chunk = []
+    for sentence in sentences:
+        chunk.append(sentence)
+        if len(chunk) >= chunksize:
+            yield chunk
+            chunk = []
+    if len(chunk) > 0:
+        yield chunk
+
+
+def analyze_corpus(sentences, processes=None, chunksize=CHUNKSIZE, **kwargs):
+    '''Perform morphological analysis on a corpus using several processes.
+
+    Parameters
+    ----------
+    sentences: iterable of (list of str or str)
+        The sentences, each either a list of pretokenized words or a string.
+    processes: int
+        The number of worker processes. If None, use the number of CPUs.
+        With 1, the corpus is analyzed in the calling process (default: None).
+    chunksize: int
+        The number of sentences sent to a worker at once. Larger chunks lower the
+        communication overhead, smaller ones balance the load better (default: CHUNKSIZE).
+
+    Keyword parameters
+    ------------------
+    guess: boolean
+        If True, then use guessing, when analyzing unknown words (default: True)
+    phonetic: boolean
+        If True, add phonetic information to the root forms (default: True).
+    compound: boolean
+        if True, add compound word markers to root forms (default: True)
+    output: str
+        Either 'dict' to return dictionaries or 'compact' to return WordRecord and
+        AnalysisRecord instances (default: 'dict').
+
+    Returns
+    -------
+    CorpusAnalysis
+        For each sentence the list of analysis for each word as returned by analyze(), in input order,
+        with the number of sentences and words analyzed and the time it took.
+    '''
+    get_args(**kwargs) # fail early on illegal arguments
+    if chunksize < 1:
+        raise ValueError('chunksize must be positive: {0}'.format(chunksize))
+    start = time.time()
+    tasks = ((chunk, kwargs) for chunk in chunks(sentences, chunksize))
+    results = []
+    words = 0
+    if processes == 1:
+        for result, count in map(analyze_chunk, tasks):
+            results.extend(result)
+            words += count
+    else:
+        shared_instance() # load the dictionary before forking
+        pool = Pool(processes)
+        try:
+            for result, count in pool.imap(analyze_chunk, tasks):
+                results.extend(result)
+                words += count
+        except BaseException:
+            pool.terminate()
+            raise
+        pool.close()
+        pool.join()
+    return CorpusAnalysis(results, words, time.time() - start)
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+'''
+Timing of the stages of the analysis pipeline.
+
+Attributes
+----------
+
+STAGES: tuple of str
+    The stages of the analysis, in the order they are run:
+    converting the input words, building the vectors passed to the analyzer,
+    the native analysis, reading the results through the SWIG proxies and
+    building the output dictionaries or records.
+    With the analysis caches or the hot-word table enabled, looking up the words is timed as
+    the cached analysis and only the words missing from them go through the other stages.
+'''
+from __future__ import unicode_literals, print_function
+
+from collections import OrderedDict
+from timeit import default_timer as timer
+import threading
+
+STAGES = ('convert', 'vector', 'native', 'proxy', 'output', 'cached')
+
+
+class Profile(object):
+    '''Thread-safe cumulative time and call counts of the analysis stages.
+
+    Attributes
+    ----------
+    tokens: int
+        Number of analyzed words.
+    analyses: int
+        Number of analyses returned.
+    guessed: int
+        Number of words analyzed by the guesser.
+    '''
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        '''Reset the timings and counters.'''
+        with self._lock:
+            self._stages = OrderedDict((stage, [0, 0.0]) for stage in STAGES)
+            self.tokens = 0
+            self.analyses = 0
+            self.guessed = 0
+
+    def add(self, stage, seconds):
+        '''Add a run of `stage` taking `seconds`.'''
+        with self._lock:
+            times = self._stages[stage]
+            times[0] += 1
+            times[1] += seconds
+
+    def count(self, tokens, analyses, guessed):
+        '''Add the numbers of analyzed words, returned analyses and guessed words.'''
+        with self._lock:
+            self.tokens += tokens
+            self.analyses += analyses
+            self.guessed += guessed
+
+    def stats(self):
+        '''Return the timings and counters.
+
+        Returns
+        -------
+        dict
+            For each stage the number of calls and the total seconds, the total seconds of all
+            stages and the numbers of analyzed words, returned analyses and guessed words.
+        '''
+        with self._lock:
+            stages = OrderedDict((stage, {'calls': calls, 'seconds': seconds})
+                                 for stage, (calls, seconds) in self._stages.items())
+            return {'stages': stages,
+                    'seconds': sum(seconds for calls, seconds in self._stages.values()),
+                    'tokens': self.tokens,
+                    'analyses': self.analyses,
+                    'guessed': self.guessed}
+
+
+class AnalysisValues(object):
+    '''The fields of a native analysis read from its SWIG proxy.'''
+
+    __slots__ = ('root', 'ending', 'clitic', 'partofspeech', 'form', 'lemma', 'rootTokens')
+
+    def __init__(self, an):
+        self.root = an.root
+        self.ending = an.ending
+        self.clitic = an.clitic
+        self.partofspeech = an.partofspeech
+        self.form = an.form
+        self.lemma = an.lemma
+        self.rootTokens = an.rootTokens
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from pyvabamorf import PyVabamorf, analyze, synthesize
+from pyvabamorf.tests.test_multi import MultithreadingTest
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import unittest
+
+try:
+    import asyncio
+    from pyvabamorf import aio
+except (ImportError, SyntaxError):
+    aio = None # requires Python 3.5+
+
+
+@unittest.skipIf(aio is None, 'asyncio is not available')
+class BatcherTest(unittest.TestCase):
+
+    def run_all(self, make_coroutines):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            return loop.run_until_complete(asyncio.gather(*make_coroutines()))
+        finally:
+            loop.run_until_complete(aio.batchers[loop].close())
+            asyncio.set_event_loop(None)
+            loop.close()
+
+    def run_batcher(self, batcher, make_coroutines, return_exceptions=False):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            return loop.run_until_complete(asyncio.gather(*make_coroutines(), return_exceptions=return_exceptions))
+        finally:
+            loop.run_until_complete(batcher.close())
+            asyncio.set_event_loop(None)
+            loop.close()
+
+    def test_analyze(self):
+        texts = MultithreadingTest().indata()
+        batcher = aio.Batcher(window=0.01)
+        results = self.run_batcher(batcher, lambda: [batcher.analyze(text) for text in texts])
+        self.assertListEqual(results, [analyze(text) for text in texts])
+        self.assertEqual(batcher.requests, len(texts))
+        self.assertLess(batcher.batches, len(texts))
+
+    def test_arguments(self):
+        batcher = aio.Batcher()
+        results = self.run_batcher(batcher, lambda: [batcher.analyze('tere', guess=False),
+                                                     batcher.analyze('tere', phonetic=False, output='compact'),
+                                                     batcher.analyze('tere')])
+        self.assertEqual(results, [analyze('tere', guess=False),
+                                   analyze('tere', phonetic=False),
+                                   analyze('tere')])
+
+    def test_synthesize(self):
+        batcher = aio.Batcher()
+        results = self.run_batcher(batcher, lambda: [batcher.synthesize('pood', form='sg p'),
+                                                     batcher.synthesize('palk', form='sg kos', guess=False),
+                                                     batcher.synthesize('mees', form='pl n', phonetic=False)])
+        self.assertEqual(results, [synthesize('pood', form='sg p'),
+                                   synthesize('palk', form='sg kos', guess=False),
+                                   synthesize('mees', form='pl n', phonetic=False)])
+
+    def test_backpressure(self):
+        texts = MultithreadingTest().indata()
+        batcher = aio.Batcher(window=0, max_batch=3, max_queue=2)
+        results = self.run_batcher(batcher, lambda: [batcher.analyze(text) for text in texts])
+        self.assertListEqual(results, [analyze(text) for text in texts])
+        self.assertGreaterEqual(batcher.batches, len(texts) // 3)
+
+    def test_errors(self):
+        batcher = aio.Batcher()
+        self.assertRaises(Exception, self.run_batcher, batcher, lambda: [batcher.analyze('tere', foo=True)])
+
+    def test_error_in_batch(self):
+        batcher = aio.Batcher(window=0.01)
+        results = self.run_batcher(batcher, lambda: [batcher.analyze('tere'),
+                                                     batcher.analyze(['tere', 5]),
+                                                     batcher.analyze('maja'),
+                                                     batcher.synthesize(5, form='sg p'),
+                                                     batcher.synthesize('pood', form='sg p')], return_exceptions=True)
+        self.assertEqual(results[0], analyze('tere'))
+        self.assertIsInstance(results[1], Exception)
+        self.assertEqual(results[2], analyze('maja'))
+        self.assertIsInstance(results[3], Exception)
+        self.assertEqual(results[4], synthesize('pood', form='sg p'))
+
+    def test_native_error_in_batch(self):
+        batcher = aio.Batcher(FailingVabamorf(), window=0.01)
+        results = self.run_batcher(batcher, lambda: [batcher.analyze('tere'),
+                                                     batcher.analyze('xyzzyq'),
+                                                     batcher.analyze('maja')], return_exceptions=True)
+        self.assertEqual(results[0], analyze('tere'))
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(results[2], analyze('maja'))
+        self.assertEqual(batcher.requests, 3)
+
+    def test_concurrent_batches(self):
+        # each batch waits for the other one, so they must run at the same time
+        executor = ThreadPoolExecutor(2)
+        batcher = aio.Batcher(WaitingVabamorf(threading.Barrier(2, timeout=10)),
+                              window=0, max_batch=1, executor=executor)
+        try:
+            results = self.run_batcher(batcher, lambda: [batcher.analyze('tere'), batcher.analyze('maja')])
+        finally:
+            executor.shutdown()
+        self.assertEqual(results, [analyze('tere'), analyze('maja')])
+        self.assertEqual(batcher.max_running, 2)
+        self.assertEqual(batcher.batches, 2)
+
+    def test_default_batcher(self):
+        results = self.run_all(lambda: [aio.analyze('tere'), aio.synthesize('pood', form='sg p')])
+        self.assertEqual(results, [analyze('tere'), synthesize('pood', form='sg p')])
+
+
+class FailingVabamorf(PyVabamorf):
+    '''Fails to analyze the word xyzzyq.'''
+
+    def analyze_many(self, sentences, **kwargs):
+        if any('xyzzyq' in words for words in sentences):
+            raise ValueError('xyzzyq')
+        return super(FailingVabamorf, self).analyze_many(sentences, **kwargs)
+
+
+class WaitingVabamorf(PyVabamorf):
+    '''Waits at the barrier before analyzing.'''
+
+    def __init__(self, barrier):
+        super(WaitingVabamorf, self).__init__()
+        self.barrier = barrier
+
+    def analyze_many(self, sentences, **kwargs):
+        self.barrier.wait()
+        return super(WaitingVabamorf, self).analyze_many(sentences, **kwargs)
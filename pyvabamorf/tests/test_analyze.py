@@ -3,11 +3,25 @@ from __future__ import unicode_literals, print_function
 
 import unittest
 import operator
-from pyvabamorf import analyze
+import pickle
+import io
+import types
+import subprocess
+import sys
+import json
+from pyvabamorf import analyze, analyze_many, analyze_iter, analyze_columnar, analyze_text, analyze_json, lemmatize, tokenize, synthesize, PyVabamorf, WordRecord, AnalysisRecord
 from pyvabamorf.morf import trim_phonetics, get_group_tokens, analysis_as_dict, convert, deconvert
+from pyvabamorf.morf import PARTOFSPEECH_VOCABULARY, FORM_VOCABULARY, ENDING_VOCABULARY, CLITIC_VOCABULARY
+from pyvabamorf.morf import iter_sentences
+from pyvabamorf.cache import DiskCache
 from pyvabamorf.vabamorf import Analysis
+from multiprocessing import Pool
 from pprint import pprint
 from functools import reduce
+import tempfile
+import shutil
+import os
+import time
 
 class TrimPhoneticsTest(unittest.TestCase):
     
@@ -242,6 +256,466 @@ class TextIsSameAsListTest(unittest.TestCase):
                 on sinu jaoks loodud'''
 
 
+class MmapTest(unittest.TestCase):
+
+    def test_same_as_default(self):
+        morf = PyVabamorf(mmap=True)
+        text = TextIsSameAsListTest().text()
+        self.assertListEqual(morf.analyze(text), analyze(text))
+
+
+class BlockCacheTest(unittest.TestCase):
+
+    def test_same_as_default(self):
+        text = TextIsSameAsListTest().text()
+        for blocks in [1, 3, 200]:
+            morf = PyVabamorf(cache_blocks=blocks)
+            self.assertListEqual(morf.analyze(text), analyze(text))
+
+    def test_stats(self):
+        morf = PyVabamorf(cache_blocks=4)
+        morf.analyze(TextIsSameAsListTest().text())
+        stats = morf.cache_stats()
+        self.assertEqual(stats['blocks'], 4)
+        self.assertGreater(stats['hits'], 0)
+        self.assertGreater(stats['misses'], 0)
+        self.assertEqual(stats['evictions'], stats['misses'] - 4)
+        morf.clear_cache_stats()
+        self.assertDictEqual(morf.cache_stats(), {'hits': 0, 'misses': 0, 'evictions': 0, 'blocks': 4})
+
+
+class LazyEngineTest(unittest.TestCase):
+
+    def test_import_does_not_initialize(self):
+        code = 'import pyvabamorf, pyvabamorf.morf; assert not pyvabamorf.morf.initialized'
+        self.assertEqual(subprocess.call([sys.executable, '-c', code]), 0)
+
+    def test_opened_on_first_use(self):
+        morf = PyVabamorf(cache_blocks=4)
+        self.assertDictEqual(morf.cache_stats(), {'hits': 0, 'misses': 0, 'evictions': 0, 'blocks': 0})
+        morf.analyze('tere')
+        self.assertEqual(morf.cache_stats()['blocks'], 4)
+
+    def test_shared_dictionary(self):
+        morf = PyVabamorf(cache_blocks=4)
+        text = TextIsSameAsListTest().text()
+        for i in range(2):
+            self.assertListEqual(morf.synthesize('pood', form='sg p'), synthesize('pood', form='sg p'))
+            self.assertListEqual(morf.analyze(text, guess=False), analyze(text, guess=False))
+            self.assertListEqual(morf.synthesize('palk', form='sg kom', guess=False), synthesize('palk', form='sg kom', guess=False))
+            self.assertListEqual(morf.analyze(text), analyze(text))
+        self.assertEqual(morf.cache_stats()['blocks'], 4)
+
+
+class EngineCountersTest(unittest.TestCase):
+
+    def test_counters(self):
+        morf = PyVabamorf()
+        self.assertDictEqual(morf.engine_counters(), {})
+        morf.analyze('tere')
+        counters = morf.engine_counters()
+        self.assertIn('LisaPNimeAnalyysid', counters)
+        self.assertGreater(counters['CacheRead'], 0)
+        self.assertEqual(sum(counters[name] for name in counters if name.startswith('arva')), 0)
+        morf.analyze('xyzzyqwe laupäevaõhtuti')
+        counters = morf.engine_counters()
+        self.assertGreater(counters['arvamin'], 0)
+        self.assertGreater(sum(counters[name] for name in counters if name.startswith('kchk')), 0)
+        morf.analyze('xyzzyqwe', guess=False)
+        self.assertEqual(morf.engine_counters()['arvamin'], counters['arvamin'])
+
+    def test_clear(self):
+        morf = PyVabamorf(cache_blocks=4)
+        morf.analyze('xyzzyqwe laupäevaõhtuti')
+        cache_stats = morf.cache_stats()
+        morf.clear_engine_counters()
+        self.assertEqual(set(morf.engine_counters().values()), set([0]))
+        self.assertDictEqual(morf.cache_stats(), cache_stats)
+
+
+class AnalysisCacheTest(unittest.TestCase):
+
+    def test_same_as_default(self):
+        text = TextIsSameAsListTest().text()
+        for size in [1, 10, 1000]:
+            morf = PyVabamorf(analysis_cache_size=size)
+            for guess, phonetic, compound in [(True, True, True), (False, False, False)]:
+                expected = analyze(text, guess=guess, phonetic=phonetic, compound=compound)
+                for i in range(2):
+                    self.assertListEqual(morf.analyze(text, guess=guess, phonetic=phonetic, compound=compound), expected)
+
+    def test_multiword(self):
+        morf = PyVabamorf(analysis_cache_size=100)
+        sentences = ['New on uus', 'York ja New York', 'New York New York', 'Ma elan New', 'Ma elan New York linnas']
+        for sentence in sentences + sentences:
+            self.assertListEqual(morf.analyze(sentence), analyze(sentence))
+
+    def test_result_not_shared(self):
+        morf = PyVabamorf(analysis_cache_size=100)
+        morf.analyze('tere')[0]['analysis'][0]['root_tokens'].append('x')
+        self.assertListEqual(morf.analyze('tere'), analyze('tere'))
+
+    def test_stats(self):
+        morf = PyVabamorf(analysis_cache_size=2)
+        morf.analyze('tere tere')
+        self.assertDictEqual(morf.analysis_cache.stats(), {'hits': 0, 'misses': 2, 'evictions': 0, 'size': 1, 'maxsize': 2})
+        morf.analyze('tere kass koer')
+        self.assertDictEqual(morf.analysis_cache.stats(), {'hits': 1, 'misses': 4, 'evictions': 1, 'size': 2, 'maxsize': 2})
+        morf.analysis_cache.clear()
+        self.assertDictEqual(morf.analysis_cache.stats(), {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'maxsize': 2})
+
+    def test_disabled(self):
+        self.assertIsNone(PyVabamorf().analysis_cache)
+
+
+def analyze_with_disk_cache(args):
+    path, text = args
+    return PyVabamorf(hot_words=False, disk_cache=path).analyze(text)
+
+
+class DiskCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tempdir, 'cache.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_same_as_default(self):
+        text = TextIsSameAsListTest().text()
+        for guess, phonetic, compound in [(True, True, True), (False, False, False)]:
+            expected = analyze(text, guess=guess, phonetic=phonetic, compound=compound)
+            for i in range(2):
+                morf = PyVabamorf(hot_words=False, disk_cache=self.path)
+                self.assertListEqual(morf.analyze(text, guess=guess, phonetic=phonetic, compound=compound), expected)
+        self.assertGreater(morf.disk_cache.stats()['hits'], 0)
+
+    def test_multiword(self):
+        morf = PyVabamorf(disk_cache=self.path, analysis_cache_size=100)
+        sentences = ['New on uus', 'York ja New York', 'New York New York', 'Ma elan New', 'Ma elan New York linnas']
+        for sentence in sentences + sentences:
+            self.assertListEqual(morf.analyze(sentence), analyze(sentence))
+        self.assertListEqual(PyVabamorf(disk_cache=self.path).analyze_many(sentences), analyze_many(sentences))
+
+    def test_version(self):
+        cache = DiskCache(self.path, 10, 'a')
+        cache.put('x', [1])
+        self.assertEqual(DiskCache(self.path, 10, 'a').get('x'), [1])
+        self.assertIsNone(DiskCache(self.path, 10, 'b').get('x'))
+        self.assertEqual(len(cache), 0)
+
+    def test_eviction(self):
+        cache = DiskCache(self.path, 10, 'a')
+        cache.put_many([(str(i), i) for i in range(10)])
+        self.assertEqual(cache.get('0'), 0)
+        cache.put('10', 10)
+        self.assertDictEqual(cache.stats(), {'hits': 1, 'misses': 0, 'evictions': 2, 'size': 9, 'maxsize': 10})
+        self.assertDictEqual(cache.get_many(['0', '1', '2', '10']), {'0': 0, '10': 10})
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_processes(self):
+        texts = ['mine poodi', 'Tere maailm', 'mine koju'] * 4
+        pool = Pool(3)
+        try:
+            results = pool.map(analyze_with_disk_cache, [(self.path, text) for text in texts])
+        finally:
+            pool.close()
+            pool.join()
+        self.assertListEqual(results, [analyze(text) for text in texts])
+        self.assertEqual(len(PyVabamorf(disk_cache=self.path).disk_cache), 5)
+
+
+
+class AnalyzeManyTest(unittest.TestCase):
+
+    def test_same_as_analyze(self):
+        sentences = TextIsSameAsListTest().text().split('\n') + ['Ma elan New York linnas', '', ['tere', 'maailm']]
+        for kwargs in [{}, {'guess': False, 'phonetic': False, 'compound': False}]:
+            expected = [analyze(sentence, **kwargs) for sentence in sentences]
+            self.assertListEqual(analyze_many(sentences, **kwargs), expected)
+            self.assertListEqual(PyVabamorf(analysis_cache_size=10).analyze_many(sentences, **kwargs), expected)
+
+    def test_empty(self):
+        self.assertListEqual(analyze_many([]), [])
+
+
+
+class CompactOutputTest(unittest.TestCase):
+
+    def test_same_as_dict(self):
+        text = TextIsSameAsListTest().text() + ' Ma elan New York linnas'
+        for morf in [PyVabamorf(), PyVabamorf(analysis_cache_size=10)]:
+            for kwargs in [{}, {'guess': False, 'phonetic': False, 'compound': False}]:
+                expected = analyze(text, **kwargs)
+                result = morf.analyze(text, output='compact', **kwargs)
+                self.assertEqual(result, expected)
+                self.assertEqual(expected, result)
+                self.assertListEqual([word.as_dict() for word in result], expected)
+                self.assertEqual(morf.analyze_many([text], output='compact', **kwargs), [expected])
+
+    def test_record(self):
+        word = analyze('tulen', output='compact')[0]
+        self.assertIsInstance(word, WordRecord)
+        self.assertIsInstance(word.analysis[0], AnalysisRecord)
+        self.assertEqual(word['text'], 'tulen')
+        self.assertEqual(word.analysis[0].lemma, 'tulema')
+        self.assertEqual(word.analysis[0]['lemma'], 'tulema')
+        self.assertRaises(KeyError, word.__getitem__, 'lemma')
+        self.assertNotEqual(word.analysis[0], dict(word.analysis[0].as_dict(), lemma='tulla'))
+        self.assertNotEqual(word, 'tulen')
+
+    def test_pickle(self):
+        result = analyze('Ma elan New York linnas', output='compact')
+        self.assertEqual(pickle.loads(pickle.dumps(result)), result)
+
+    def test_illegal_output(self):
+        self.assertRaises(Exception, analyze, 'tere', output='xml')
+
+
+
+class AnalyzeIterTest(unittest.TestCase):
+
+    def test_sentences(self):
+        lines = ['Tere, maailm! Kuidas sul', 'läheb? Hästi.\n', '\n', 'Pealkiri\n', '\n', 'Ma elan New York linnas']
+        self.assertListEqual(list(iter_sentences(lines)),
+                             [['Tere,', 'maailm!'], ['Kuidas', 'sul', 'läheb?'], ['Hästi.'], ['Pealkiri'], ['Ma', 'elan', 'New', 'York', 'linnas']])
+
+    def test_tokens_and_sentences(self):
+        items = ['Tere', 'maailm', '.', ['juba', 'lause'], 'veel', ('teine', 'lause')]
+        self.assertListEqual(list(iter_sentences(items)), [['Tere', 'maailm', '.'], ['juba', 'lause'], ['veel'], ['teine', 'lause']])
+
+    def test_max_length(self):
+        self.assertListEqual(list(iter_sentences(['a b c d e'], max_length=2)), [['a', 'b'], ['c', 'd'], ['e']])
+
+    def test_file(self):
+        text = TextIsSameAsListTest().text()
+        result = analyze_iter(io.StringIO(text), batch_size=2)
+        self.assertIsInstance(result, types.GeneratorType)
+        sentences = list(iter_sentences(io.StringIO(text)))
+        self.assertListEqual(list(result), analyze_many(sentences))
+        self.assertListEqual([word['text'] for sentence in analyze_iter(io.StringIO(text)) for word in sentence], text.split())
+
+    def test_illegal_argument(self):
+        self.assertRaises(Exception, analyze_iter, [], foo=True)
+
+
+class ColumnarTest(unittest.TestCase):
+
+    def test_same_as_analyze(self):
+        text = TextIsSameAsListTest().text() + ' Ma elan New York linnas'
+        for guess in [True, False]:
+            expected = analyze(text, guess=guess)
+            columns = analyze_columnar(text, guess=guess)
+            self.assertListEqual(columns['words'], [word['text'] for word in expected])
+            self.assertListEqual(list(columns['counts']), [len(word['analysis']) for word in expected])
+            self.assertEqual(columns['offsets'][0], 0)
+            for idx, word in enumerate(expected):
+                start, end = columns['offsets'][idx], columns['offsets'][idx + 1]
+                self.assertEqual(end - start, len(word['analysis']))
+                for pos, an in zip(range(start, end), word['analysis']):
+                    self.assertEqual(PARTOFSPEECH_VOCABULARY[columns['partofspeech'][pos]], an['partofspeech'])
+                    self.assertEqual(FORM_VOCABULARY[columns['form'][pos]], an['form'])
+                    self.assertEqual(ENDING_VOCABULARY[columns['ending'][pos]], an['ending'])
+                    self.assertEqual(CLITIC_VOCABULARY[columns['clitic'][pos]], an['clitic'])
+                    self.assertEqual(columns['lemma'][pos], an['lemma'])
+
+    def test_interned_lemmas(self):
+        lemmas = analyze_columnar('koer koera koeraga')['lemma']
+        self.assertTrue(lemmas[0] is lemmas[1] and lemmas[1] is lemmas[2])
+
+    def test_unknown_value(self):
+        self.assertIsNone(FORM_VOCABULARY[0])
+
+
+class LemmatizeTest(unittest.TestCase):
+
+    def test_same_as_analyze(self):
+        text = TextIsSameAsListTest().text() + ' Ma elan New York linnas, ära ei tule'
+        for guess in [True, False]:
+            expected = [(word['text'], set(an['lemma'] for an in word['analysis'])) for word in analyze(text, guess=guess)]
+            result = lemmatize(text, guess=guess)
+            self.assertListEqual([(word, set(lemmas)) for word, lemmas in result], expected)
+
+    def test_distinct(self):
+        lemmas = lemmatize(['kuid'])[0][1]
+        self.assertListEqual(sorted(lemmas), ['kuid', 'kuu'])
+
+
+class InternedCategoriesTest(unittest.TestCase):
+
+    def test_shared(self):
+        for output in ['dict', 'compact']:
+            first, second = [word['analysis'][0] for word in analyze('majas majas', output=output)]
+            for key in ['partofspeech', 'form', 'ending', 'clitic']:
+                self.assertEqual(first[key], second[key])
+                self.assertTrue(first[key] is second[key])
+
+
+class ProfilingTest(unittest.TestCase):
+
+    def test_same_as_default(self):
+        morf = PyVabamorf()
+        morf.enable_profiling()
+        text = TextIsSameAsListTest().text()
+        for kwargs in [{}, {'guess': False, 'phonetic': False}, {'output': 'compact'}]:
+            self.assertListEqual(morf.analyze(text, **kwargs), analyze(text, **kwargs))
+            self.assertListEqual(morf.analyze_many([text, 'tere'], **kwargs), analyze_many([text, 'tere'], **kwargs))
+
+    def test_stats(self):
+        morf = PyVabamorf(hot_words=False)
+        self.assertIsNone(morf.get_stats())
+        morf.enable_profiling()
+        morf.analyze('tere xyzzyq')
+        morf.analyze_many(['mine poodi', 'kaitse'], guess=False)
+        stats = morf.get_stats()
+        for stage in ['convert', 'vector', 'native', 'proxy', 'output']:
+            self.assertEqual(stats['stages'][stage]['calls'], 2)
+        self.assertEqual(stats['stages']['cached']['calls'], 0)
+        self.assertGreater(stats['seconds'], 0)
+        self.assertEqual(stats['tokens'], 5)
+        self.assertEqual(stats['analyses'], sum(len(word['analysis']) for word in analyze('tere xyzzyq mine poodi kaitse')))
+        self.assertEqual(stats['guessed'], 1)
+        morf.enable_profiling()
+        self.assertEqual(morf.get_stats()['tokens'], 0)
+        morf.disable_profiling()
+        self.assertIsNone(morf.get_stats())
+
+    def test_loading_not_timed(self):
+        start = time.time()
+        PyVabamorf()._analyzer()
+        opening = time.time() - start
+        morf = PyVabamorf(hot_words=False)
+        morf.enable_profiling()
+        morf.analyze('tere')
+        self.assertLess(morf.get_stats()['stages']['vector']['seconds'], opening)
+
+    def test_cached(self):
+        morf = PyVabamorf(analysis_cache_size=100)
+        morf.analyze('tere')
+        morf.enable_profiling()
+        self.assertListEqual(morf.analyze('tere tere'), analyze('tere tere'))
+        stats = morf.get_stats()
+        self.assertEqual(stats['stages']['cached']['calls'], 1)
+        self.assertEqual(stats['stages']['native']['calls'], 0)
+        self.assertEqual(stats['tokens'], 2)
+
+    def test_default_instance(self):
+        morf = PyVabamorf()
+        morf.enable_profiling()
+        text = 'ja see on xyzzyq'
+        self.assertListEqual(morf.analyze(text), analyze(text))
+        stats = morf.get_stats()
+        for stage in ['convert', 'vector', 'native', 'proxy', 'output', 'cached']:
+            self.assertEqual(stats['stages'][stage]['calls'], 1)
+            self.assertGreater(stats['stages'][stage]['seconds'], 0)
+        self.assertEqual(stats['tokens'], 4)
+        self.assertEqual(stats['guessed'], 1)
+
+
+class AnalyzeJsonTest(unittest.TestCase):
+
+    def document(self):
+        sentences = [[{'text': word} for word in sentence.split()] for sentence in self.sentences()]
+        return {'paragraphs': [{'sentences': [{'words': words} for words in sentences[:2]]},
+                               {'sentences': [{'words': words} for words in sentences[2:]]}]}
+
+    def sentences(self):
+        return ['Esimeses vannaema New York .', 'mine poodi .', 'Tüünete öötööde allmaaraudteejaam']
+
+    def expected(self, **kwargs):
+        return analyze_many(self.sentences(), **kwargs)
+
+    def words(self, document):
+        return [sentence['words'] for paragraph in document['paragraphs'] for sentence in paragraph['sentences']]
+
+    def test_same_as_analyze(self):
+        document = json.dumps(self.document()).encode('utf-8')
+        for kwargs in [{}, {'guess': False}, {'phonetic': False, 'compound': False}, {'compound': False}]:
+            result = json.loads(analyze_json(document, **kwargs).decode('utf-8'))
+            self.assertEqual(len(result['paragraphs']), 2)
+            self.assertListEqual(self.words(result), self.expected(**kwargs))
+
+    def test_text(self):
+        result = json.loads(analyze_json(json.dumps(self.document())).decode('utf-8'))
+        self.assertListEqual(self.words(result), self.expected())
+
+    def test_fields_and_escapes(self):
+        document = {'words': [{'text': 'tere', 'id': list(range(12))}, {'text': 'New', 'id': 1}, {'text': 'York', 'id': 2},
+                              {'text': 'a\\"b\n', 'flag': False}, {'text': 'öö', 'x': {'y': None}}]}
+        for ensure_ascii in [True, False]:
+            result = json.loads(analyze_json(json.dumps(document, ensure_ascii=ensure_ascii).encode('utf-8')).decode('utf-8'))
+            words = result['words']
+            self.assertListEqual([word['text'] for word in words], ['tere', 'New York', 'a\\"b\n', 'öö'])
+            self.assertListEqual(words[0]['id'], list(range(12)))
+            self.assertEqual(words[1]['id'], 1)
+            self.assertIs(words[2]['flag'], False)
+            self.assertDictEqual(words[3]['x'], {'y': None})
+
+    def test_invalid(self):
+        for document in [b'{"words": [', b'[]', b'{"words": {}}', b'{"words": [{"text": ""}]}']:
+            self.assertRaises(ValueError, analyze_json, document)
+
+
+class TokenizeTest(unittest.TestCase):
+
+    def tokens(self, text):
+        return [text[start:end] for start, end in tokenize(text)]
+
+    def test_punctuation(self):
+        self.assertListEqual(self.tokens('«Olen homseni, ütles ta.»'),
+                             ['«', 'Olen', 'homseni', ',', 'ütles', 'ta', '.', '»'])
+        self.assertListEqual(self.tokens('"Kas tõesti?!" (vt. lisa)...'),
+                             ['"', 'Kas', 'tõesti', '?', '!', '"', '(', 'vt.', 'lisa', ')', '...'])
+
+    def test_full_stop(self):
+        self.assertListEqual(self.tokens('12. novembril oli dr. Tamm jne.'),
+                             ['12.', 'novembril', 'oli', 'dr.', 'Tamm', 'jne.'])
+        self.assertListEqual(self.tokens('Elan USA. Maja. Vaata...'),
+                             ['Elan', 'USA', '.', 'Maja', '.', 'Vaata', '...'])
+        self.assertListEqual(self.tokens('«1990.»'), ['«', '1990.', '»'])
+
+    def test_inside_word(self):
+        self.assertListEqual(self.tokens('3.5 -5 Tartu-Tallinn www.ee'), ['3.5', '-5', 'Tartu-Tallinn', 'www.ee'])
+
+    def test_offsets(self):
+        text = ' \töö\u00a0tööde…\n'
+        self.assertListEqual(tokenize(text), [(2, 4), (5, 10), (10, 11)])
+        self.assertListEqual(tokenize(''), [])
+        self.assertListEqual(tokenize(convert(text)), tokenize(text))
+
+
+class AnalyzeTextTest(unittest.TestCase):
+
+    def test_same_as_analyze(self):
+        text = 'Mina tahan  «öötööd», ütles ta.'
+        result = analyze_text(text, guess=False, phonetic=False)
+        words = [text[start:end] for start, end in tokenize(text)]
+        expected = analyze(words, guess=False, phonetic=False)
+        self.assertListEqual([dict((key, word[key]) for key in ['text', 'analysis']) for word in result], expected)
+        for word in result:
+            self.assertEqual(text[word['start']:word['end']], word['text'])
+
+    def test_ordinal(self):
+        result = analyze_text('Täna, 12. novembril')
+        self.assertListEqual([(word['text'], word['start'], word['end']) for word in result],
+                             [('Täna', 0, 4), (',', 4, 5), ('12.', 6, 9), ('novembril', 10, 19)])
+        self.assertListEqual([an['partofspeech'] for an in result[2]['analysis']], ['O'])
+
+    def test_abbreviation(self):
+        result = analyze_text('dr. Tamm ütles jne.')
+        self.assertListEqual([(word['text'], word['start'], word['end']) for word in result],
+                             [('dr.', 0, 3), ('Tamm', 4, 8), ('ütles', 9, 14), ('jne.', 15, 19)])
+        self.assertListEqual([an['partofspeech'] for an in result[0]['analysis']], ['Y'])
+        self.assertListEqual([an['partofspeech'] for an in result[3]['analysis']], ['Y'])
+
+    def test_multiword(self):
+        text = 'Elan New  York, Tallinnas'
+        result = analyze_text(text)
+        self.assertListEqual([word['text'] for word in result], ['Elan', 'New York', ',', 'Tallinnas'])
+        self.assertEqual(text[result[1]['start']:result[1]['end']], 'New  York')
+
                 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from pyvabamorf.benchmarks import zipf_corpus, run, main, VOCABULARY, LONG_TOKENS
+import unittest
+import tempfile
+import shutil
+import json
+import os
+
+
+class ZipfCorpusTest(unittest.TestCase):
+
+    def test_deterministic(self):
+        self.assertListEqual(zipf_corpus(1000, seed=3), zipf_corpus(1000, seed=3))
+        self.assertNotEqual(zipf_corpus(1000, seed=3), zipf_corpus(1000, seed=4))
+
+    def test_words(self):
+        corpus = zipf_corpus(5000)
+        words = [word for sentence in corpus for word in sentence[:-1]]
+        self.assertEqual(len(words), 5000)
+        self.assertTrue(all(sentence[-1] == '.' for sentence in corpus))
+        # the most frequent word comes first in the vocabulary
+        self.assertEqual(max(set(words), key=words.count), VOCABULARY[0])
+        self.assertTrue(any(word in LONG_TOKENS for word in words))
+        self.assertTrue(any(word not in VOCABULARY and word not in LONG_TOKENS for word in words))
+
+
+class RunTest(unittest.TestCase):
+
+    def test_results(self):
+        results = run(words=200, repeat=1)
+        self.assertEqual(len(results['analyze']) % 4, 0)
+        for result in results['analyze']:
+            self.assertGreater(result['words_per_second'], 0)
+        self.assertGreater(results['synthesize']['calls_per_second'], 0)
+        self.assertGreater(results['startup']['total_seconds'], 0)
+
+    def test_output(self):
+        tempdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tempdir, 'results.json')
+            main(['--words', '100', '--repeat', '1', '--output', path])
+            with open(path) as f:
+                results = json.load(f)
+            self.assertEqual(results['settings'], {'words': 100, 'repeat': 1, 'seed': 1, 'hot_words': True,
+                                                   'analysis_cache_size': 0, 'disk_cache': None})
+        finally:
+            shutil.rmtree(tempdir)
+
+    def test_analyzer_settings(self):
+        tempdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tempdir, 'results.json')
+            cache = os.path.join(tempdir, 'cache.db')
+            main(['--words', '100', '--repeat', '1', '--output', path,
+                  '--no-hot-words', '--analysis-cache-size', '1000', '--disk-cache', cache])
+            with open(path) as f:
+                results = json.load(f)
+            self.assertEqual(results['settings'], {'words': 100, 'repeat': 1, 'seed': 1, 'hot_words': False,
+                                                   'analysis_cache_size': 1000, 'disk_cache': cache})
+            self.assertTrue(os.path.isfile(cache))
+        finally:
+            shutil.rmtree(tempdir)
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from pyvabamorf import analyze, synthesize
+from pyvabamorf.cli import run, read_lines
+import unittest
+import tempfile
+import shutil
+import json
+import io
+import os
+
+
+class CliTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def path(self, name):
+        return os.path.join(self.tempdir, name)
+
+    def write(self, name, lines):
+        with io.open(self.path(name), 'w', encoding='utf-8') as f:
+            f.write(''.join(line + '\n' for line in lines))
+        return self.path(name)
+
+    def read(self, name):
+        return [json.loads(line) for line in read_lines([self.path(name)])]
+
+    def texts(self):
+        return ['Tere maailm .', 'mine poodi', '', 'Jüri Ratas läks laupäevaõhtul koju .', 'xyzzyq']
+
+    def test_analyze_text(self):
+        inputs = self.write('in.txt', self.texts())
+        for output in ['out.jsonl', 'out.jsonl.gz', 'out.jsonl.bz2']:
+            self.assertEqual(run('analyze', [inputs], self.path(output), chunksize=2, guess=False), len(self.texts()))
+            expected = [{'text': text, 'analysis': analyze(text.split(), guess=False)} for text in self.texts()]
+            self.assertListEqual(self.read(output), expected)
+
+    def test_analyze_jsonl(self):
+        records = [{'id': i, 'words': text.split()} for i, text in enumerate(self.texts())]
+        inputs = self.write('in.jsonl', [json.dumps(record) for record in records])
+        run('analyze', [inputs], self.path('out.jsonl'), field='words', workers=2, chunksize=1)
+        for record in records:
+            record['analysis'] = analyze(record['words'])
+        self.assertListEqual(self.read('out.jsonl'), records)
+
+    def test_line_breaks(self):
+        # only newlines end a line
+        inputs = self.write('in.txt', ['mine\x0cpoodi', 'Tere\u2028maailm'])
+        self.assertEqual(run('analyze', [inputs], self.path('out.txt.jsonl')), 2)
+        self.assertListEqual([record['text'] for record in self.read('out.txt.jsonl')], ['mine\x0cpoodi', 'Tere\u2028maailm'])
+        records = [{'text': 'Tere\u2028maailm'}, {'text': 'mine\x0cpoodi'}]
+        inputs = self.write('in.jsonl', [json.dumps(record, ensure_ascii=False) for record in records])
+        self.assertEqual(run('analyze', [inputs], self.path('out.jsonl')), 2)
+        self.assertListEqual([record['analysis'] for record in self.read('out.jsonl')],
+                             [analyze(record['text']) for record in records])
+
+    def test_invalid_field(self):
+        for value in [5, ['mine', 5], {'text': 'mine'}]:
+            inputs = self.write('in.jsonl', ['{"text": "mine poodi"}', json.dumps({'text': value})])
+            with self.assertRaises(ValueError) as cm:
+                run('analyze', [inputs], self.path('out.jsonl'))
+            self.assertIn('text', str(cm.exception))
+            self.assertIn(json.dumps({'text': value}), str(cm.exception))
+
+    def test_synthesize(self):
+        inputs = self.write('in.txt', ['pood\tsg p\tS', 'palk\tsg kom', 'palk\tsg kom\t\tpalga'])
+        run('synthesize', [inputs], self.path('out.jsonl'), phonetic=False)
+        self.assertListEqual([record['synthesis'] for record in self.read('out.jsonl')],
+                             [synthesize('pood', form='sg p', partofspeech='S', phonetic=False),
+                              synthesize('palk', form='sg kom', phonetic=False),
+                              synthesize('palk', form='sg kom', hint='palga', phonetic=False)])
+
+    def test_resume(self):
+        records = [json.dumps({'text': text}) for text in self.texts()]
+        inputs = self.write('in.jsonl', records[:3] + ['{broken'] + records[4:])
+        checkpoint = self.path('checkpoint')
+        for output in ['out.jsonl', 'out.jsonl.gz']:
+            self.assertRaises(ValueError, run, 'analyze', [inputs], self.path(output), chunksize=2, checkpoint=checkpoint)
+            self.assertEqual(len(self.read(output)), 2)
+            # output written after the checkpoint is discarded
+            with io.open(self.path(output), 'ab') as f:
+                f.write(b'garbage')
+            self.write('in.jsonl', records)
+            self.assertEqual(run('analyze', [inputs], self.path(output), chunksize=2, checkpoint=checkpoint), 3)
+            self.assertFalse(os.path.exists(checkpoint))
+            self.assertListEqual(self.read(output), [{'text': text, 'analysis': analyze(text)} for text in self.texts()])
+            self.write('in.jsonl', records[:3] + ['{broken'] + records[4:])
+
+    def test_checkpoint_of_other_job(self):
+        inputs = self.write('in.txt', self.texts())
+        checkpoint = self.path('checkpoint')
+        with io.open(checkpoint, 'w', encoding='utf-8') as f:
+            f.write('{"job": {"command": "synthesize"}, "records": 1, "output_bytes": 0}')
+        self.assertRaises(Exception, run, 'analyze', [inputs], self.path('out.jsonl'), checkpoint=checkpoint)
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from pyvabamorf import PyVabamorf
+from pyvabamorf.morf import DICT_PATH, DICT_FILE, DICT_HASH_FILE, dictionary_hash
+from pyvabamorf.hotwords import build, load, HOT_WORDS_FILE
+import unittest
+import warnings
+import tempfile
+import shutil
+import json
+import io
+import os
+
+
+class HotWordsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        shutil.copy(os.path.join(DICT_PATH, DICT_FILE), self.tempdir)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def text(self):
+        return 'Ja see on see, mida ta ei tea , aga New York ja öötööde ja xyzzyq on'
+
+    def test_build(self):
+        words = build(['ja', 'on', 'see', 'on', 'New', 'xyzzyq', 'öötööde'], self.tempdir)
+        self.assertListEqual(words, ['ja', 'on', 'see', 'öötööde'])
+        self.assertListEqual(sorted(load(self.tempdir).words), words)
+
+    def test_same_as_analyzer(self):
+        build(self.text().split(), self.tempdir)
+        morf = PyVabamorf(self.tempdir)
+        expected = PyVabamorf(self.tempdir, hot_words=False)
+        for guess in [True, False]:
+            for phonetic in [True, False]:
+                for compound in [True, False]:
+                    kwargs = {'guess': guess, 'phonetic': phonetic, 'compound': compound}
+                    self.assertListEqual(morf.analyze(self.text(), **kwargs), expected.analyze(self.text(), **kwargs))
+                    self.assertListEqual(morf.analyze_many([self.text(), 'ja'], output='compact', **kwargs),
+                                         expected.analyze_many([self.text(), 'ja'], output='compact', **kwargs))
+        self.assertGreater(len(morf.hot_words), 0)
+
+    def test_result_not_shared(self):
+        build(['ja'], self.tempdir)
+        morf = PyVabamorf(self.tempdir)
+        morf.analyze('ja')[0]['analysis'][0]['root_tokens'].append('x')
+        self.assertListEqual(morf.analyze('ja'), PyVabamorf(self.tempdir, hot_words=False).analyze('ja'))
+
+    def test_stale(self):
+        build(['ja'], self.tempdir)
+        path = os.path.join(self.tempdir, HOT_WORDS_FILE)
+        with io.open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data['dictionary'] = '0' * 40
+        with io.open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(data, ensure_ascii=False))
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            morf = PyVabamorf(self.tempdir)
+            self.assertListEqual(morf.analyze('ja'), PyVabamorf(self.tempdir, hot_words=False).analyze('ja'))
+        self.assertIsNone(morf.hot_words)
+        self.assertEqual(len(caught), 1)
+
+    def test_dictionary_hash(self):
+        digest = dictionary_hash(self.tempdir)
+        self.assertEqual(digest, dictionary_hash(DICT_PATH))
+        path = os.path.join(self.tempdir, DICT_HASH_FILE)
+        with io.open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        self.assertEqual(saved['sha1'], digest)
+        # the saved hash is used while the dictionary file is not changed
+        saved['sha1'] = '0' * 40
+        with io.open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(saved))
+        self.assertEqual(dictionary_hash(self.tempdir), '0' * 40)
+        dictionary = os.path.join(self.tempdir, DICT_FILE)
+        os.utime(dictionary, (0, os.stat(dictionary).st_mtime + 10))
+        self.assertEqual(dictionary_hash(self.tempdir), digest)
+
+    def test_missing(self):
+        self.assertIsNone(load(self.tempdir))
+
+    def test_bundled(self):
+        self.assertIsNotNone(load(DICT_PATH))
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from pyvabamorf import analyze
+from pyvabamorf.parallel import analyze_corpus
+from pyvabamorf.tests.test_multi import MultithreadingTest
+import unittest
+
+
+class AnalyzeCorpusTest(unittest.TestCase):
+
+    def test_same_as_analyze(self):
+        texts = MultithreadingTest().indata()
+        expected = [analyze(text) for text in texts]
+        for processes in [1, 3]:
+            for chunksize in [1, 4, 100]:
+                self.assertListEqual(analyze_corpus(iter(texts), processes=processes, chunksize=chunksize), expected)
+
+    def test_arguments(self):
+        texts = MultithreadingTest().indata()
+        expected = [analyze(text, guess=False, phonetic=False) for text in texts]
+        self.assertEqual(analyze_corpus(texts, processes=2, guess=False, phonetic=False, output='compact'), expected)
+        self.assertRaises(Exception, analyze_corpus, texts, foo=True)
+
+    def test_throughput(self):
+        texts = MultithreadingTest().indata()
+        result = analyze_corpus(texts, processes=2, chunksize=5)
+        self.assertEqual(result.sentences, len(texts))
+        self.assertEqual(result.words, sum(len(text.split()) for text in texts))
+        self.assertGreater(result.seconds, 0)
+        self.assertGreater(result.words_per_second, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals, print_function
 
-from pyvabamorf import synthesize
+from pyvabamorf import synthesize, synthesize_many, PyVabamorf
 import unittest
 
 class TestSynthesize(unittest.TestCase):
@@ -26,5 +26,57 @@ class TestSynthesize(unittest.TestCase):
         words = synthesize('palk', form='sg kom', hint='palga', phonetic=False)
         self.assertListEqual(words, ['palgaga'])
 
+
+class TestSynthesizeMany(unittest.TestCase):
+
+    def requests(self):
+        return [('pood', 'S', 'sg p'), ('pooma', 'V', 'ti'), 'kaitse', {'lemma': 'palk', 'form': 'sg kom', 'hint': 'palga'}, ('palk', '', 'sg kom', '')]
+
+    def expected(self, **kwargs):
+        return [synthesize('pood', partofspeech='S', form='sg p', **kwargs),
+                synthesize('pooma', partofspeech='V', form='ti', **kwargs),
+                synthesize('kaitse', **kwargs),
+                synthesize('palk', form='sg kom', hint='palga', **kwargs),
+                synthesize('palk', form='sg kom', **kwargs)]
+
+    def test_same_as_synthesize(self):
+        for kwargs in [{}, {'guess': False, 'phonetic': False}]:
+            self.assertListEqual(synthesize_many(self.requests(), **kwargs), self.expected(**kwargs))
+
+    def test_cached(self):
+        morf = PyVabamorf(synthesis_cache_size=10)
+        morf.synthesize('kaitse', phonetic=False)
+        self.assertListEqual(morf.synthesize_many(self.requests(), phonetic=False), self.expected(phonetic=False))
+        self.assertEqual(morf.synthesis_cache.stats()['hits'], 1)
+
+    def test_illegal_request(self):
+        self.assertRaises(Exception, synthesize_many, [('pood', 'S', 'sg p', '', 'x')])
+        self.assertRaises(Exception, synthesize_many, [{'lemma': 'pood', 'vorm': 'sg p'}])
+
+
+class TestSynthesisCache(unittest.TestCase):
+
+    def test_same_as_default(self):
+        morf = PyVabamorf(synthesis_cache_size=2)
+        calls = [('pood', 'sg p', 'S', ''), ('palk', 'sg kom', '', ''), ('palk', 'sg kom', '', 'palga'), ('kaitse', 'sg g', '', '')]
+        for lemma, form, partofspeech, hint in calls + calls:
+            for phonetic in [True, False]:
+                self.assertListEqual(morf.synthesize(lemma, form=form, partofspeech=partofspeech, hint=hint, phonetic=phonetic),
+                                     synthesize(lemma, form=form, partofspeech=partofspeech, hint=hint, phonetic=phonetic))
+
+    def test_result_not_shared(self):
+        morf = PyVabamorf(synthesis_cache_size=10)
+        morf.synthesize('pood', form='sg p', partofspeech='S', phonetic=False).append('x')
+        self.assertListEqual(morf.synthesize('pood', form='sg p', partofspeech='S', phonetic=False), ['poodi'])
+
+    def test_stats(self):
+        morf = PyVabamorf(synthesis_cache_size=1)
+        morf.synthesize('pood', form='sg p')
+        morf.synthesize('pood', form='sg p')
+        morf.synthesize('pood', form='sg g')
+        self.assertDictEqual(morf.synthesis_cache.stats(), {'hits': 1, 'misses': 2, 'evictions': 1, 'size': 1, 'maxsize': 1})
+        morf.synthesis_cache.clear()
+        self.assertDictEqual(morf.synthesis_cache.stats(), {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'maxsize': 1})
+
 if __name__ == '__main__':
     unittest.main()
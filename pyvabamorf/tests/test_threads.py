@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from pyvabamorf import analyze, synthesize, PyVabamorf
+from pyvabamorf.tests.test_multi import MultithreadingTest
+import threading
+import unittest
+
+
+class ThreadsTest(unittest.TestCase):
+
+    def test_threads(self):
+        texts = MultithreadingTest().indata()
+        expected = [analyze(text) for text in texts]
+        morf = PyVabamorf(mmap=True)
+        results = {}
+
+        def worker(idx):
+            results[idx] = [morf.analyze(text) for text in texts]
+            results[idx].append(morf.synthesize('palk', form='sg kom', phonetic=False))
+
+        threads = [threading.Thread(target=worker, args=(idx,)) for idx in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for idx in range(4):
+            self.assertListEqual(results[idx], expected + [['palgaga', 'palgiga']])
+
+
+if __name__ == '__main__':
+    unittest.main()
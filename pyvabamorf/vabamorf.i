@@ -9,11 +9,8 @@
 %include "cdata.i"
 %include "exception.i"
 
-// wrap C++ standard exceptions
-%exception {
-    try {
-        $action
-    }
+// translate C++ standard exceptions
+%define CATCH_VABAMORF_EXCEPTIONS
     catch (const std::runtime_error& e) {
         SWIG_exception(SWIG_RuntimeError, e.what());
     }
@@ -32,20 +29,98 @@
     catch (...) {
         SWIG_exception(SWIG_RuntimeError, "unknown exception");
     }
+%enddef
+
+// wrap C++ standard exceptions
+%exception {
+    try {
+        $action
+    }
+    CATCH_VABAMORF_EXCEPTIONS
+}
+
+// long running methods do not touch Python objects, so they release the GIL
+// and let other threads run meanwhile
+%define RELEASE_GIL(method)
+%exception method {
+    try {
+        ReleaseGIL nogil;
+        $action
+    }
+    CATCH_VABAMORF_EXCEPTIONS
 }
+%enddef
+
+RELEASE_GIL(Analyzer::analyze)
+RELEASE_GIL(Analyzer::analyzeMany)
+RELEASE_GIL(Analyzer::analyzeColumnar)
+RELEASE_GIL(Analyzer::analyzeJson)
+RELEASE_GIL(Analyzer::analyzeText)
+RELEASE_GIL(Analyzer::lemmatize)
+RELEASE_GIL(Synthesizer::synthesize)
+RELEASE_GIL(Synthesizer::synthesizeMany)
 
 namespace std {
    %template(StringVector) vector<string>;
+   %template(StringVectorVector) vector<vector<string> >;
+   %template(IntVector) vector<int>;
+   %template(Counters) map<string, long>;
 };
 
+// JSON documents are passed as bytes both ways
+%typemap(in) std::string const& document (std::string temp) {
+    char* buffer;
+    Py_ssize_t length;
+    if (PyBytes_AsStringAndSize($input, &buffer, &length) == -1) {
+        SWIG_fail;
+    }
+    temp.assign(buffer, length);
+    $1 = &temp;
+}
+%typemap(freearg) std::string const& document ""
+%typemap(out) std::string analyzeJson {
+    $result = PyBytes_FromStringAndSize($1.data(), $1.size());
+}
+
+// columns are returned as tuples instead of vector proxies
+%naturalvar ColumnarAnalysis::words;
+%naturalvar ColumnarAnalysis::offsets;
+%naturalvar ColumnarAnalysis::counts;
+%naturalvar ColumnarAnalysis::lemmas;
+%naturalvar ColumnarAnalysis::partofspeech;
+%naturalvar ColumnarAnalysis::form;
+%naturalvar ColumnarAnalysis::ending;
+%naturalvar ColumnarAnalysis::clitic;
+%naturalvar Analysis::rootTokens;
+%naturalvar TextAnalysis::starts;
+%naturalvar TextAnalysis::ends;
+
 %{
 #include "vabamorf.h"
+
+// releases the GIL for the lifetime of the object, also when an exception is thrown
+class ReleaseGIL {
+public:
+    ReleaseGIL() : state(PyEval_SaveThread()) {}
+    ~ReleaseGIL() { PyEval_RestoreThread(state); }
+private:
+    PyThreadState* state;
+};
+%}
+
+%init %{
+#if PY_VERSION_HEX < 0x03070000
+    PyEval_InitThreads();
+#endif
 %}
 
 namespace std {
     %template(AnalysisVector) vector<Analysis>;
     %template(WordAnalysis) pair<string, vector<Analysis> >;
     %template(SentenceAnalysis) vector<pair<string, vector<Analysis> > >;
+    %template(SentenceAnalysisVector) vector<vector<pair<string, vector<Analysis> > > >;
+    %template(WordLemmas) pair<string, vector<string> >;
+    %template(WordLemmasVector) vector<pair<string, vector<string> > >;
 }
 
 %include "include/etana/vabamorf.h"
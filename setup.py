@@ -59,5 +59,5 @@ setup(name='pyvabamorf',
     packages = ['pyvabamorf', 'pyvabamorf.tests'],
     package_dir = {'pyvabamorf': 'pyvabamorf',
                    'pyvabamorf.test': os.path.join('pyvabamorf', 'tests')},
-    package_data = {'pyvabamorf': [os.path.join('dct', 'et.dct')]}
+    package_data = {'pyvabamorf': [os.path.join('dct', 'et.dct'), os.path.join('dct', 'hot.json')]}
     )
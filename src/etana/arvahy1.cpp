@@ -10,6 +10,7 @@
 
 int MORF0::arvahy1(MRFTULEMUSED *tulemus, FSXSTRING *S6na, int S6naPikkus)
     {
+    loendurid[LOEND_ARVAHY1]++;
     int  tmp;
     int res;
     int i, i1, i2;
@@ -10,6 +10,7 @@
 
 int MORF0::arvai(MRFTULEMUSED *tulemus, FSXSTRING *S6na, int S6naPikkus)
     {
+    loendurid[LOEND_ARVAI]++;
     FSXSTRING sona;
 
     if (S6naPikkus < 3)
@@ -14,6 +14,7 @@
 
 int MORF0::arvalyh1(MRFTULEMUSED *tulemus, FSXSTRING *S6na)
     {
+    loendurid[LOEND_ARVALYH1]++;
 	if (sobiks_lyhendiks(S6na))
         tulemus->Add((const FSxCHAR *)(*S6na), FSxSTR("0"), FSxSTR(""), FSxSTR("Y"), FSxSTR("?, ")); 
     return ALL_RIGHT;
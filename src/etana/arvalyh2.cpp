@@ -3,6 +3,7 @@
 
 int MORF0::arvalyh2(MRFTULEMUSED *tulemus, FSXSTRING *S6na)
     {
+    loendurid[LOEND_ARVALYH2]++;
     if (sobiks_akronyymiks(S6na))
         tulemus->Add((const FSxCHAR *)(*S6na), FSxSTR("0"), FSxSTR(""), FSxSTR("Y"), FSxSTR("?, ")); 
     return ALL_RIGHT;
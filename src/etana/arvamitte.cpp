@@ -7,6 +7,7 @@
 
 int MORF0::arvamitte(MRFTULEMUSED *tulemus, FSXSTRING *S6na)
     {
+    loendurid[LOEND_ARVAMITTE]++;
     if ( TaheHulgad::PoleMuudKui(S6na, &(TaheHulgad::s_punktuatsioon)))         /* ilmselt _Z_ */
 	    {			  /* korraldame va"ljatryki */
         tulemus->Add((const FSxCHAR *)(*S6na), FSxSTR(""), FSxSTR(""), FSxSTR("Z"), FSxSTR("")); 
@@ -6,6 +6,7 @@
 
 int MORF0::arvans1(MRFTULEMUSED *tulemus, FSXSTRING *S6na, int S6naPikkus, VARIANTIDE_AHEL **variandid)
     {
+    loendurid[LOEND_ARVANS1]++;
     int res;
     int  cnt, ty2pik;
     CVARIANTIDE_AHEL ctyvi2_variant, cvahe_variant, csobivad_variandid;
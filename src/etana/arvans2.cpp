@@ -8,6 +8,7 @@
 
 int MORF0::arvans2(MRFTULEMUSED *tulemus, FSXSTRING *sonna, int S6naPikkus, VARIANTIDE_AHEL **variandid, const FSxCHAR *lubatavad_sl)
     {
+    loendurid[LOEND_ARVANS2]++;
     FSxCHAR eel, yel, yyl;
     VARIANTIDE_AHEL *variant, *viimane; // ainult selleks, et ts�keldada �le etteantud ahela 'variandid'
     KOMPONENT *k_tyvi, *k_lopp;
@@ -8,6 +8,7 @@
 
 int MORF0::arvapn2(MRFTULEMUSED *tulemus, FSXSTRING *S6na, int S6naPikkus)
     {
+    loendurid[LOEND_ARVAPN2]++;
     int i;
     int maha;
     FSXSTRING tyvi;
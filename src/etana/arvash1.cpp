@@ -7,6 +7,7 @@
 
 int MORF0::arvash1(MRFTULEMUSED *tulemus, FSXSTRING *S6na)
     {
+    loendurid[LOEND_ARVASH1]++;
     int res;
     int tagasitasand;
     FSXSTRING S6na3;
@@ -13,6 +13,7 @@
 
 int MORF0::arvasuf1(VARIANTIDE_AHEL **too_variandid, FSXSTRING *S6na, int S6naPikkus, VARIANTIDE_AHEL **sobivad_variandid)
     {
+    loendurid[LOEND_ARVASUF1]++;
     int res;
     KOMPONENT *tyvi, *suff, *lopp;
     FSXSTRING tsl, edu_lopp, edu_suff;
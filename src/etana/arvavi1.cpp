@@ -13,6 +13,7 @@
 
 int MORF0::arvavi1(MRFTULEMUSED *tulemus, FSXSTRING *S6na, int S6naPikkus)
     {
+    loendurid[LOEND_ARVAVI1]++;
     int i;
     //int k=0, k1=0, k2=0;
     int res = ALL_RIGHT;
@@ -5,6 +5,7 @@
 
 int MORF0::arvax(MRFTULEMUSED *tulemus, FSXSTRING *S6nna)
     {
+    loendurid[LOEND_ARVAX]++;
     int res, tmp;
     FSXSTRING S6na1;
     int S6naPikkus;
@@ -138,6 +139,7 @@ int MORF0::arvax(MRFTULEMUSED *tulemus, FSXSTRING *S6nna)
 
 bool MORF0::Barvaww(MRFTULEMUSED *tulemus, FSXSTRING *S6na, int S6naPikkus1, const FSxCHAR *lubatavad_sl)
     {
+    loendurid[LOEND_BARVAWW]++;
     CVARIANTIDE_AHEL ctoo_variandid, csobivad_variandid;
     int res;
     FSXSTRING S6na1;
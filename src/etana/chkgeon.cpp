@@ -67,4 +67,13 @@ int MORF0::chkgeon(MRFTULEMUSED *tul, FSXSTRING *sona, int *mitu)
     return ALL_RIGHT;
     }
 
+bool MORF0::chkgeon1(const FSXSTRING *sissePuhastatud)
+    {
+    FSXSTRING gsona = *sissePuhastatud;
+    // samad teisendused, mis chkmin()-is ja chkgeon()-is
+    TaheHulgad::AsendaMitu(&gsona, TaheHulgad::uni_kriipsud, TaheHulgad::amor_kriipsud);
+    TaheHulgad::Puhasta(&gsona);
+    return (dctLoend[5])[(FSxCHAR *)(const FSxCHAR *)gsona] != -1;
+    }
+
 
@@ -7,6 +7,7 @@ void MORF0::arvamin(
     {
     if (!mrfFlags.Chk(MF_OLETA))  // ei tulegi oletada
         return;
+    loendurid[LOEND_ARVAMIN]++;
 	int res;
 
     FSXSTRING sona= *sisse;    
@@ -3,63 +3,184 @@
 
 #ifdef CASH0 //==see on praegu kasutusel=======================================
 
+    #if defined (UNIX) || defined (MAC)
+        #include <sys/mman.h>
+        #include <sys/stat.h>
+    #endif
 
     cCACHE::cCACHE(void)
         {
         xptr=NULL;
         dbuf=NULL;
+        head=tail=NULL;
+        blokk=NULL;
+        nBlokk=0;
+        nBuf=1;
+        mbuf=NULL;
+        msize=0;
         DBSIZE=0;
+        reads=0;
+        CacheStatClr();
+        }
+
+    void cCACHE::CacheSetSize(
+        const int nBlokki)
+        {
+        nBuf = nBlokki < 1 ? 1 : nBlokki;
+        }
+
+    void cCACHE::CacheStatClr(void)
+        {
+        stat.hits=0;
+        stat.misses=0;
+        stat.evictions=0;
         }
 
     int cCACHE::CacheOpen( 
         const int _DBSIZE_,
-	    const int nBlokki // see CACHEi versioon ei kasua seda muutuja, selleks et oleks teistega kompatiibel
+	    const int nBlokki // kui <=0, siis CacheSetSize()'ga määratud arv
         )
 	    {
-		FSUNUSED(nBlokki);
         assert( (_DBSIZE_ % 256)==0 ); // peab olema n*256
 
-        xptr=NULL;
-        dbuf=NULL;
+        CacheClose();
+        if(nBlokki > 0)
+            {
+            nBuf=nBlokki;
+            }
         DBSIZE=_DBSIZE_;
-        dbuf = (struct STRUCT_CASH *)(malloc(sizeof(CASH) + DBSIZE)); // see malloc on OK
+        // puhvrite kirjeldused ja puhvrid ise ühes tükis
+        dbuf = (struct STRUCT_CASH *)(malloc(nBuf * (sizeof(CASH) + DBSIZE))); // see malloc on OK
 	    if(dbuf==NULL)
 		    {
             assert( ClassInvariant() );
 		    return 1;
 		    }
-	    dbuf->index = VABA;
-	    dbuf->buffer = (unsigned char *)(dbuf+1);   // MIS KURAT SEE VEEL ON?
-                                                    // ahaa, vt �lal m�lureserveerimist
+        unsigned char *ptr = (unsigned char *)(dbuf+nBuf);
+        for(int i=0; i < nBuf; i++)
+            {
+	        dbuf[i].index = VABA;
+	        dbuf[i].buffer = ptr;
+            dbuf[i].prev = i > 0 ? dbuf+i-1 : NULL;
+            dbuf[i].next = i < nBuf-1 ? dbuf+i+1 : NULL;
+            ptr += DBSIZE;
+            }
+        head=dbuf;
+        tail=dbuf+nBuf-1;
         assert( ClassInvariant() );
 	    return 0;
 	    }
+
+    int cCACHE::CacheMap(
+        CPFSFile *pDctFile,
+        const int _DBSIZE_)
+        {
+        assert( pDctFile != NULL );
+        assert( (_DBSIZE_ % 256)==0 ); // peab olema n*256
+
+        CacheClose();
+        DBSIZE=_DBSIZE_;
+    #if defined (UNIX) || defined (MAC)
+        FILE *pFile = *pDctFile;
+        struct stat st;
+        if(pFile==NULL || fstat(fileno(pFile), &st)!=0 || st.st_size < DBSIZE)
+            {
+            assert( ClassInvariant() );
+            return 1;
+            }
+        // ainult lugemiseks ja jagatult -- leheküljed tulevad otse
+        // failisüsteemi puhvrist ja on kõigi protsesside vahel ühised
+        void *pMap = mmap(NULL, (size_t)st.st_size, PROT_READ, MAP_SHARED, fileno(pFile), 0);
+        if(pMap==MAP_FAILED)
+            {
+            assert( ClassInvariant() );
+            return 1;
+            }
+        mbuf=(unsigned char *)pMap;
+        msize=(long)st.st_size;
+        assert( ClassInvariant() );
+        return 0;
+    #else
+        assert( ClassInvariant() );
+        return 1; // kujutist ei oska teha, jääb CacheOpen()
+    #endif
+        }
                             
     int cCACHE::CacheRead(
         CPFSFile *pDctFile,
         const int idx) 
 	    {
         assert( pDctFile != NULL );
+        reads++;
 
-	    if(dbuf->index != idx)
+        if(mbuf!=NULL)
+            {
+            // sõnastik mällu kujutatud, faili ei loe
+            if(idx < 0 || (long)idx * (long)DBSIZE + DBSIZE > msize)
+                {
+                xptr=NULL;
+                assert( ClassInvariant() );
+                return -1;
+                }
+            stat.hits++;
+            xptr = mbuf + (long)idx * (long)DBSIZE;
+            assert( ClassInvariant() );
+            return 0;
+            }
+        if(idx < 0)
+            {
+            assert( ClassInvariant() );
+            return -1;
+            }
+        CASH *c = idx < nBlokk ? blokk[idx] : NULL;
+	    if(c!=NULL)
+            {
+            stat.hits++;
+            }
+        else
 		    {
-		    //polnud m@lus - loeme kettalt dbuf'i
+		    //polnud m@lus - loeme kettalt kõige kauem kasutamata puhvrisse
+            stat.misses++;
+            if(idx >= nBlokk)
+                {
+                int n = idx + 1 > 2 * nBlokk ? idx + 1 : 2 * nBlokk;
+                CASH **tmp = (CASH **)realloc(blokk, n * sizeof(CASH *));
+                if(tmp==NULL)
+                    {
+                    assert( ClassInvariant() );
+                    return -1;
+                    }
+                for(int i=nBlokk; i < n; i++)
+                    {
+                    tmp[i]=NULL;
+                    }
+                blokk=tmp;
+                nBlokk=n;
+                }
+            c=tail;
+            if(c->index != VABA)
+                {
+                blokk[c->index]=NULL;   // viskame vana bloki välja
+                c->index = VABA;
+                stat.evictions++;
+                }
             if(pDctFile->Seek((long)idx * (long)DBSIZE)==false)
 			    {
                 assert( ClassInvariant() );
 	            return -1;
 			    }
-		    if(pDctFile->ReadBuffer(dbuf->buffer, DBSIZE)==false)
+		    if(pDctFile->ReadBuffer(c->buffer, DBSIZE)==false)
 			    {
-			    dbuf->index = VABA;	// puhver tyhi...
-                xptr=NULL;
+                xptr=NULL;  // puhver jääb tühjaks...
 
                 assert( ClassInvariant() );
 			    return -1;    // ... lugemine eba6nnestus
 			    }
-		    dbuf->index = idx;
+		    c->index = idx;
+            blokk[idx] = c;
 		    }
-	    xptr = dbuf->buffer;
+        ToFront(c);
+	    xptr = c->buffer;
     #ifdef STEM_NO
 		    stem_no = 1;
     #endif
@@ -67,6 +188,26 @@
 	    return 0;
 	    }
 
+    void cCACHE::ToFront(
+        CASH *c)
+        {
+        if(c==head)
+            {
+            return;
+            }
+        // ahelast välja...
+        c->prev->next = c->next;
+        if(c->next)
+            c->next->prev = c->prev;
+        else
+            tail = c->prev;
+        // ... ja algusesse
+        c->prev = NULL;
+        c->next = head;
+        head->prev = c;
+        head = c;
+        }
+
     void cCACHE::CacheClose(
 	    void)
 	    {
@@ -75,6 +216,21 @@
             free(dbuf); 
             dbuf=NULL;
             }
+        if(blokk)
+            {
+            free(blokk);
+            blokk=NULL;
+            }
+        nBlokk=0;
+        head=tail=NULL;
+    #if defined (UNIX) || defined (MAC)
+        if(mbuf)
+            {
+            munmap(mbuf, (size_t)msize);
+            }
+    #endif
+        mbuf=NULL;
+        msize=0;
         xptr=NULL;
 	    }
 
@@ -85,10 +241,15 @@
 
     int cCACHE::ClassInvariant(void)
         {
+        if(mbuf!=NULL)
+            {
+            return dbuf==NULL && msize>0;
+            }
         return
-            (dbuf==NULL && xptr==NULL) ||
-            (dbuf!=NULL && xptr==NULL && dbuf->index==VABA) ||
-            (dbuf!=NULL && xptr!=NULL && dbuf->index>=0);
+            (dbuf==NULL && xptr==NULL && head==NULL && tail==NULL) ||
+            (dbuf!=NULL && nBuf>0 && head!=NULL && tail!=NULL &&
+                head->prev==NULL && tail->next==NULL &&
+                (xptr==NULL || xptr==head->buffer));
         }
 
 // }}=cxxcash-0
@@ -498,6 +498,7 @@ void ETMRFA::LisaPNimeAnalyysid(AHEL2 &ahel, int lauseAlgusIdx)
     assert(mrfFlags->ChkB(MF_YHESTA) == true);
     if (mrfFlags->ChkB(MF_LISAPNANAL) == false)
         return; // pole vaja üldse rabeledagi
+    loendurid[LOEND_LISAPNIMEANALYYSID]++;
     LYLI *pLyli;
 
     for (int idx = lauseAlgusIdx;
@@ -23,6 +23,7 @@ int MORF0::kchk1(
     char *paha_koht,
     const int paha_koha_suurus)
     {
+    loendurid[LOEND_KCHK1]++;
     register int i, tyvepik;
     int  res;
     int  algp;
@@ -20,6 +20,7 @@ int MORF0::kchk2(
     char *paha_koht,
     const int paha_koha_suurus)
     {
+    loendurid[LOEND_KCHK2]++;
     int j;
     int res;
     int  ssu, sty1, k, i;
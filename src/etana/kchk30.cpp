@@ -12,6 +12,7 @@ int MORF0::kchk30(
     char *paha_koht,
     const int paha_koha_suurus)
     {
+    loendurid[LOEND_KCHK30]++;
     register int i, max;
     VARIANTIDE_AHEL *sobiv_variant, *tmp, *variant, *pref_variant, *mille_taha, *vt_piir; //ok
     CVARIANTIDE_AHEL cvahe_variant;
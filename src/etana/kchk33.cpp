@@ -12,6 +12,7 @@ int MORF0::kchk33(
     char *paha_koht,
     const int paha_koha_suurus)
     {
+    loendurid[LOEND_KCHK33]++;
     int res;
     CVARIANTIDE_AHEL cvahe_variant;
     KOMPONENT *pref, *tyvi, *suff, *lopp, *essa;
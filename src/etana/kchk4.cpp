@@ -12,6 +12,7 @@ int MORF0::kchk4(
     char *paha_koht,
     const int paha_koha_suurus)
     {
+    loendurid[LOEND_KCHK4]++;
     int res;
     int  sty, cnt;
     int  pik;
@@ -187,6 +187,7 @@ int MORF0::kchk5(
     char *paha_koht,
     const int paha_koha_suurus)
     {
+    loendurid[LOEND_KCHK5]++;
     int res;
     int  pik;
     VARIANTIDE_AHEL *mille_taha, *vt_piir, *uus_variant=0;
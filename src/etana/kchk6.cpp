@@ -14,6 +14,7 @@ int MORF0::kchk6(
     const int paha_koha_pikkus
     )
     {
+    loendurid[LOEND_KCHK6]++;
     int res;
 
     int  pik;
@@ -48,6 +48,11 @@ void DCTRD::Open(
         {
         throw(VEAD(ERR_MORFI_PS6N,ERR_ROTTEN,__FILE__,__LINE__, "$Revision: 521 $"));
         }
+	if (mrfFlags.ChkB(MF_MMAPDCT) == true
+        && CacheMap(&dctFile, file_info.buf_size) == ALL_RIGHT)
+        {
+        return; // sõnastik mällu kujutatud, puhvrit pole vaja
+        }
 	if (CacheOpen(
             file_info.buf_size, // k�shis t�kkide suurus
             -1                  // t�kkide arv k�shis
@@ -1,16 +1,228 @@
 #include "vabamorf.h"
+#include "json.h"
+
+#include <algorithm>
+
+// markers of the roots
+static const char phoneticMarkers[]="~?]<";
+static const char compoundMarkers[]="_+=";
+static const char allMarkers[]="~?]<_+=";
+
+static bool isMarker(char c, const char* markers) {
+    return c && strchr(markers, c);
+}
+
+// remove the markers from the root, unless the root is a marker itself
+static std::string trimMarkers(std::string const& root, const char* markers) {
+    if (root.size()==1 && isMarker(root[0], markers)) {
+        return root;
+    }
+    std::string trimmed;
+    trimmed.reserve(root.size());
+    for (size_t i=0 ; i<root.size() ; ++i) {
+        if (!isMarker(root[i], markers)) {
+            trimmed+=root[i];
+        }
+    }
+    return trimmed;
+}
+
+// the root as returned by get_root() of the Python module
+static std::string trimmedRoot(std::string const& root, bool phonetic, bool compound) {
+    std::string result=phonetic ? root : trimMarkers(root, phoneticMarkers);
+    return compound ? result : trimMarkers(result, compoundMarkers);
+}
+
+// the root tokens as returned by get_group_tokens() of the Python module and the lemma:
+// the root is split into hyphenated groups (saunameheks-tallimeheks) and compound parts,
+// the lemma is the root without markers, verbs get the "ma" ending
+static void splitRoot(std::string const& root, std::string const& partofspeech, StringVector& tokens, std::string& lemma) {
+    tokens.clear();
+    lemma.clear();
+    if (root.size()==1 && (isMarker(root[0], allMarkers) || root[0]=='-')) {
+        tokens.push_back(root);
+        lemma=root;
+    } else {
+        size_t start=0;
+        for (size_t i=0 ; i<=root.size() ; ++i) {
+            if (i==root.size() || root[i]=='-' || root[i]=='_') {
+                tokens.push_back(trimMarkers(trimMarkers(root.substr(start, i-start), compoundMarkers), phoneticMarkers));
+                lemma+=tokens.back();
+                if (i<root.size() && root[i]=='-') {
+                    lemma+='-';
+                }
+                start=i+1;
+            }
+        }
+    }
+    if (partofspeech=="V" && lemma!="ei" && lemma!="\xc3\xa4ra") { // ei, ära
+        lemma+="ma";
+    }
+}
 
 Analysis::Analysis(const char* root, const char* ending, const char* clitic, const char* partofspeech, const char* form)
     : root(root), ending(ending), clitic(clitic), partofspeech(partofspeech), form(form) {
+    splitRoot(this->root, this->partofspeech, rootTokens, lemma);
 }
 
 Analysis::Analysis(const Analysis& analysis)
-    : root(analysis.root), ending(analysis.ending), clitic(analysis.clitic), partofspeech(analysis.partofspeech), form(analysis.form) {
+    : root(analysis.root), ending(analysis.ending), clitic(analysis.clitic), partofspeech(analysis.partofspeech), form(analysis.form),
+      lemma(analysis.lemma), rootTokens(analysis.rootTokens) {
+}
+
+// flags used for opening the dictionary
+// memory mapped dictionary is shared between processes and requires no block reads
+MRF_FLAGS_BASE_TYPE dictionaryFlags(bool useMmap) {
+    MRF_FLAGS_BASE_TYPE flags=MF_DFLT_MORFA;
+    if (useMmap) {
+        flags|=MF_MMAPDCT;
+    }
+    return flags;
+}
+
+// fixed vocabularies of the columnar analysis,
+// forms and endings are the ones listed in the dictionary plus the ones added by the analyzer
+static const char* partofspeechVocabulary[] = {
+    "A", "C", "D", "G", "H", "I", "J", "K", "N", "O", "P", "S", "U", "V", "X", "Y", "Z",
+    0
+};
+static const char* formVocabulary[] = {
+    "", "adt", "b", "d", "da", "des", "ge", "gem",
+    "gu", "ks", "ksid", "ksime", "ksin", "ksite", "ma", "maks",
+    "mas", "mast", "mata", "me", "n", "neg", "neg da", "neg ge",
+    "neg gem", "neg gu", "neg ks", "neg me", "neg nud", "neg nuks", "neg o", "neg tud",
+    "neg vat", "nud", "nuks", "nuksid", "nuksime", "nuksin", "nuksite", "nuvat",
+    "o", "pl ab", "pl abl", "pl ad", "pl all", "pl el", "pl es", "pl g",
+    "pl ill", "pl in", "pl kom", "pl n", "pl p", "pl ter", "pl tr", "s",
+    "sg ab", "sg abl", "sg ad", "sg all", "sg el", "sg es", "sg g", "sg ill",
+    "sg in", "sg kom", "sg n", "sg p", "sg ter", "sg tr", "sid", "sime",
+    "sin", "site", "ta", "tagu", "taks", "takse", "tama", "tav",
+    "tavat", "te", "ti", "tud", "tuks", "tuvat", "v", "vad",
+    "vat", "?",
+    0
+};
+static const char* endingVocabulary[] = {
+    "0", "", "a", "akse", "b", "d", "da", "dagi", "dagu", "daks",
+    "dakse", "dama", "dav", "davat", "de", "dega", "deks", "del", "dele", "delt",
+    "dena", "deni", "des", "desse", "dest", "deta", "di", "dud", "duks", "duvat",
+    "e", "ega", "eks", "el", "ele", "elt", "ena", "eni", "es", "esse",
+    "est", "eta", "ev", "ga", "gagi", "ge", "gem", "gi", "gu", "i",
+    "id", "iks", "il", "ile", "ilt", "ime", "in", "ina", "ini", "is",
+    "isse", "ist", "ite", "ke", "kem", "ks", "ksid", "ksime", "ksin", "ksite",
+    "kski", "ku", "l", "le", "legi", "lgi", "lle", "lt", "ltki", "ma",
+    "maks", "mas", "mast", "mata", "me", "n", "na", "nagi", "ni", "nigi",
+    "nud", "nuks", "nuksid", "nuksime", "nuksin", "nuksite", "nuvat", "s", "se", "sid",
+    "sime", "sin", "site", "ski", "sse", "ssegi", "st", "stki", "t", "ta",
+    "tagi", "tagu", "taks", "takse", "tama", "tav", "tavat", "te", "tega", "teks",
+    "tel", "tele", "telt", "tena", "teni", "tes", "tesse", "test", "teta", "ti",
+    "tt", "tte", "tud", "tuks", "tuvat", "u", "uks", "ul", "ule", "ult",
+    "uni", "us", "usse", "ust", "v", "vad", "vat",
+    0
+};
+static const char* cliticVocabulary[] = {
+    "", "gi", "ki",
+    0
+};
+
+static const char** vocabularies[VOCABULARY_COLUMNS] = {
+    partofspeechVocabulary, formVocabulary, endingVocabulary, cliticVocabulary
+};
+
+StringVector vocabulary(int column) {
+    if (column < 0 || column >= VOCABULARY_COLUMNS) {
+        throw std::out_of_range("no such vocabulary column");
+    }
+    StringVector values;
+    for (const char** value=vocabularies[column] ; *value ; ++value) {
+        values.push_back(*value);
+    }
+    return values;
 }
 
-Analyzer::Analyzer(std::string const lexPath) {
-    morf.Start(lexPath.c_str(), MF_DFLT_MORFA);
+CacheStats cacheStatsFromMorf(ETMRFA const& morf) {
+    CacheStats stats;
+    CASH_STAT const& stat = morf.CacheStat();
+    stats.hits = stat.hits;
+    stats.misses = stat.misses;
+    stats.evictions = stat.evictions;
+    stats.blocks = morf.CacheMapped() ? 0 : morf.CacheSize();
+    return stats;
+}
+
+// names of the engine counters, in MRF_LOENDUR order
+static const char* counterNames[LOENDUREID] = {
+    "arvamin", "arvax", "Barvaww", "arvamitte", "arvalyh1", "arvalyh2", "arvash1",
+    "arvavi1", "arvahy1", "arvai", "arvapn2", "arvasuf1", "arvans1", "arvans2",
+    "kchk1", "kchk2", "kchk30", "kchk33", "kchk4", "kchk5", "kchk6",
+    "LisaPNimeAnalyysid"
+};
+
+Counters countersFromMorf(ETMRFA const& morf) {
+    Counters counters;
+    counters["CacheRead"] = morf.CacheReads();
+    for (int i=0 ; i<LOENDUREID ; ++i) {
+        counters[counterNames[i]] = morf.loendurid[i];
+    }
+    return counters;
+}
+
+void clearCountersOfMorf(ETMRFA& morf) {
+    morf.LoenduridNulli();
+    morf.CacheReadsClr();
+}
+
+Dictionary::Dictionary(std::string const lexPath, bool useMmap, int cacheBlocks) {
+    morf.CacheSetSize(cacheBlocks);
+    morf.Start(lexPath.c_str(), dictionaryFlags(useMmap));
+}
+
+CacheStats Dictionary::cacheStats() const {
+    return cacheStatsFromMorf(morf);
+}
+
+void Dictionary::clearCacheStats() {
+    morf.CacheStatClr();
+}
+
+Counters Dictionary::counters() const {
+    return countersFromMorf(morf);
+}
+
+void Dictionary::clearCounters() {
+    clearCountersOfMorf(morf);
+}
+
+
+
+// the analyzer uses only the analysis part of the dictionary
+Analyzer::Analyzer(std::string const lexPath, bool useMmap, int cacheBlocks)
+    : ownDictionary(new Dictionary(lexPath, useMmap, cacheBlocks)), morf(ownDictionary->morf) {
+    init();
+}
+
+Analyzer::Analyzer(Dictionary& dictionary)
+    : ownDictionary(NULL), morf(dictionary.morf) {
+    init();
+}
+
+Analyzer::~Analyzer() {
+    delete ownDictionary;
+}
+
+void Analyzer::init() {
+    guessed = 0;
     enableHeuristics(true);
+    enableMarkers(true, true);
+    for (int column=0 ; column<VOCABULARY_COLUMNS ; ++column) {
+        for (int i=0 ; vocabularies[column][i] ; ++i) {
+            vocabularyIds[column][vocabularies[column][i]]=i+1;
+        }
+    }
+}
+
+int Analyzer::vocabularyId(int column, std::string const& value) const {
+    std::map<std::string, int>::const_iterator it=vocabularyIds[column].find(value);
+    return it==vocabularyIds[column].end() ? 0 : it->second;
 }
 
 void Analyzer::enableHeuristics(bool heuristics) {
@@ -26,94 +238,579 @@ void Analyzer::enableHeuristics(bool heuristics) {
     morf.Clr();
 }
 
-void Analyzer::process(CFSArray<CFSVar>& words) {
-    for (int i=0 ; i<words.GetSize() ; ++i) {
-        morf.Set1(words[i]["text"].GetWString());
+void Analyzer::enableMarkers(bool phonetic, bool compound) {
+    this->phonetic = phonetic;
+    this->compound = compound;
+}
+
+void Analyzer::process(StringVector const& sentence, std::vector<WordAnalysis>& results, IntVector* positions) {
+    for (size_t i=0 ; i<sentence.size() ; ++i) {
+        morf.Set1(FSXSTRING(sentence[i].c_str()));
         morf.Tag<int>((int)i, PRMS_TAGSINT);
     }
 
+    // the analysis of a word is followed by the tags of the input words it was made of,
+    // several words are merged into one for multiword names
+    results.reserve(sentence.size());
     LYLI Lyli;
-    CFSVar Analysis;
-    Analysis.Cast(CFSVar::VAR_ARRAY);
-    INTPTR ipLastPos=-1;
-    INTPTR ipDeleted=0;
+    bool merging=false;
 
     while (morf.Flush(Lyli)) {
         if (Lyli.lipp & PRMS_TAGSINT){
-            INTPTR ipPos=-ipDeleted+Lyli.ptr.arv;
-            if (ipLastPos==-1) {
-                words[ipPos]["analysis"]=Analysis;
-                ipLastPos=ipPos;
+            std::string const& text=sentence[Lyli.ptr.arv];
+            if (!merging) {
+                results.push_back(WordAnalysis(text, analysisBuf));
+                if (positions) {
+                    positions->push_back(Lyli.ptr.arv);
+                }
+                merging=true;
             } else {
-                words[ipLastPos]["text"]=words[ipLastPos]["text"].GetAString()+" "+words[ipPos]["text"].GetAString();
-                words.RemoveItem(ipPos);
-                ipDeleted++;
+                results.back().first+=" ";
+                results.back().first+=text;
             }
         } else if (Lyli.lipp & PRMS_MRF) {
-            Analysis.Cleanup();
-            Analysis.Cast(CFSVar::VAR_ARRAY);
-            ipLastPos=-1;
-            Lyli.ptr.pMrfAnal->StrctKomadLahku();
-            for (INTPTR ipTul=0; ipTul<Lyli.ptr.pMrfAnal->idxLast; ipTul++){
-                MRFTUL Tul=*(*Lyli.ptr.pMrfAnal)[(int)ipTul];
-                CFSVar Analysis1;
-                Analysis1["root"]=Tul.tyvi;
-                Analysis1["ending"]=Tul.lopp;
-                Analysis1["clitic"]=Tul.kigi;
-                Analysis1["partofspeech"]=Tul.sl;
-                CFSWString szForm=Tul.vormid; szForm.TrimRight(L", ");
-                Analysis1["form"]=szForm;
-                Analysis[ipTul]=Analysis1;
+            analysisBuf.clear();
+            merging=false;
+            MRFTULEMUSED& Tul=*Lyli.ptr.pMrfAnal;
+            if (Tul.eKustTulemused==eMRF_AO) {
+                ++guessed;
+            }
+            Tul.StrctKomadLahku();
+            for (INTPTR ipTul=0; ipTul<Tul.idxLast; ipTul++){
+                MRFTUL const& Tul1=*Tul[(int)ipTul];
+                formBuf=Tul1.vormid; formBuf.TrimRight(L", ");
+                analysisBuf.push_back(Analysis(FSStrWtoA(Tul1.tyvi, FSCP_UTF8),
+                                               FSStrWtoA(Tul1.lopp, FSCP_UTF8),
+                                               FSStrWtoA(Tul1.kigi, FSCP_UTF8),
+                                               FSStrWtoA(Tul1.sl, FSCP_UTF8),
+                                               FSStrWtoA(formBuf, FSCP_UTF8)));
+                if (!phonetic || !compound) {
+                    analysisBuf.back().root=trimmedRoot(analysisBuf.back().root, phonetic, compound);
+                }
             }
         }
     }
 }
 
-void Analyzer::compileResults(CFSArray<CFSVar>& words, std::vector<WordAnalysis>& results) {
-    for (int widx=0 ; widx < words.GetSize() ; ++widx) {
-        CFSVar word = words[widx];
-        CFSVar analysis = word["analysis"];
-        AnalysisVector vec;
-        for (int aidx=0 ; aidx < analysis.GetSize() ; ++aidx) {
-            CFSVar a = analysis[aidx];
-            vec.push_back(Analysis(a["root"].GetAString(),
-                                   a["ending"].GetAString(),
-                                   a["clitic"].GetAString(),
-                                   a["partofspeech"].GetAString(),
-                                   a["form"].GetAString()));
+std::vector<WordAnalysis> Analyzer::analyze(StringVector const& sentence, bool useHeuristics, bool phonetic, bool compound) {
+    enableHeuristics(useHeuristics);
+    enableMarkers(phonetic, compound);
+
+    std::vector<WordAnalysis> results;
+    process(sentence, results);
+
+    return results;
+}
+
+std::vector<WordLemmas> Analyzer::lemmatize(StringVector const& sentence, bool useHeuristics) {
+    // lemmas have no phonetic markers, so the analyzer need not add them
+    MRF_FLAGS_BASE_TYPE flags=MF_DFLT_MORFA;
+    if (useHeuristics) {
+        flags|=MF_OLETA;
+    }
+    morf.SetFlags(flags);
+    morf.SetMaxTasand();
+    morf.Clr();
+
+    for (size_t i=0 ; i<sentence.size() ; ++i) {
+        morf.Set1(FSXSTRING(sentence[i].c_str()));
+        morf.Tag<int>((int)i, PRMS_TAGSINT);
+    }
+
+    // only the root and partofspeech of the analyses are needed,
+    // the comma separated forms are not split into analyses of their own
+    std::vector<WordLemmas> results;
+    results.reserve(sentence.size());
+    StringVector lemmas;
+    StringVector tokens;
+    std::string lemma;
+    LYLI Lyli;
+    bool merging=false;
+
+    while (morf.Flush(Lyli)) {
+        if (Lyli.lipp & PRMS_TAGSINT){
+            std::string const& text=sentence[Lyli.ptr.arv];
+            if (!merging) {
+                results.push_back(WordLemmas(text, lemmas));
+                merging=true;
+            } else {
+                results.back().first+=" ";
+                results.back().first+=text;
+            }
+        } else if (Lyli.lipp & PRMS_MRF) {
+            lemmas.clear();
+            merging=false;
+            MRFTULEMUSED& Tul=*Lyli.ptr.pMrfAnal;
+            if (Tul.eKustTulemused==eMRF_AO) {
+                ++guessed;
+            }
+            for (INTPTR ipTul=0; ipTul<Tul.idxLast; ipTul++){
+                MRFTUL const& Tul1=*Tul[(int)ipTul];
+                splitRoot(std::string(FSStrWtoA(Tul1.tyvi, FSCP_UTF8)), std::string(FSStrWtoA(Tul1.sl, FSCP_UTF8)), tokens, lemma);
+                if (std::find(lemmas.begin(), lemmas.end(), lemma)==lemmas.end()) {
+                    lemmas.push_back(lemma);
+                }
+            }
         }
-        results.push_back(WordAnalysis(std::string(word["text"].GetAString()), vec));
     }
+    return results;
 }
 
-CFSArray<CFSVar> cfsvarFromStringVector(StringVector const& sentence) {
-    CFSArray<CFSVar> data(sentence.size());
-    for (size_t i=0 ; i<sentence.size() ; ++i) {
-        CFSVar wordData;
-        wordData.Cast(CFSVar::VAR_MAP);
-        wordData["text"] = sentence[i].c_str();
-        data.AddItem(wordData);
+std::vector<SentenceAnalysis> Analyzer::analyzeMany(std::vector<StringVector> const& sentences, bool useHeuristics,
+                                                    bool phonetic, bool compound) {
+    enableHeuristics(useHeuristics);
+    enableMarkers(phonetic, compound);
+
+    std::vector<SentenceAnalysis> results(sentences.size());
+    for (size_t i=0 ; i<sentences.size() ; ++i) {
+        process(sentences[i], results[i]);
     }
-    return data;
+    return results;
 }
 
-std::vector<WordAnalysis> Analyzer::analyze(StringVector const& sentence, bool useHeuristics) {
+ColumnarAnalysis Analyzer::analyzeColumnar(StringVector const& sentence, bool useHeuristics) {
     enableHeuristics(useHeuristics);
+    enableMarkers(true, true);
 
-    CFSArray<CFSVar> words = cfsvarFromStringVector(sentence);
-    process(words);
+    std::vector<WordAnalysis> words;
+    process(sentence, words);
 
+    ColumnarAnalysis result;
+    result.words.reserve(words.size());
+    result.offsets.reserve(words.size()+1);
+    result.counts.reserve(words.size());
+    result.offsets.push_back(0);
+    for (size_t i=0 ; i<words.size() ; ++i) {
+        AnalysisVector const& analysis=words[i].second;
+        result.words.push_back(words[i].first);
+        result.counts.push_back((int)analysis.size());
+        result.offsets.push_back(result.offsets.back()+(int)analysis.size());
+        for (size_t j=0 ; j<analysis.size() ; ++j) {
+            result.lemmas.push_back(analysis[j].lemma);
+            result.partofspeech.push_back(vocabularyId(PARTOFSPEECH_COLUMN, analysis[j].partofspeech));
+            result.form.push_back(vocabularyId(FORM_COLUMN, analysis[j].form));
+            result.ending.push_back(vocabularyId(ENDING_COLUMN, analysis[j].ending));
+            result.clitic.push_back(vocabularyId(CLITIC_COLUMN, analysis[j].clitic));
+        }
+    }
+    return result;
+}
+
+// punctuation split off the beginning and end of words
+static bool isPunctuation(unsigned long c) {
+    static const unsigned long marks[] = {
+        '.', ',', ';', ':', '!', '?', '"', '\'', '(', ')', '[', ']', '{', '}',
+        0xab, 0xbb, 0x2018, 0x2019, 0x201a, 0x201b, 0x201c, 0x201d, 0x201e, 0x201f,
+        0x2026, 0x2039, 0x203a,
+        0
+    };
+    for (const unsigned long* mark=marks ; *mark ; ++mark) {
+        if (c==*mark) {
+            return true;
+        }
+    }
+    return false;
+}
+
+// a leading sign or decimal point belongs to the number following it
+static bool startsNumber(std::vector<unsigned long> const& chars, size_t i, size_t end) {
+    return (chars[i]=='.' || chars[i]=='-' || chars[i]=='+') && i+1<end && chars[i+1]>='0' && chars[i+1]<='9';
+}
+
+static bool onlyDigits(std::vector<unsigned long> const& chars, size_t begin, size_t end) {
+    for (size_t i=begin ; i<end ; ++i) {
+        if (chars[i]<'0' || chars[i]>'9') {
+            return false;
+        }
+    }
+    return true;
+}
+
+// the full stop after a word may belong to it (12. novembril, dr. Tamm), except
+// after acronyms (USA.), which end sentences more often than they are abbreviated
+static bool keepsFullStop(std::vector<unsigned long> const& chars, size_t begin, size_t end) {
+    if (end-begin<2) {
+        return true;
+    }
+    for (size_t i=begin ; i<end ; ++i) {
+        if (!FSIsLetter((LCHAR)chars[i]) || FSToLower((LCHAR)chars[i])==(LCHAR)chars[i]) {
+            return true;
+        }
+    }
+    return false;
+}
+
+// add the tokens of characters begin ... end-1, consecutive equal punctuation marks ("...") are kept together
+static void addPunctuation(std::vector<unsigned long> const& chars, size_t begin, size_t end, IntVector& spans) {
+    for (size_t i=begin ; i<end ; ) {
+        size_t j=i+1;
+        while (j<end && chars[j]==chars[i]) {
+            ++j;
+        }
+        spans.push_back((int)i);
+        spans.push_back((int)j);
+        i=j;
+    }
+}
+
+/**
+ * Split a text into tokens.
+ *
+ * The text is split at whitespace and the punctuation marks and quotes at the
+ * beginning and end of the pieces are split off ("«Olen" and "homseni,"), the ones
+ * inside a piece (3.5, Tartu-Tallinn) are kept. A full stop is kept after numbers
+ * (12. novembril) and abbreviations (dr. Tamm). The offsets are given in characters.
+ * The bytes of each token in the UTF-8 text are added to byteSpans, if it is not NULL.
+ */
+void Analyzer::tokenizeText(std::string const& text, IntVector& spans, IntVector* byteSpans) {
+    // decode the text, invalid bytes are taken as characters of their own
+    std::vector<unsigned long> chars;
+    IntVector offsets;
+    chars.reserve(text.size());
+    offsets.reserve(text.size()+1);
+    for (size_t i=0 ; i<text.size() ; ) {
+        unsigned char c=(unsigned char)text[i];
+        size_t length = c<0xc0 ? 1 : c<0xe0 ? 2 : c<0xf0 ? 3 : 4;
+        unsigned long value = length==1 ? c : length==2 ? c&0x1f : length==3 ? c&0x0f : c&0x07;
+        for (size_t j=1 ; j<length ; ++j) {
+            if (i+j>=text.size() || ((unsigned char)text[i+j]&0xc0)!=0x80) {
+                length=1;
+                value=c;
+                break;
+            }
+            value=(value<<6)|((unsigned char)text[i+j]&0x3f);
+        }
+        chars.push_back(value);
+        offsets.push_back((int)i);
+        i+=length;
+    }
+    offsets.push_back((int)text.size());
+
+    size_t first=spans.size();
+    for (size_t i=0 ; i<chars.size() ; ) {
+        if (chars[i]<0x10000 && FSIsSpace((wchar_t)chars[i])) {
+            ++i;
+            continue;
+        }
+        size_t end=i;
+        while (end<chars.size() && !(chars[end]<0x10000 && FSIsSpace((wchar_t)chars[end]))) {
+            ++end;
+        }
+        size_t begin=i;
+        while (begin<end && isPunctuation(chars[begin]) && !startsNumber(chars, begin, end)) {
+            ++begin;
+        }
+        size_t last=end;
+        while (last>begin && isPunctuation(chars[last-1])) {
+            --last;
+        }
+        if (last>begin && last<end && chars[last]=='.' && (last+1==end || chars[last+1]!='.') &&
+            keepsFullStop(chars, begin, last)) {
+            std::string word=text.substr(offsets[begin], offsets[last+1]-offsets[begin]);
+            if (onlyDigits(chars, begin, last) || abbreviation(word)) {
+                ++last;
+            }
+        }
+        addPunctuation(chars, i, begin, spans);
+        if (begin<last) {
+            spans.push_back((int)begin);
+            spans.push_back((int)last);
+        }
+        addPunctuation(chars, last, end, spans);
+        i=end;
+    }
+    if (byteSpans) {
+        for (size_t i=first ; i<spans.size() ; ++i) {
+            byteSpans->push_back(offsets[spans[i]]);
+        }
+    }
+}
+
+bool Analyzer::abbreviation(std::string const& word) {
+    // the dictionary is consulted without guessing, the settings are made again
+    // before the next analysis
+    morf.SetFlags(MF_DFLT_MORFA);
+    morf.SetMaxTasand();
+    morf.Clr();
+    morf.Set1(FSXSTRING(word.c_str()));
+    LYLI Lyli;
+    bool found=false;
+    bool other=false;
+    while (morf.Flush(Lyli)) {
+        if (Lyli.lipp & PRMS_MRF) {
+            MRFTULEMUSED& Tul=*Lyli.ptr.pMrfAnal;
+            for (INTPTR ipTul=0; ipTul<Tul.idxLast; ipTul++){
+                std::string partofspeech(FSStrWtoA(Tul[(int)ipTul]->sl, FSCP_UTF8));
+                if (partofspeech=="Y" || partofspeech=="O") {
+                    found=true;
+                } else {
+                    other=true;
+                }
+            }
+        }
+    }
+    morf.Clr();
+    return found && !other;
+}
+
+IntVector Analyzer::tokenize(std::string const& text) {
+    IntVector spans;
+    tokenizeText(text, spans, NULL);
+    return spans;
+}
+
+TextAnalysis Analyzer::analyzeText(std::string const& text, bool useHeuristics, bool phonetic, bool compound) {
+    // the abbreviations are looked up with settings of their own
+    IntVector spans;
+    IntVector byteSpans;
+    tokenizeText(text, spans, &byteSpans);
+    enableHeuristics(useHeuristics);
+    enableMarkers(phonetic, compound);
+    StringVector tokens;
+    tokens.reserve(spans.size()/2);
+    for (size_t i=0 ; i<byteSpans.size() ; i+=2) {
+        tokens.push_back(text.substr(byteSpans[i], byteSpans[i+1]-byteSpans[i]));
+    }
+
+    // a multiword name spans from the start of its first token to the end of its last one
+    TextAnalysis result;
+    IntVector positions;
+    process(tokens, result.words, &positions);
+    result.starts.reserve(positions.size());
+    result.ends.reserve(positions.size());
+    for (size_t i=0 ; i<positions.size() ; ++i) {
+        int next = i+1<positions.size() ? positions[i+1] : (int)tokens.size();
+        result.starts.push_back(spans[2*positions[i]]);
+        result.ends.push_back(spans[2*next-1]);
+    }
+    return result;
+}
+
+/**
+ * Reads a JSON document and writes it out with the analysis of every word.
+ *
+ * The words of a sentence are analyzed and written as soon as they have been read,
+ * so only one sentence is kept in memory. The document follows the format of the etana
+ * application: an object with a list of paragraphs, each with a list of sentences, each
+ * with a list of words, the text of a word in its "text" field. Sentences and words may
+ * also be given at the top level. Other fields of the words are kept, other fields of the
+ * document, paragraphs and sentences are left out.
+ */
+class DocumentReader : public CJSONReader {
+public:
+    DocumentReader(CFSStream& input, CJSONWriter& writer, Analyzer& analyzer)
+        : CJSONReader(input), writer(writer), analyzer(analyzer) {}
+
+protected:
+    enum Kind { DOCUMENT, PARAGRAPHS, PARAGRAPH, SENTENCES, SENTENCE, WORDS, OTHER };
+
+    void OnValReadStart(const CFSAString& key) {
+        int kind=kindOf(key);
+        kinds.push_back(kind);
+        switch (kind) {
+            case DOCUMENT:
+                expect('{');
+                writer.ObjectStart();
+                m_iCollectData--;
+                break;
+            case PARAGRAPH:
+            case SENTENCE:
+                expect('{');
+                writer.ObjectStart();
+                break;
+            case PARAGRAPHS:
+                expect('[');
+                writer.Key("paragraphs");
+                writer.ArrayStart();
+                break;
+            case SENTENCES:
+                expect('[');
+                writer.Key("sentences");
+                writer.ArrayStart();
+                break;
+            case WORDS:
+                expect('[');
+                m_iCollectData++;
+                break;
+        }
+    }
+
+    void OnValReadEnd(const CFSAString& /*key*/, CFSVar& data) {
+        int kind=kinds.back();
+        kinds.pop_back();
+        switch (kind) {
+            case DOCUMENT:
+                writer.ObjectEnd();
+                m_iCollectData++;
+                break;
+            case PARAGRAPH:
+            case SENTENCE:
+                writer.ObjectEnd();
+                break;
+            case PARAGRAPHS:
+            case SENTENCES:
+                writer.ArrayEnd();
+                break;
+            case WORDS:
+                writer.Key("words");
+                writeWords(data);
+                m_iCollectData--;
+                break;
+        }
+    }
+
+private:
+    int kindOf(const CFSAString& key) const {
+        if (kinds.empty()) {
+            return DOCUMENT;
+        }
+        int parent=kinds.back();
+        CFSAString name=key.Mid(key.ReverseFind('/')+1);
+        if (parent==PARAGRAPHS) {
+            return PARAGRAPH;
+        } else if (parent==SENTENCES) {
+            return SENTENCE;
+        } else if (name=="paragraphs" && parent==DOCUMENT) {
+            return PARAGRAPHS;
+        } else if (name=="sentences" && (parent==DOCUMENT || parent==PARAGRAPH)) {
+            return SENTENCES;
+        } else if (name=="words" && (parent==DOCUMENT || parent==SENTENCE)) {
+            return WORDS;
+        }
+        return OTHER;
+    }
+
+    void expect(char c) const {
+        if (m_cCh!=c) {
+            throw CJSONException(c=='{' ? FSTSTR("Expected an object") : FSTSTR("Expected an array"));
+        }
+    }
+
+    void writeWords(CFSVar& words) {
+        StringVector sentence;
+        sentence.reserve(words.GetSize());
+        for (INTPTR ip=0 ; ip<words.GetSize() ; ++ip) {
+            CFSVar& word=words[ip];
+            CFSVar const& text=word.GetType()==CFSVar::VAR_MAP ? word["text"] : word;
+            sentence.push_back(std::string(text.GetAString()));
+            if (sentence.back().empty()) {
+                throw CJSONException(FSTSTR("Word without text"));
+            }
+        }
+        results.clear();
+        positions.clear();
+        analyzer.process(sentence, results, &positions);
+
+        writer.ArrayStart();
+        for (size_t i=0 ; i<results.size() ; ++i) {
+            writer.ObjectStart();
+            CFSVar const& word=words[positions[i]];
+            if (word.GetType()==CFSVar::VAR_MAP) {
+                for (INTPTR ip=0 ; ip<word.GetSize() ; ++ip) {
+                    CFSAString key=word.GetKey(ip);
+                    if (key!="text" && key!="analysis") {
+                        writer.Key(key);
+                        writer.Val(word[key]);
+                    }
+                }
+            }
+            writer.Key("text");
+            writer.StringVal(results[i].first.c_str());
+            writer.Key("analysis");
+            writer.ArrayStart();
+            AnalysisVector const& analysis=results[i].second;
+            for (size_t j=0 ; j<analysis.size() ; ++j) {
+                writer.ObjectStart();
+                writer.Key("root");
+                writer.StringVal(analysis[j].root.c_str());
+                writer.Key("root_tokens");
+                writer.ArrayStart();
+                for (size_t k=0 ; k<analysis[j].rootTokens.size() ; ++k) {
+                    writer.StringVal(analysis[j].rootTokens[k].c_str());
+                }
+                writer.ArrayEnd();
+                writer.Key("ending");
+                writer.StringVal(analysis[j].ending.c_str());
+                writer.Key("clitic");
+                writer.StringVal(analysis[j].clitic.c_str());
+                writer.Key("partofspeech");
+                writer.StringVal(analysis[j].partofspeech.c_str());
+                writer.Key("form");
+                writer.StringVal(analysis[j].form.c_str());
+                writer.Key("lemma");
+                writer.StringVal(analysis[j].lemma.c_str());
+                writer.ObjectEnd();
+            }
+            writer.ArrayEnd();
+            writer.ObjectEnd();
+        }
+        writer.ArrayEnd();
+    }
+
+    CJSONWriter& writer;
+    Analyzer& analyzer;
+    std::vector<int> kinds;
     std::vector<WordAnalysis> results;
-    results.reserve(sentence.size());
-    compileResults(words, results);
+    IntVector positions;
+};
 
-    return results;
+std::string Analyzer::analyzeJson(std::string const& document, bool useHeuristics, bool phonetic, bool compound) {
+    enableHeuristics(useHeuristics);
+    enableMarkers(phonetic, compound);
+
+    CFSMemFile input;
+    input.WriteBuf(document.data(), (INTPTR)document.size());
+    input.Seek(0);
+    CFSMemFile output;
+    CJSONWriter writer(output);
+    DocumentReader reader(input, writer, *this);
+    try {
+        reader.Read();
+    } catch (CJSONException const& e) {
+        throw std::invalid_argument(std::string("invalid JSON document: ")+(const char*)FSStrTtoA(e.GetText(), FSCP_UTF8));
+    }
+    CFSData const& data=output.GetData();
+    return std::string((const char*)data.GetData(), (size_t)data.GetSize());
+}
+
+bool Analyzer::multiwordStart(std::string const& word) {
+    FSXSTRING sona(word.c_str());
+    return morf.chkgeon1(&sona);
 }
 
 
+CacheStats Analyzer::cacheStats() const {
+    return cacheStatsFromMorf(morf);
+}
+
+void Analyzer::clearCacheStats() {
+    morf.CacheStatClr();
+}
+
+Counters Analyzer::counters() const {
+    return countersFromMorf(morf);
+}
+
+void Analyzer::clearCounters() {
+    clearCountersOfMorf(morf);
+}
 
-Synthesizer::Synthesizer(std::string const lexPath) {
-    morf.Start(lexPath.c_str(), MF_DFLT_MORFA);
+long Analyzer::guessedWords() const {
+    return guessed;
+}
+
+
+
+Synthesizer::Synthesizer(std::string const lexPath, bool useMmap, int cacheBlocks)
+    : ownDictionary(new Dictionary(lexPath, useMmap, cacheBlocks)), morf(ownDictionary->morf) {
+}
+
+Synthesizer::Synthesizer(Dictionary& dictionary)
+    : ownDictionary(NULL), morf(dictionary.morf) {
+}
+
+Synthesizer::~Synthesizer() {
+    delete ownDictionary;
 }
 
 void Synthesizer::updateSettings(bool guess, bool phon) {
@@ -137,7 +834,28 @@ Synthesizer::synthesize(std::string lemma,
                         bool phon)
 {
     updateSettings(guess, phon);
-        
+    return process(lemma, partofspeech, form, hint);
+}
+
+std::vector<StringVector> Synthesizer::synthesizeMany(std::vector<StringVector> const& requests, bool guess, bool phon) {
+    updateSettings(guess, phon);
+
+    std::vector<StringVector> results(requests.size());
+    for (size_t i=0 ; i<requests.size() ; ++i) {
+        StringVector const& request = requests[i];
+        if (request.size() != 4) {
+            throw std::invalid_argument("synthesis request must consist of lemma, partofspeech, form and hint");
+        }
+        results[i] = process(request[0], request[1], request[2], request[3]);
+    }
+    return results;
+}
+
+StringVector Synthesizer::process(std::string const& lemma,
+                                  std::string const& partofspeech,
+                                  std::string const& form,
+                                  std::string const& hint)
+{
     CFSVar word;
     word.Cast(CFSVar::VAR_MAP);
     word["lemma"] = lemma.c_str();
@@ -171,3 +889,19 @@ Synthesizer::synthesize(std::string lemma,
     }
     return std::vector<std::string>();
 }
+
+CacheStats Synthesizer::cacheStats() const {
+    return cacheStatsFromMorf(morf);
+}
+
+void Synthesizer::clearCacheStats() {
+    morf.CacheStatClr();
+}
+
+Counters Synthesizer::counters() const {
+    return countersFromMorf(morf);
+}
+
+void Synthesizer::clearCounters() {
+    clearCountersOfMorf(morf);
+}
@@ -12,15 +12,68 @@ bool CJSONReader::GetChar(bool bSkipWhitespace)
 	return false;
 }
 
+static void AppendUTF8(CFSAString &szStr, unsigned long lChar)
+{
+	if (lChar<0x80) {
+		szStr+=(char)lChar;
+	} else if (lChar<0x800) {
+		szStr+=(char)(0xc0|(lChar>>6));
+		szStr+=(char)(0x80|(lChar&0x3f));
+	} else if (lChar<0x10000) {
+		szStr+=(char)(0xe0|(lChar>>12));
+		szStr+=(char)(0x80|((lChar>>6)&0x3f));
+		szStr+=(char)(0x80|(lChar&0x3f));
+	} else {
+		szStr+=(char)(0xf0|(lChar>>18));
+		szStr+=(char)(0x80|((lChar>>12)&0x3f));
+		szStr+=(char)(0x80|((lChar>>6)&0x3f));
+		szStr+=(char)(0x80|(lChar&0x3f));
+	}
+}
+
+unsigned long CJSONReader::ReadHex4()
+{
+	unsigned long lChar=0;
+	for (int i=0; i<4; i++) {
+		if (!GetChar()) break;
+		lChar<<=4;
+		if (m_cCh>='0' && m_cCh<='9') lChar|=m_cCh-'0';
+		else if (m_cCh>='a' && m_cCh<='f') lChar|=m_cCh-'a'+10;
+		else if (m_cCh>='A' && m_cCh<='F') lChar|=m_cCh-'A'+10;
+		else throw CJSONException(FSTSTR("Invalid \\u escape"));
+	}
+	return lChar;
+}
+
 CFSAString CJSONReader::ReadString()
 {
 	char cQuote=m_cCh;
 	CFSAString szStr;
 	while (GetChar()) {
 		if (m_cCh=='\\') {
-			szStr+=m_cCh;
-			if (GetChar()) szStr+=m_cCh;
-			else break;
+			if (!GetChar()) break;
+			switch (m_cCh) {
+				case 'b': szStr+='\b'; break;
+				case 'f': szStr+='\f'; break;
+				case 'n': szStr+='\n'; break;
+				case 'r': szStr+='\r'; break;
+				case 't': szStr+='\t'; break;
+				case 'u': {
+					unsigned long lChar=ReadHex4();
+					if (lChar>=0xd800 && lChar<0xdc00) { // surrogate pair
+						if (!GetChar() || m_cCh!='\\' || !GetChar() || m_cCh!='u') {
+							throw CJSONException(FSTSTR("Invalid surrogate pair"));
+						}
+						unsigned long lLow=ReadHex4();
+						if (lLow<0xdc00 || lLow>=0xe000) {
+							throw CJSONException(FSTSTR("Invalid surrogate pair"));
+						}
+						lChar=0x10000+((lChar-0xd800)<<10)+(lLow-0xdc00);
+					}
+					AppendUTF8(szStr, lChar);
+				} break;
+				default: szStr+=m_cCh; // \\, \/, \" and \'
+			}
 		} else if (m_cCh==cQuote) {
 			GetChar(true);
 			return szStr;
@@ -53,14 +106,14 @@ CFSVar CJSONReader::ReadNumber()
 {
 	CFSAString szStr=m_cCh;
 	while (GetChar()) {
-		if ((m_cCh>='0' && m_cCh<='9') || m_cCh=='.') {
+		if ((m_cCh>='0' && m_cCh<='9') || FSStrChr(".eE+-", m_cCh)) {
 			szStr+=m_cCh;
 		} else {
 			if (FSIsSpace(m_cCh)) GetChar(true);
 			break;
 		}
 	}
-	if (szStr.Find('.')>=0) {
+	if (szStr.Find('.')>=0 || szStr.Find('e')>=0 || szStr.Find('E')>=0) {
 		return 	strtod(szStr, 0);
 	} else{
 		return (INTPTR)strtol(szStr, 0, 10);
@@ -71,7 +124,7 @@ CFSVar CJSONReader::ReadConst()
 {
 	CFSAString szStr=ReadText();
 	if (szStr=="true") return CFSVar(true);
-	if (szStr=="false") return CFSVar(true);
+	if (szStr=="false") return CFSVar(false);
 	if (szStr=="null") return CFSVar();
 	throw CJSONException(CFSString(FSTSTR("Unknown constant '")) + FSStrAtoT(szStr, FSCP_UTF8) + FSTSTR("'"));
 }
@@ -174,7 +227,7 @@ CFSVar CJSONReader::Read()
 void CJSONWriter::Key(const CFSAString &szStr) {
 	Comma();
 	m_Stream.WriteChar('\"');
-	Text(szStr);
+	Escaped(szStr);
 	m_Stream.WriteText("\": ");
 }
 
@@ -206,8 +259,8 @@ void CJSONWriter::Val(const CFSVar &Var) {
 		break;
 		case CFSVar::VAR_ARRAY:
 			ArrayStart();
-			for (INTPTR ip=0; ip<Var.GetSize(); ip++) {
-				Val(Var[Var.GetKey(ip)]);
+			for (INTPTR ip=0; ip<Var.GetSize(); ip++) { // keys are sorted as strings, "10" before "2"
+				Val(Var[ip]);
 			}
 			ArrayEnd();
 		break;
@@ -239,7 +292,7 @@ void CJSONWriter::BoolVal(bool bBool) {
 void CJSONWriter::StringVal(const CFSAString &szStr) {
 	Comma();
 	m_Stream.WriteChar('\"');
-	Text(szStr);
+	Escaped(szStr);
 	m_Stream.WriteChar('\"');
 	m_Comma[GetLevel()]=COMMA_VAL;
 }
@@ -287,6 +340,29 @@ void CJSONWriter::Text(const CFSAString &szStr) {
 	}
 }
 
+void CJSONWriter::Escaped(const CFSAString &szStr) {
+	for (INTPTR ip=0; ip<szStr.GetLength(); ip++) {
+		unsigned char c=(unsigned char)szStr[ip];
+		switch (c) {
+			case '\"': m_Stream.WriteText("\\\""); break;
+			case '\\': m_Stream.WriteText("\\\\"); break;
+			case '\b': m_Stream.WriteText("\\b"); break;
+			case '\f': m_Stream.WriteText("\\f"); break;
+			case '\n': m_Stream.WriteText("\\n"); break;
+			case '\r': m_Stream.WriteText("\\r"); break;
+			case '\t': m_Stream.WriteText("\\t"); break;
+			default:
+				if (c<0x20) {
+					CFSAString szEscape;
+					szEscape.Format("\\u%04x", (int)c);
+					m_Stream.WriteText(szEscape);
+				} else {
+					m_Stream.WriteChar((char)c);
+				}
+		}
+	}
+}
+
 void CJSONWriter::Comma() {
 	if (m_Comma[GetLevel()]) {
 		if (m_Comma[GetLevel()]==COMMA_VAL) {